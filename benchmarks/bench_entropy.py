@@ -0,0 +1,95 @@
+"""Time the high-entropy secret detector on a multi-megabyte diff.
+
+Compares the NumPy byte-histogram path with the pure-Python fallback and
+reports the cost of the entropy stage inside `scan_diff`.
+
+Usage:
+    python benchmarks/bench_entropy.py [--lines N] [--token-rate R] [--repeat N]
+"""
+
+from __future__ import annotations
+
+import argparse
+import base64
+import random
+import string
+import time
+from typing import Any, Callable, List
+
+from jps_pre_commit_utils import entropy
+from jps_pre_commit_utils.config import _DEFAULTS
+from jps_pre_commit_utils.entropy import EntropyDetector
+from jps_pre_commit_utils.scanner import scan_diff
+
+
+def _make_lines(count: int, token_rate: float, seed: int = 7) -> List[str]:
+    """Build added lines, `token_rate` of them holding an identifier-like or random run."""
+    rng = random.Random(seed)
+    words = ["value", "config", "result", "handler", "request", "response", "items"]
+    lines = []
+    for _ in range(count):
+        body = " ".join(rng.choices(words, k=12))
+        if rng.random() < token_rate:
+            kind = rng.random()
+            if kind < 0.1:
+                token = base64.b64encode(rng.randbytes(30)).decode()
+            elif kind < 0.2:
+                token = rng.randbytes(20).hex()
+            else:
+                token = "_".join(rng.choices(words, k=4)) + "".join(
+                    rng.choices(string.ascii_letters, k=4)
+                )
+            body = f'{body} = "{token}"'
+        lines.append(body)
+    return lines
+
+
+def _best(fn: Callable[[], Any], repeat: int) -> float:
+    """Return the best wall time of `repeat` runs."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    """Run the benchmark and print a table."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--lines", type=int, default=50_000)
+    parser.add_argument("--token-rate", type=float, default=0.3)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    lines = _make_lines(args.lines, args.token_rate)
+    mb = sum(len(line) + 1 for line in lines) / 1e6
+    detector = EntropyDetector()
+    flagged = len(detector.scan(lines))
+    print(f"{args.lines:,} lines, {mb:.1f} MB, {flagged:,} flagged")
+
+    def detect() -> None:
+        for start in range(0, len(lines), 4096):
+            detector.scan(lines[start : start + 4096])
+
+    timings = {}
+    if entropy._numpy_module() is not None:
+        timings["entropy (numpy)"] = _best(detect, args.repeat)
+    saved = entropy.NUMPY_MIN_TOKENS
+    entropy.NUMPY_MIN_TOKENS = len(lines) + 1
+    try:
+        timings["entropy (python)"] = _best(detect, args.repeat)
+    finally:
+        entropy.NUMPY_MIN_TOKENS = saved
+    with_secrets = dict(_DEFAULTS)
+    without = dict(_DEFAULTS, secrets=dict(_DEFAULTS["secrets"], entropy=False))
+    timings["scan_diff"] = _best(lambda: scan_diff(lines, with_secrets), args.repeat)
+    timings["scan_diff (no entropy)"] = _best(lambda: scan_diff(lines, without), args.repeat)
+
+    print(f"{'stage':<24} {'seconds':>9} {'MB/s':>8}")
+    for name, seconds in timings.items():
+        print(f"{name:<24} {seconds:>9.4f} {mb / seconds:>8.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""Compare the per-pattern scan loop against the combined RuleSet matcher.
+
+Usage:
+    python benchmarks/bench_matcher.py [--lines N] [--hit-rate R]
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import string
+import time
+from typing import Dict, List
+
+from jps_pre_commit_utils.rules import RuleSet, compile_patterns
+
+
+def _make_patterns(count: int) -> Dict[str, List[str]]:
+    """Build `count` patterns spread over three groups."""
+    words = [f"forbidden_{i}" for i in range(count)]
+    groups: Dict[str, List[str]] = {"python": [], "perl": [], "yaml": []}
+    for i, word in enumerate(words):
+        pattern = rf"\b{word}\b" if i % 2 else rf"{word}\s*\("
+        groups[("python", "perl", "yaml")[i % 3]].append(pattern)
+    return groups
+
+
+def _make_lines(count: int, hit_rate: float, patterns: Dict[str, List[str]]) -> List[str]:
+    """Build synthetic added lines with roughly `hit_rate` matching lines."""
+    rng = random.Random(1234)
+    flat = [p for pats in patterns.values() for p in pats]
+    lines = []
+    for _ in range(count):
+        body = "".join(rng.choices(string.ascii_lowercase + " ", k=80))
+        if flat and rng.random() < hit_rate:
+            token = rng.choice(flat).replace(r"\b", "").replace(r"\s*\(", "(")
+            body = f"{body} {token}"
+        lines.append(body)
+    return lines
+
+
+def _naive(compiled, lines):
+    hits = 0
+    for line in lines:
+        for _group, pats in compiled.items():
+            for pat in pats:
+                if pat.search(line):
+                    hits += 1
+    return hits
+
+
+def _ruleset(ruleset, lines):
+    hits = 0
+    for line in lines:
+        for _ in ruleset.match(line):
+            hits += 1
+    return hits
+
+
+def main() -> None:
+    """Run the benchmark across growing pattern counts."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--lines", type=int, default=20000)
+    parser.add_argument("--hit-rate", type=float, default=0.01)
+    args = parser.parse_args()
+
+    print(f"{'patterns':>9} {'naive (s)':>10} {'ruleset (s)':>12} {'speedup':>8}")
+    for count in (5, 15, 50, 150):
+        patterns = _make_patterns(count)
+        lines = _make_lines(args.lines, args.hit_rate, patterns)
+        compiled = compile_patterns(patterns)
+        ruleset = RuleSet(compiled)
+
+        start = time.perf_counter()
+        expected = _naive(compiled, lines)
+        naive_s = time.perf_counter() - start
+
+        start = time.perf_counter()
+        got = _ruleset(ruleset, lines)
+        ruleset_s = time.perf_counter() - start
+
+        assert got == expected, (got, expected)
+        print(f"{count:>9} {naive_s:>10.3f} {ruleset_s:>12.3f} {naive_s / ruleset_s:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
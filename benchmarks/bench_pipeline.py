@@ -0,0 +1,245 @@
+"""Benchmark the diff-parse -> compile -> scan -> report pipeline stage by stage.
+
+Generates a synthetic unified diff, times each stage (best of --repeat runs),
+reports throughput and peak traced memory, and optionally compares against a
+saved baseline.
+
+Usage:
+    python benchmarks/bench_pipeline.py [--lines N] [--files N] [--line-length N]
+        [--hit-rate R] [--repeat N] [--save-baseline PATH]
+        [--baseline PATH --threshold 0.25]
+
+The scan is also timed once per available regex backend ("re" and, with
+google-re2 installed, "re2").
+
+Exit status is 1 when a stage is slower than the baseline by more than the
+threshold (as a fraction, default 0.25 = 25%).
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import io
+import json
+import random
+import re
+import string
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+
+from jps_pre_commit_utils import cli, report
+from jps_pre_commit_utils.config import _DEFAULTS
+from jps_pre_commit_utils.diff_parser import iter_added_lines, split_diff
+from jps_pre_commit_utils.rules import (
+    REGEX_BACKENDS,
+    RuleSet,
+    compile_allowlist,
+    compile_patterns,
+    resolve_backend,
+)
+from jps_pre_commit_utils.scanner import scan_diff
+
+_EXTENSIONS = [".py", ".pl", ".yaml", ".sh"]
+_HITS = ["print(x)", "# TODO: later", "sys.exit(1)", "use Data::Dumper;", "/mnt/pure3/x", "test"]
+
+
+def make_diff(lines: int, files: int, line_length: int, hit_rate: float, seed: int = 1) -> str:
+    """Build a synthetic `git diff --cached --unified=0` text.
+
+    Args:
+        lines: Total added lines.
+        files: Number of files the lines are spread across.
+        line_length: Approximate characters per added line.
+        hit_rate: Fraction of lines containing a default pattern.
+        seed: RNG seed, so runs are comparable.
+
+    Returns:
+        str: Unified diff text.
+    """
+    rng = random.Random(seed)
+    alphabet = string.ascii_lowercase + "   _.=()"
+    per_file = max(1, lines // max(1, files))
+    out: List[str] = []
+    written = 0
+    for f in range(files):
+        if written >= lines:
+            break
+        path = f"pkg/module_{f}{_EXTENSIONS[f % len(_EXTENSIONS)]}"
+        count = min(per_file, lines - written) if f < files - 1 else lines - written
+        out.append(f"diff --git a/{path} b/{path}")
+        out.append("index 0000000..1111111 100644")
+        out.append(f"--- a/{path}")
+        out.append(f"+++ b/{path}")
+        out.append(f"@@ -0,0 +1,{count} @@")
+        for _ in range(count):
+            body = "".join(rng.choices(alphabet, k=line_length))
+            if rng.random() < hit_rate:
+                body = f"{body[: max(0, line_length - 20)]} {rng.choice(_HITS)}"
+            out.append(f"+{body}")
+        written += count
+    return "\n".join(out) + "\n"
+
+
+def _best_time(fn: Callable[[], Any], repeat: int) -> float:
+    """Return the best wall time of `repeat` runs.
+
+    Args:
+        fn: Stage callable.
+        repeat: Number of runs.
+
+    Returns:
+        float: Seconds.
+    """
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def _peak_memory(fn: Callable[[], Any]) -> int:
+    """Return peak traced allocation (bytes) of one run.
+
+    Args:
+        fn: Stage callable.
+
+    Returns:
+        int: Bytes.
+    """
+    tracemalloc.start()
+    try:
+        fn()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def run(args: argparse.Namespace) -> Dict[str, Dict[str, float]]:
+    """Run all stages and return their metrics.
+
+    Args:
+        args: Parsed command-line arguments.
+
+    Returns:
+        Dict[str, Dict[str, float]]: stage -> metric -> value.
+    """
+    diff = make_diff(args.lines, args.files, args.line_length, args.hit_rate)
+    diff_lines = split_diff(diff)
+    diff_mb = len(diff.encode()) / 1e6
+    cfg = dict(_DEFAULTS)
+    records = list(iter_added_lines(diff_lines))
+    findings = scan_diff(records, cfg)  # also warms the rule-set memo
+
+    def compile_stage() -> RuleSet:
+        re.purge()  # defeat re's internal cache so compilation is really measured
+        return RuleSet(
+            compile_patterns(cfg["patterns"]), None, compile_allowlist(cfg["ignore_patterns"])
+        )
+
+    def sink_report() -> None:
+        with contextlib.redirect_stdout(io.StringIO()):
+            report.print_report(findings)
+
+    stages: Dict[str, Callable[[], Any]] = {
+        "extract_added_lines": lambda: cli._extract_added_lines(diff),
+        "parse_diff": lambda: list(iter_added_lines(diff_lines)),
+        "compile_patterns": compile_stage,
+        "scan_diff": lambda: scan_diff(records, cfg),
+        "print_report": sink_report,
+    }
+    # One extra scan stage per available regex backend ("scan_diff" uses the default).
+    for backend in REGEX_BACKENDS[1:]:
+        if resolve_backend(backend) == backend:
+            backend_cfg = dict(cfg, regex_backend=backend)
+            scan_diff(records, backend_cfg)
+            stages[f"scan_diff[{backend}]"] = lambda c=backend_cfg: scan_diff(records, c)
+
+    results: Dict[str, Dict[str, float]] = {}
+    for name, fn in stages.items():
+        seconds = _best_time(fn, args.repeat)
+        metrics = {"seconds": seconds, "peak_bytes": float(_peak_memory(fn))}
+        if name in ("extract_added_lines", "parse_diff") or name.startswith("scan_diff"):
+            metrics["lines_per_s"] = len(records) / seconds if seconds else 0.0
+            metrics["mb_per_s"] = diff_mb / seconds if seconds else 0.0
+        if name == "print_report":
+            metrics["findings"] = float(len(findings))
+        results[name] = metrics
+    return results
+
+
+def compare(
+    results: Dict[str, Dict[str, float]], baseline: Dict[str, Dict[str, float]], threshold: float
+) -> List[str]:
+    """Return regressions of stage times against a baseline.
+
+    Args:
+        results: Current metrics.
+        baseline: Saved metrics.
+        threshold: Allowed slowdown as a fraction.
+
+    Returns:
+        List[str]: One message per regressed stage.
+    """
+    regressions = []
+    for stage, metrics in results.items():
+        before = baseline.get(stage, {}).get("seconds")
+        if not before:
+            continue
+        ratio = metrics["seconds"] / before
+        if ratio > 1 + threshold:
+            regressions.append(
+                f"{stage}: {before:.4f}s -> {metrics['seconds']:.4f}s ({ratio:.2f}x)"
+            )
+    return regressions
+
+
+def main() -> int:
+    """Parse arguments, run the benchmark and print a table.
+
+    Returns:
+        int: 1 if a regression beyond the threshold was detected, else 0.
+    """
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--lines", type=int, default=100_000)
+    parser.add_argument("--files", type=int, default=200)
+    parser.add_argument("--line-length", type=int, default=80)
+    parser.add_argument("--hit-rate", type=float, default=0.01)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--baseline", type=Path)
+    parser.add_argument("--save-baseline", type=Path)
+    parser.add_argument("--threshold", type=float, default=0.25)
+    args = parser.parse_args()
+
+    results = run(args)
+
+    print(f"{'stage':<22} {'seconds':>9} {'lines/s':>12} {'MB/s':>8} {'peak MB':>8}")
+    for stage, m in results.items():
+        lines_s = f"{m['lines_per_s']:,.0f}" if "lines_per_s" in m else "-"
+        mb_s = f"{m['mb_per_s']:.1f}" if "mb_per_s" in m else "-"
+        print(
+            f"{stage:<22} {m['seconds']:>9.4f} {lines_s:>12} {mb_s:>8} "
+            f"{m['peak_bytes'] / 1e6:>8.2f}"
+        )
+
+    if args.save_baseline:
+        args.save_baseline.write_text(json.dumps(results, indent=2) + "\n")
+        print(f"Saved baseline to {args.save_baseline}")
+
+    if args.baseline:
+        if not args.baseline.exists():
+            print(f"No baseline at {args.baseline}; skipping comparison.")
+            return 0
+        regressions = compare(results, json.loads(args.baseline.read_text()), args.threshold)
+        for msg in regressions:
+            print(f"REGRESSION {msg}", file=sys.stderr)
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -1,13 +1,33 @@
 """Top-level package for jps-pre-commit-utils."""
 
-from importlib.metadata import PackageNotFoundError, version
-
 __all__ = [
     "__version__",
 ]
 
-try:
-    __version__ = version("jps-pre-commit-utils")
-except PackageNotFoundError:  # pragma: no cover
-    # Fallback when running from source without an installed dist
-    __version__ = "0.0.0"
+
+def __getattr__(name: str) -> str:
+    """Resolve ``__version__`` on first access.
+
+    ``importlib.metadata`` is comparatively slow to import, and the hook itself
+    never needs the version, so it is only looked up when asked for.
+
+    Args:
+        name: Attribute name.
+
+    Returns:
+        str: The installed distribution version for ``__version__``.
+
+    Raises:
+        AttributeError: For any other missing attribute.
+    """
+    if name != "__version__":
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    from importlib.metadata import PackageNotFoundError, version
+
+    try:
+        value = version("jps-pre-commit-utils")
+    except PackageNotFoundError:  # pragma: no cover
+        # Fallback when running from source without an installed dist
+        value = "0.0.0"
+    globals()["__version__"] = value
+    return value
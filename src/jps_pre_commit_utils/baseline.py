@@ -0,0 +1,138 @@
+"""Baselines of accepted findings, for onboarding repositories with legacy hits.
+
+A baseline stores one 64-bit fingerprint per accepted finding: a hash of its
+path, group, pattern and whitespace-normalized line text. Line numbers are
+left out, so findings survive edits elsewhere in the file, and so is
+indentation, so they survive reformatting too. A new line identical to an
+accepted one in the same file is treated as accepted as well.
+
+The file is a short header followed by the fingerprints as sorted
+little-endian unsigned 64-bit integers: a 100k-entry baseline is 800 kB and
+loads with a single `array.frombytes` call into a set for O(1) lookups.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import sys
+from array import array
+from pathlib import Path
+from typing import Iterable, Iterator, Set
+
+from . import cache
+from .findings import Finding
+
+_MAGIC = b"JPSBASE1"
+
+
+def fingerprint(finding: Finding) -> int:
+    """Return the baseline fingerprint of a finding.
+
+    Args:
+        finding: Finding to identify.
+
+    Returns:
+        int: 64-bit hash of (path, group, pattern, normalized line).
+    """
+    line = " ".join(finding.line.split())
+    key = f"{finding.path or ''}\0{finding.group}\0{finding.pattern}\0{line}"
+    digest = hashlib.blake2b(key.encode("utf-8", "surrogatepass"), digest_size=8).digest()
+    return int.from_bytes(digest, "little")
+
+
+class Baseline:
+    """A set of accepted finding fingerprints."""
+
+    def __init__(self, fingerprints: Iterable[int] = ()) -> None:
+        """Create a baseline.
+
+        Args:
+            fingerprints: Accepted fingerprints, as from `fingerprint`.
+        """
+        self.fingerprints: Set[int] = set(fingerprints)
+        # Findings dropped by `filter` so far.
+        self.suppressed = 0
+
+    @classmethod
+    def from_findings(cls, findings: Iterable[Finding]) -> "Baseline":
+        """Build a baseline accepting every given finding.
+
+        Args:
+            findings: Findings to accept.
+
+        Returns:
+            Baseline: The new baseline.
+        """
+        return cls(map(fingerprint, findings))
+
+    @classmethod
+    def load(cls, path: Path) -> "Baseline":
+        """Read a baseline file.
+
+        Args:
+            path: File written by `save`.
+
+        Returns:
+            Baseline: The stored fingerprints.
+
+        Raises:
+            OSError: If the file cannot be read.
+            ValueError: If it is not a baseline file.
+        """
+        data = Path(path).read_bytes()
+        if not data.startswith(_MAGIC) or (len(data) - len(_MAGIC)) % 8:
+            raise ValueError(f"{path} is not a baseline file")
+        values = array("Q")
+        values.frombytes(data[len(_MAGIC) :])
+        if sys.byteorder == "big":  # pragma: no cover
+            values.byteswap()
+        return cls(values)
+
+    def save(self, path: Path) -> None:
+        """Write the baseline atomically, fingerprints sorted.
+
+        Args:
+            path: Destination file.
+
+        Raises:
+            OSError: If the file cannot be written.
+        """
+        values = array("Q", sorted(self.fingerprints))
+        if sys.byteorder == "big":  # pragma: no cover
+            values.byteswap()
+        cache.write_atomic(Path(path), _MAGIC + values.tobytes())
+
+    def __contains__(self, finding: object) -> bool:
+        """Return True if a finding is accepted.
+
+        Args:
+            finding: Finding to look up.
+
+        Returns:
+            bool: Whether its fingerprint is in the baseline.
+        """
+        return isinstance(finding, Finding) and fingerprint(finding) in self.fingerprints
+
+    def __len__(self) -> int:
+        """Return the number of fingerprints.
+
+        Returns:
+            int: Baseline size.
+        """
+        return len(self.fingerprints)
+
+    def filter(self, findings: Iterable[Finding]) -> Iterator[Finding]:
+        """Drop accepted findings from a stream, counting them in `suppressed`.
+
+        Args:
+            findings: Findings in any order.
+
+        Yields:
+            Finding: Findings not in the baseline.
+        """
+        accepted = self.fingerprints
+        for finding in findings:
+            if fingerprint(finding) in accepted:
+                self.suppressed += 1
+            else:
+                yield finding
@@ -0,0 +1,230 @@
+"""Scan many diffs with one compiled configuration, for library users.
+
+Example:
+    >>> scanner = Scanner({"patterns": {"python": ["TODO"]}})
+    >>> stats = BatchStats()
+    >>> for result in scanner.scan_many(diffs, jobs=0, stats=stats):
+    ...     publish(result.position, result.findings)
+"""
+
+from __future__ import annotations
+
+import time
+from collections import deque
+from typing import Any, Deque, Dict, Iterable, Iterator, List, Mapping, NamedTuple, Optional, Union
+
+from .diff_parser import AddedLine, iter_added_lines, split_diff
+from .findings import Finding
+from .rules import Timeouts
+from .scanner import CompiledRules
+
+# A unified diff, as one string or as its lines.
+Diff = Union[str, Iterable[str]]
+
+
+class DiffResult(NamedTuple):
+    """Outcome of scanning one diff."""
+
+    position: int
+    findings: List[Finding]
+    lines: int
+    seconds: float
+    timeouts: Timeouts
+
+
+class BatchStats:
+    """Totals over the diffs yielded by `Scanner.scan_many` so far."""
+
+    def __init__(self) -> None:
+        """Create empty totals."""
+        self.diffs = 0
+        self.diffs_with_findings = 0
+        self.lines = 0
+        self.findings = 0
+        self.seconds = 0.0
+        self.elapsed = 0.0
+        self.by_group: Dict[str, int] = {}
+        self.timeouts = Timeouts()
+
+    def add(self, result: DiffResult) -> None:
+        """Count one diff's result.
+
+        Args:
+            result: Result to add.
+        """
+        self.diffs += 1
+        self.lines += result.lines
+        self.seconds += result.seconds
+        if result.findings:
+            self.diffs_with_findings += 1
+            self.findings += len(result.findings)
+            for finding in result.findings:
+                self.by_group[finding.group] = self.by_group.get(finding.group, 0) + 1
+        self.timeouts.merge(result.timeouts)
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Return the totals in a JSON-friendly form.
+
+        Returns:
+            Dict[str, Any]: Counts, "seconds" (scan time summed over diffs),
+            "elapsed" (wall time) and "lines_per_s" (lines over wall time).
+        """
+        return {
+            "diffs": self.diffs,
+            "diffs_with_findings": self.diffs_with_findings,
+            "lines": self.lines,
+            "findings": self.findings,
+            "by_group": dict(self.by_group),
+            "seconds": self.seconds,
+            "elapsed": self.elapsed,
+            "lines_per_s": self.lines / self.elapsed if self.elapsed else 0.0,
+        }
+
+
+class Scanner:
+    """Rules compiled once from a configuration, reused for every diff.
+
+    Unlike `scanner.scan_diff`, no per-call work is repeated: the rule set
+    and language routing are built when the Scanner is created. Only the
+    rule-based scan is applied; the hook's git-based file skipping (binary,
+    excluded or oversized files) is not.
+    """
+
+    def __init__(self, config: Optional[Mapping[str, object]] = None) -> None:
+        """Compile the rules.
+
+        Args:
+            config: Configuration in the `config.load_config` shape; loaded
+                from the usual YAML files when omitted.
+        """
+        if config is None:
+            from .config import load_config
+
+            config = load_config()
+        self.config: Dict[str, object] = dict(config)
+        self._rules = CompiledRules(self.config)
+
+    def scan(self, diff: Diff, timeouts: Optional[Timeouts] = None) -> List[Finding]:
+        """Scan the added lines of one diff.
+
+        Args:
+            diff: Unified diff text, or its lines.
+            timeouts: Optional record of pattern/line pairs skipped for time.
+
+        Returns:
+            List[Finding]: Findings in diff order, with path and line number.
+        """
+        return self._result(0, diff, Timeouts() if timeouts is None else timeouts).findings
+
+    def iter_findings(
+        self, lines: Iterable[Union[str, AddedLine]], timeouts: Optional[Timeouts] = None
+    ) -> Iterator[Finding]:
+        """Scan added lines or `AddedLine` records directly.
+
+        Args:
+            lines: Plain lines or located records, as for `scanner.iter_findings`.
+            timeouts: Optional record of pattern/line pairs skipped for time.
+
+        Yields:
+            Finding: Findings in input order.
+        """
+        yield from self._rules.iter_findings(lines, timeouts)
+
+    def scan_many(
+        self, diffs: Iterable[Diff], jobs: int = 1, stats: Optional[BatchStats] = None
+    ) -> Iterator[DiffResult]:
+        """Scan a stream of diffs, yielding one result per diff in input order.
+
+        Diffs are consumed lazily. With `jobs` other than 1 they are scanned
+        in worker processes that each compile the rules once; at most a few
+        diffs per worker are in flight at a time.
+
+        Args:
+            diffs: Unified diffs (text or lines).
+            jobs: Worker processes (1 scans in-process, 0 means all CPUs).
+            stats: Optional totals, updated as each result is yielded.
+
+        Yields:
+            DiffResult: Findings, added-line count, scan time and skipped
+            pattern/line pairs for each diff.
+        """
+        from .parallel import resolve_jobs
+
+        started = time.perf_counter()
+        for result in self._results(diffs, resolve_jobs(jobs)):
+            if stats is not None:
+                stats.add(result)
+                stats.elapsed = time.perf_counter() - started
+            yield result
+
+    def _results(self, diffs: Iterable[Diff], workers: int) -> Iterator[DiffResult]:
+        """Produce results serially or from a process pool.
+
+        Args:
+            diffs: Unified diffs (text or lines).
+            workers: Worker process count.
+
+        Yields:
+            DiffResult: Results in input order.
+        """
+        if workers == 1:
+            for index, diff in enumerate(diffs):
+                yield self._result(index, diff, Timeouts())
+            return
+
+        from concurrent.futures import Future, ProcessPoolExecutor
+
+        pending: Deque[Future[DiffResult]] = deque()
+        with ProcessPoolExecutor(
+            max_workers=workers, initializer=_init_worker, initargs=(self.config,)
+        ) as pool:
+            for index, diff in enumerate(diffs):
+                payload = diff if isinstance(diff, str) else list(diff)
+                pending.append(pool.submit(_scan_one, index, payload))
+                if len(pending) >= 2 * workers:
+                    yield pending.popleft().result()
+            while pending:
+                yield pending.popleft().result()
+
+    def _result(self, index: int, diff: Diff, timeouts: Timeouts) -> DiffResult:
+        """Scan one diff and time it.
+
+        Args:
+            index: Position of the diff in the batch.
+            diff: Unified diff text, or its lines.
+            timeouts: Record of pattern/line pairs skipped for time.
+
+        Returns:
+            DiffResult: The diff's result.
+        """
+        start = time.perf_counter()
+        records = list(iter_added_lines(split_diff(diff) if isinstance(diff, str) else diff))
+        findings = list(self.iter_findings(records, timeouts))
+        return DiffResult(index, findings, len(records), time.perf_counter() - start, timeouts)
+
+
+_WORKER: Optional[Scanner] = None
+
+
+def _init_worker(config: Mapping[str, object]) -> None:
+    """Build the worker's Scanner once.
+
+    Args:
+        config: Loaded configuration.
+    """
+    global _WORKER
+    _WORKER = Scanner(config)
+
+
+def _scan_one(index: int, diff: Diff) -> DiffResult:
+    """Scan one diff inside a worker process.
+
+    Args:
+        index: Position of the diff in the batch.
+        diff: Unified diff text, or its lines.
+
+    Returns:
+        DiffResult: The diff's result.
+    """
+    assert _WORKER is not None
+    return _WORKER._result(index, diff, Timeouts())
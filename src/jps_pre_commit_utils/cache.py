@@ -0,0 +1,186 @@
+"""On-disk cache for parsed configuration and rule analysis.
+
+Entries are small JSON documents stored under
+``$JPS_PRECOMMIT_CACHE_DIR`` (or ``$XDG_CACHE_HOME/jps-pre-commit-utils``,
+falling back to ``~/.cache/jps-pre-commit-utils``). Every entry is keyed by a
+fingerprint that includes the state of the package's own source files, so
+upgrades and local edits invalidate it automatically. Set ``JPS_PRECOMMIT_NO_CACHE=1`` to
+disable the cache entirely.
+
+The cache is strictly best-effort: any IO or decoding problem is treated as a
+miss and never interrupts a scan.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import tempfile
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Iterable, Optional, Union
+
+_APP_DIR = "jps-pre-commit-utils"
+
+# Older entries of the same kind beyond this count are pruned on write.
+_KEEP_PER_KIND = 16
+
+
+@lru_cache(maxsize=None)
+def _code_salt() -> str:
+    """Return a digest of the package's source files (name, mtime, size).
+
+    Used instead of the distribution version, which needs the slow-to-import
+    ``importlib.metadata`` and does not change for editable installs.
+
+    Returns:
+        str: Hex digest.
+    """
+    h = hashlib.sha256()
+    for path in sorted(Path(__file__).parent.glob("*.py")):
+        try:
+            st = path.stat()
+        except OSError:  # pragma: no cover
+            continue
+        h.update(f"{path.name}:{st.st_mtime_ns}:{st.st_size}\0".encode())
+    return h.hexdigest()
+
+
+def cache_dir() -> Path:
+    """Return the directory used for cache entries.
+
+    Returns:
+        Path: Cache directory (not necessarily existing yet).
+    """
+    override = os.environ.get("JPS_PRECOMMIT_CACHE_DIR")
+    if override:
+        return Path(override)
+    xdg = os.environ.get("XDG_CACHE_HOME")
+    base = Path(xdg) if xdg else Path.home() / ".cache"
+    return base / _APP_DIR
+
+
+def enabled() -> bool:
+    """Return False when caching is disabled via ``JPS_PRECOMMIT_NO_CACHE``.
+
+    Returns:
+        bool: True if the on-disk cache may be used.
+    """
+    return os.environ.get("JPS_PRECOMMIT_NO_CACHE", "") in ("", "0")
+
+
+def file_fingerprint(paths: Iterable[Path]) -> str:
+    """Fingerprint a set of files by path, mtime, size and content hash.
+
+    Missing files contribute a fixed marker so that creating them later
+    changes the fingerprint.
+
+    Args:
+        paths: Files whose state determines the cached value.
+
+    Returns:
+        str: Hex digest.
+    """
+    h = hashlib.sha256(_code_salt().encode())
+    for path in paths:
+        h.update(b"\0" + str(path).encode())
+        try:
+            st = path.stat()
+            h.update(f":{st.st_mtime_ns}:{st.st_size}:".encode())
+            h.update(hashlib.sha256(path.read_bytes()).digest())
+        except OSError:
+            h.update(b":missing")
+    return h.hexdigest()
+
+
+def value_fingerprint(value: Any) -> str:
+    """Fingerprint a JSON-like value together with the package source state.
+
+    Key order is preserved on purpose: pattern group order is significant.
+
+    Args:
+        value: Value to fingerprint.
+
+    Returns:
+        str: Hex digest.
+    """
+    payload = json.dumps(value, default=repr)
+    return hashlib.sha256(f"{_code_salt()}\0{payload}".encode()).hexdigest()
+
+
+def load(kind: str, key: str) -> Optional[Any]:
+    """Return a cached value, or None on a miss.
+
+    Args:
+        kind: Entry namespace (e.g. "config", "rules").
+        key: Fingerprint from `file_fingerprint` or `value_fingerprint`.
+
+    Returns:
+        Optional[Any]: Decoded JSON value or None.
+    """
+    if not enabled():
+        return None
+    try:
+        return json.loads((cache_dir() / f"{kind}-{key}.json").read_text())
+    except (OSError, ValueError):
+        return None
+
+
+def store(kind: str, key: str, value: Any) -> None:
+    """Persist a value atomically; values that do not survive JSON are skipped.
+
+    Args:
+        kind: Entry namespace (e.g. "config", "rules").
+        key: Fingerprint from `file_fingerprint` or `value_fingerprint`.
+        value: JSON-serializable value.
+    """
+    if not enabled():
+        return
+    try:
+        text = json.dumps(value)
+        if json.loads(text) != value:
+            return
+        directory = cache_dir()
+        write_atomic(directory / f"{kind}-{key}.json", text)
+        _prune(directory, kind)
+    except (OSError, TypeError, ValueError):
+        return
+
+
+def write_atomic(path: Path, text: Union[str, bytes]) -> None:
+    """Write a file via a temporary sibling and rename, creating parents.
+
+    Concurrent readers see either the old or the new content, never a
+    partial write.
+
+    Args:
+        path: Destination file.
+        text: Content to write (bytes are written as-is).
+
+    Raises:
+        OSError: If the directory or file cannot be written.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.stem}-", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb" if isinstance(text, bytes) else "w") as fh:
+            fh.write(text)
+        os.replace(tmp, path)
+    finally:
+        if os.path.exists(tmp):
+            os.unlink(tmp)
+
+
+def _prune(directory: Path, kind: str) -> None:
+    """Remove the oldest entries of `kind` beyond `_KEEP_PER_KIND`.
+
+    Args:
+        directory: Cache directory.
+        kind: Entry namespace.
+    """
+    entries = sorted(
+        directory.glob(f"{kind}-*.json"), key=lambda p: p.stat().st_mtime_ns, reverse=True
+    )
+    for stale in entries[_KEEP_PER_KIND:]:
+        stale.unlink()
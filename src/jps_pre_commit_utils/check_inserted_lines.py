@@ -12,20 +12,35 @@ and directly from its file path:
 
 from __future__ import annotations
 
-# Support running either as part of an installed package or as a standalone file.
-try:
-    from .cli import main as cli_main
-except ImportError:  # pragma: no cover
-    from jps_pre_commit_utils.cli import main as cli_main
+import sys
 
 
 def main() -> int:
-    """Invoke the CLI entry point and return its exit code.
+    """Invoke the CLI entry point with the process arguments.
+
+    If a scan server is running for the repository, the check runs there
+    (see `client`). Otherwise the CLI is imported here, rather than at
+    module level, so that importing this module stays cheap.
 
     Returns:
         int: Exit code from the CLI main function.
     """
-    return cli_main()
+    # Support running either as part of an installed package or as a standalone file.
+    try:
+        from .client import try_check
+    except ImportError:  # pragma: no cover
+        from jps_pre_commit_utils.client import try_check
+
+    code = try_check(sys.argv[1:])
+    if code is not None:
+        return code
+
+    try:
+        from .cli import main as cli_main
+    except ImportError:  # pragma: no cover
+        from jps_pre_commit_utils.cli import main as cli_main
+
+    return cli_main(sys.argv[1:])
 
 
 if __name__ == "__main__":
@@ -2,35 +2,343 @@
 
 from __future__ import annotations
 
-from typing import List
+import argparse
+import os
+import sys
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence
 
+from . import cache
 from .config import load_config
-from .git_diff import get_staged_diff
+from .diff_parser import AddedLine, iter_added_lines, split_diff
+from .filters import classify_range_files, classify_staged_files, drop_skipped
+from .findings import Finding
+from .git_diff import GitError, iter_range_diff, iter_staged_diff, with_rename_sources
+from .hierarchy import ConfigTree, Scan
+from .profiling import PROFILE_ENV, Profiler
 from .report import print_report
-from .scanner import scan_diff
+from .result_cache import ResultCache, results_path
+from .rules import REGEX_BACKENDS, Timeouts, resolve_backend
+from .scanner import iter_findings, scan_diff, unsafe_patterns
 
+OUTPUT_FORMATS = ("text", "json", "jsonl", "sarif")
 
-def main() -> int:
+
+def _build_parser() -> argparse.ArgumentParser:
+    """Create the argument parser for the checks entry point.
+
+    Returns:
+        argparse.ArgumentParser: Configured parser.
+    """
+    parser = argparse.ArgumentParser(
+        prog="jps-pre-commit-utils-checks",
+        description="Scan staged inserted lines for configured anti-patterns.",
+    )
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument(
+        "--all-files",
+        action="store_true",
+        help="Scan every line of every tracked file instead of the staged diff.",
+    )
+    mode.add_argument(
+        "--from-ref",
+        metavar="REF",
+        help="Scan lines added between REF and --to-ref instead of the staged diff.",
+    )
+    mode.add_argument(
+        "--since",
+        metavar="COMMIT",
+        help="Scan lines added since COMMIT (same as --from-ref COMMIT --to-ref HEAD).",
+    )
+    parser.add_argument(
+        "filenames",
+        nargs="*",
+        metavar="FILE",
+        help="Only scan these files (as passed by pre-commit); default: every changed file.",
+    )
+    parser.add_argument(
+        "--to-ref",
+        metavar="REF",
+        default=None,
+        help="End of the --from-ref range (default: HEAD).",
+    )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=None,
+        help="Scan with N worker processes (0 = all CPUs). Defaults to 1 for "
+        "staged changes and all CPUs for --all-files and ranges; small inputs "
+        "are always scanned serially.",
+    )
+    parser.add_argument(
+        "--format",
+        choices=OUTPUT_FORMATS,
+        default="text",
+        help="Output format: human-readable text (default), a JSON array, JSON Lines "
+        "or SARIF 2.1.0. Machine formats are streamed as findings are produced.",
+    )
+    parser.add_argument(
+        "--max-per-pattern",
+        type=int,
+        default=20,
+        metavar="N",
+        help="Print at most N findings per pattern plus a count of the rest "
+        "(negative = print every finding).",
+    )
+    parser.add_argument(
+        "--summary-only",
+        action="store_true",
+        help="Print only per-pattern finding counts.",
+    )
+    parser.add_argument(
+        "--regex-backend",
+        choices=REGEX_BACKENDS,
+        default=None,
+        help="Matcher engine (default: regex_backend from the config, 'auto'): 're2' "
+        "needs google-re2 and falls back to 're' per pattern and when not installed.",
+    )
+    parser.add_argument(
+        "--baseline",
+        type=Path,
+        default=None,
+        metavar="FILE",
+        help="Suppress findings accepted in FILE (written by --write-baseline).",
+    )
+    parser.add_argument(
+        "--write-baseline",
+        type=Path,
+        default=None,
+        metavar="FILE",
+        help="Accept every current finding: write them to FILE instead of reporting "
+        "them, and exit 0 (combine with --all-files to baseline a whole repository).",
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Rescan every file instead of reusing results for unchanged ones.",
+    )
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        default=os.environ.get(PROFILE_ENV, "") not in ("", "0"),
+        help=f"Report per-stage time/allocations and per-pattern regex cost "
+        f"(also enabled by {PROFILE_ENV}=1).",
+    )
+    parser.add_argument(
+        "--profile-output",
+        type=Path,
+        default=None,
+        help="Where to write the JSON profile (default: profile.json in the cache directory).",
+    )
+    return parser
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
     """Run the end-to-end scan for staged inserted lines.
 
     Workflow:
       1) Load configuration (local > home > defaults).
-      2) Collect staged diff (unified=0).
-      3) Extract added lines and scan them.
-      4) Print a report; return 1 if findings were detected.
+      2) Classify staged files; skip binary, generated, excluded and
+         oversized ones.
+      3) Stream the staged diff (unified=0) from git. With --from-ref or
+         --since, the diff of a commit range is scanned instead; with
+         --all-files, every line of every tracked file (read in bulk via
+         `git cat-file --batch`).
+      4) Parse added lines (with file and line number) lazily and scan
+         each against the pattern groups routed to its file type, using
+         the configuration of its directory (nested
+         .my-pre-commit-checks.yaml files refine the root one); files
+         whose staged blobs are unchanged since the last run reuse their
+         cached findings.
+      5) Print a report (at most --max-per-pattern findings per pattern),
+         or with --format json/jsonl/sarif stream each finding to stdout
+         as it is found; return 1 if findings were detected.
+
+    File arguments (as passed by pre-commit) limit every mode to those
+    files, so each of pre-commit's parallel batches diffs and scans only its
+    own share. Findings accepted in a --baseline file are suppressed, and
+    --write-baseline records the current findings instead of reporting them.
+    With --profile, each stage is timed and a JSON profile is written.
+
+    Args:
+        argv: Command-line arguments without the program name. Defaults to
+            no arguments (a serial scan of the staged diff).
+
+    Returns:
+        int: 0 if no findings (or a baseline was written), 1 if findings
+        were detected, 2 if git failed (e.g. on an unknown revision).
+    """
+    parser = _build_parser()
+    args = parser.parse_args([] if argv is None else list(argv))
+    try:
+        return _run(parser, args)
+    except GitError as exc:
+        print(f"error: {exc}", file=sys.stderr)
+        return 2
+
+
+def _run(parser: argparse.ArgumentParser, args: argparse.Namespace) -> int:
+    """Scan and report for parsed arguments (see `main`).
+
+    Args:
+        parser: Parser, for reporting argument errors.
+        args: Parsed arguments.
 
     Returns:
         int: 0 if no findings, 1 if findings were detected.
+
+    Raises:
+        GitError: If a git command fails.
     """
-    cfg = load_config()
+    if args.to_ref is not None and args.from_ref is None:
+        parser.error("--to-ref requires --from-ref")
+    from_ref = args.since or args.from_ref
+    to_ref = args.to_ref or "HEAD"
+    staged = from_ref is None and not args.all_files
+    paths: Optional[List[str]] = args.filenames or None
+    jobs = args.jobs if args.jobs is not None else (1 if staged else 0)
+    profiler = Profiler(enabled=args.profile)
+    baseline = None
+    if args.baseline is not None:
+        from .baseline import Baseline
+
+        try:
+            baseline = Baseline.load(args.baseline)
+        except (OSError, ValueError) as exc:
+            parser.error(f"cannot read baseline: {exc}")
+
+    with profiler.stage("load_config"):
+        cfg = load_config()
+    if args.regex_backend is not None:
+        cfg = dict(cfg, regex_backend=args.regex_backend)
+    if cfg.get("regex_backend") == "re2" and resolve_backend("re2") != "re2":
+        print("warning: google-re2 is not installed; using the 're' backend", file=sys.stderr)
+    _warn_unsafe(cfg)
+
+    blobs: Dict[str, str] = {}
+    if args.all_files:
+        from .tree_scan import classify_tree_files, iter_tree_lines
 
-    raw_diff = get_staged_diff()
-    added_lines = _extract_added_lines(raw_diff)
+        with profiler.stage("classify_files"):
+            skips, entries = classify_tree_files(cfg, paths)
+        records = profiler.wrap("read_blobs", iter_tree_lines(entries, skips, cfg, blobs))
+    else:
+        with profiler.stage("classify_files"):
+            if paths is not None:
+                paths = with_rename_sources(paths, ["--cached"] if staged else [from_ref, to_ref])
+            if staged:
+                skips = classify_staged_files(cfg, paths)
+            else:
+                skips = classify_range_files(cfg, from_ref, to_ref, paths)
+        # Skipped files are left out of the diff; drop_skipped below is only a
+        # safety net (e.g. for more exclusions than fit on a command line).
+        skipped = list(skips.files)
+        if staged:
+            diff = iter_staged_diff(paths, skipped)
+        else:
+            diff = iter_range_diff(from_ref, to_ref, paths, skipped)
+        diff_lines = profiler.wrap("git_diff", diff)
+        records = profiler.wrap("parse_diff", iter_added_lines(diff_lines, blobs))
+    added_lines = drop_skipped(records, skips)
+    tree = ConfigTree(cfg)
+    results = ResultCache(
+        None if args.no_cache else results_path(), cfg, salt_for=tree.fingerprint_for
+    )
+    timeouts = skips.timeouts
+    scan_root = _scan_function(cfg, jobs, profiler, timeouts, streaming=args.format != "text")
+
+    def scan(recs: Iterable[AddedLine]) -> Iterable[Finding]:
+        return tree.iter_findings(recs, scan_root, jobs, timeouts, profiler.pattern_costs)
+
+    found = results.scan(added_lines, blobs, scan, timeouts.paths)
+    if baseline is not None and args.write_baseline is None:
+        found = baseline.filter(found)
+
+    if args.write_baseline is not None:
+        from .baseline import Baseline
+
+        with profiler.stage("scan"):
+            accepted = Baseline.from_findings(found)
+        try:
+            accepted.save(args.write_baseline)
+        except OSError as exc:
+            parser.error(f"cannot write baseline: {exc}")
+        print(f"Wrote {len(accepted)} accepted findings to {args.write_baseline}", file=sys.stderr)
+        count = 0
+    elif args.format != "text":
+        from .formats import WRITERS
+
+        stream = profiler.wrap("scan", found)
+        with profiler.stage("report"):
+            count = WRITERS[args.format](stream, sys.stdout, skips.summary)
+    else:
+        with profiler.stage("scan"):
+            findings = list(found)
+        if args.summary_only:
+            limit: Optional[int] = 0
+        else:
+            limit = args.max_per_pattern if args.max_per_pattern >= 0 else None
+        with profiler.stage("report"):
+            print_report(findings, skipped=skips.summary(), max_per_pattern=limit)
+        count = len(findings)
+    results.save()
+    if baseline is not None and baseline.suppressed:
+        print(f"{baseline.suppressed} findings suppressed by the baseline", file=sys.stderr)
+
+    if profiler.enabled:
+        profiler.print_summary()
+        output = args.profile_output or cache.cache_dir() / "profile.json"
+        profiler.write_json(output)
+
+    return 1 if count else 0
+
+
+def _warn_unsafe(cfg: Mapping[str, Any]) -> None:
+    """Warn on stderr about configured patterns prone to catastrophic backtracking.
+
+    Args:
+        cfg: Loaded configuration.
+    """
+    action = "rejected" if cfg.get("regex_safety") == "reject" else "kept"
+    for (group, pattern), reason in unsafe_patterns(cfg).items():
+        print(
+            f"warning: pattern {pattern!r} in '{group}' may backtrack catastrophically "
+            f"({reason}); {action}",
+            file=sys.stderr,
+        )
+
+
+def _scan_function(
+    cfg: Mapping[str, Any],
+    jobs: int,
+    profiler: Profiler,
+    timeouts: Timeouts,
+    streaming: bool,
+) -> Scan:
+    """Pick the scanner for the requested job count and output mode.
+
+    Args:
+        cfg: Loaded configuration.
+        jobs: --jobs value (1 scans in-process).
+        profiler: Profiler receiving per-pattern costs for serial scans.
+        timeouts: Record of pattern/line pairs skipped for time.
+        streaming: Return findings lazily instead of as a list.
+
+    Returns:
+        Scan: Scanner taking added-line records.
+    """
+    if jobs == 1:
+        costs = profiler.pattern_costs
+        if streaming:
+            return lambda recs: iter_findings(recs, cfg, pattern_costs=costs, timeouts=timeouts)
+        return lambda recs: scan_diff(recs, cfg, pattern_costs=costs, timeouts=timeouts)
 
-    findings = scan_diff(added_lines, cfg)
-    print_report(findings)
+    from .parallel import iter_parallel, scan_parallel
 
-    return 1 if findings else 0
+    if streaming:
+        return lambda recs: iter_parallel(recs, cfg, jobs, timeouts=timeouts)
+    return lambda recs: scan_parallel(recs, cfg, jobs, timeouts=timeouts)
 
 
 def _extract_added_lines(diff_text: str) -> List[str]:
@@ -44,12 +352,4 @@ def _extract_added_lines(diff_text: str) -> List[str]:
     Returns:
         List[str]: Added lines without the leading '+'.
     """
-    added: List[str] = []
-    for line in diff_text.splitlines():
-        if not line.startswith("+"):
-            continue
-        # ignore diff metadata lines like '+++ b/file.py'
-        if line.startswith("+++"):
-            continue
-        added.append(line[1:])
-    return added
+    return [rec.text for rec in iter_added_lines(split_diff(diff_text))]
@@ -0,0 +1,129 @@
+"""Tiny client for a running scan server (see `server`).
+
+The hook entry point tries the server first: if one is listening on the
+repository's socket, the check runs there with config and compiled rules
+already warm, and only this module (standard library only) is imported.
+If no server answers, the caller falls back to an in-process scan.
+
+Set ``JPS_PRECOMMIT_NO_SERVER=1`` to never use a server, or
+``JPS_PRECOMMIT_SOCKET`` to point at a specific socket.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import socket
+import sys
+from pathlib import Path
+from typing import Any, Dict, Optional, Sequence
+
+SOCKET_ENV = "JPS_PRECOMMIT_SOCKET"
+NO_SERVER_ENV = "JPS_PRECOMMIT_NO_SERVER"
+SOCKET_NAME = "jps-pre-commit.sock"
+
+# Connecting should be instant; a scan may take a while on huge diffs.
+_CONNECT_TIMEOUT = 0.2
+_REQUEST_TIMEOUT = 300.0
+
+
+def _git_dir(start: Path) -> Optional[Path]:
+    """Find the git directory for `start` without running git.
+
+    Args:
+        start: Directory to search upward from.
+
+    Returns:
+        Optional[Path]: The ``.git`` directory (following the ``gitdir:``
+        file used by worktrees), or None outside a repository.
+    """
+    for directory in (start, *start.parents):
+        dot_git = directory / ".git"
+        if dot_git.is_dir():
+            return dot_git
+        if dot_git.is_file():
+            try:
+                content = dot_git.read_text().strip()
+            except OSError:
+                return None
+            if content.startswith("gitdir:"):
+                return (directory / content[len("gitdir:") :].strip()).resolve()
+            return None
+    return None
+
+
+def socket_path(cwd: Optional[Path] = None) -> Optional[Path]:
+    """Return the server socket for the repository containing `cwd`.
+
+    Args:
+        cwd: Working directory (default: the current one).
+
+    Returns:
+        Optional[Path]: ``$JPS_PRECOMMIT_SOCKET`` or ``<git-dir>/jps-pre-commit.sock``;
+        None outside a repository.
+    """
+    override = os.environ.get(SOCKET_ENV)
+    if override:
+        return Path(override)
+    git_dir = _git_dir(cwd or Path.cwd())
+    return None if git_dir is None else git_dir / SOCKET_NAME
+
+
+def request(
+    path: Path, method: str, params: Optional[Dict[str, Any]] = None
+) -> Optional[Dict[str, Any]]:
+    """Send one JSON-RPC request and return the response object.
+
+    Args:
+        path: Server socket.
+        method: Method name (e.g. "scan", "check", "ping").
+        params: Method parameters.
+
+    Returns:
+        Optional[Dict[str, Any]]: The decoded response, or None if no server
+        is listening or the connection failed.
+    """
+    message = {"jsonrpc": "2.0", "id": 1, "method": method, "params": params or {}}
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.settimeout(_CONNECT_TIMEOUT)
+            sock.connect(str(path))
+            sock.settimeout(_REQUEST_TIMEOUT)
+            sock.sendall(json.dumps(message).encode("utf-8") + b"\n")
+            with sock.makefile("rb") as reader:
+                line = reader.readline()
+    except (OSError, ValueError):
+        return None
+    try:
+        response = json.loads(line)
+    except ValueError:
+        return None
+    return response if isinstance(response, dict) else None
+
+
+def try_check(argv: Sequence[str]) -> Optional[int]:
+    """Run the hook's check on a server, if one is running for this repository.
+
+    Args:
+        argv: Command-line arguments without the program name.
+
+    Returns:
+        Optional[int]: The check's exit code, or None when no server handled
+        the request and the caller should scan in-process.
+    """
+    if os.environ.get(NO_SERVER_ENV, "") not in ("", "0"):
+        return None
+    path = socket_path()
+    if path is None or not path.exists():
+        return None
+    # git runs hooks with GIT_INDEX_FILE etc. pointing at the index being
+    # committed (e.g. a temporary one for `git commit -a`); the server must
+    # scan that one, not whatever its own environment names.
+    env = {key: value for key, value in os.environ.items() if key.startswith("GIT_")}
+    response = request(path, "check", {"argv": list(argv), "cwd": os.getcwd(), "env": env})
+    if response is None or "result" not in response:
+        return None
+    result = response["result"]
+    sys.stdout.write(result.get("stdout", ""))
+    sys.stderr.write(result.get("stderr", ""))
+    return int(result.get("exit_code", 0))
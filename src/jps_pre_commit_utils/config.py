@@ -3,9 +3,9 @@
 from __future__ import annotations
 
 from pathlib import Path
-from typing import Any, Dict, Mapping, MutableMapping
+from typing import Any, Dict, Mapping, MutableMapping, Optional
 
-import yaml
+from . import cache
 
 # Defaults keep your existing expectations and tests green.
 _DEFAULTS: Dict[str, Any] = {
@@ -33,12 +33,76 @@ _DEFAULTS: Dict[str, Any] = {
             r"TODO",
         ],
     },
+    # File extensions routed to each pattern group. Groups listed here only
+    # run on their own files; other groups run on every file, and files with
+    # an unlisted extension are checked against every group.
+    "languages": {
+        "python": [".py", ".pyi"],
+        "perl": [".pl", ".pm", ".t"],
+        "yaml": [".yml", ".yaml"],
+    },
+    # Files never scanned: globs without '/' match the file name at any depth.
+    "exclude": [
+        "*.min.js",
+        "*.min.css",
+        "*.map",
+        "package-lock.json",
+        "yarn.lock",
+        "poetry.lock",
+        "Pipfile.lock",
+    ],
+    # Skip files with more added lines than this, and individual lines longer
+    # than max_line_length characters (0 disables either limit).
+    "max_added_lines": 20000,
+    "max_line_length": 5000,
+    # Longest a single regex call may run on one line before that pattern is
+    # skipped for the line (0 disables the budget).
+    "regex_timeout_ms": 100,
+    # Patterns prone to catastrophic backtracking: "warn" about them, "reject"
+    # (drop) them, or "off" to skip the analysis.
+    "regex_safety": "warn",
+    # Matcher engine: "re2" runs every pattern RE2 supports in one linear-time
+    # pass (needs google-re2), "re" uses Python's engine only, and "auto"
+    # picks re2 when it is installed and some pattern lacks a literal anchor.
+    # Findings are the same either way.
+    "regex_backend": "auto",
+    # Secrets: regexes for well-known token formats and, when "entropy" is
+    # enabled, lines holding a base64/hex run of at least min_length chars
+    # whose Shannon entropy (bits per char) exceeds the limit (all reported in
+    # group "secrets"). Entropy is opt-in: commit SHAs and digests are
+    # random-looking hex too.
+    "secrets": {
+        "entropy": False,
+        "min_length": 20,
+        "base64_entropy": 4.5,
+        "hex_entropy": 3.0,
+        "prefixes": [
+            r"AKIA[0-9A-Z]{16}",
+            r"gh[pousr]_[A-Za-z0-9]{36,}",
+            r"github_pat_[A-Za-z0-9_]{22,}",
+            r"glpat-[A-Za-z0-9_-]{20,}",
+            r"xox[abposr]-[A-Za-z0-9-]{10,}",
+            r"sk_live_[A-Za-z0-9]{24,}",
+            r"AIza[A-Za-z0-9_-]{35}",
+            r"-----BEGIN [A-Z ]*PRIVATE KEY-----",
+        ],
+    },
 }
 
+# Name of the repository-local config file; nested copies in subdirectories
+# refine it for the files below them (see `load_directory_config`).
+CONFIG_FILE_NAME = ".my-pre-commit-checks.yaml"
+
+_REGEX_SAFETY = ("warn", "reject", "off")
+_REGEX_BACKENDS = ("auto", "re", "re2")
+
 
 def _read_yaml(path: Path) -> Dict[str, Any]:
     """Read a YAML file returning a dict; empty dict if not found/invalid.
 
+    PyYAML is imported only once a file actually exists, so runs without any
+    config file never pay for it.
+
     Args:
         path: File path.
 
@@ -48,6 +112,8 @@ def _read_yaml(path: Path) -> Dict[str, Any]:
     try:
         if not path.exists():
             return {}
+        import yaml
+
         return yaml.safe_load(path.read_text()) or {}
     except Exception:
         # Invalid YAML or IO errors are handled as empty.
@@ -69,11 +135,35 @@ def _merge(base: MutableMapping[str, Any], override: Mapping[str, Any]) -> Mutab
     return base
 
 
+def deep_merge(base: Mapping[str, Any], override: Mapping[str, Any]) -> Dict[str, Any]:
+    """Merge override into a copy of base, recursing into nested mappings.
+
+    Mappings are merged key by key at every level; any other value
+    (including lists) in `override` replaces the one in `base`.
+
+    Args:
+        base: Configuration to refine; not modified.
+        override: New values.
+
+    Returns:
+        Dict[str, Any]: Merged configuration.
+    """
+    merged = dict(base)
+    for k, v in override.items():
+        current = merged.get(k)
+        if isinstance(v, Mapping) and isinstance(current, Mapping):
+            merged[k] = deep_merge(current, v)
+        else:
+            merged[k] = v
+    return merged
+
+
 def load_config() -> Dict[str, Any]:
     """Load config respecting precedence: local > home > defaults.
 
     Local file:
-      ./.my-pre-commit-checks.yaml
+      ./.my-pre-commit-checks.yaml (copies in subdirectories refine it for
+      the files below them; see `load_directory_config`)
 
     Home file:
       ~/.config/my-pre-commit-checks.yaml
@@ -83,6 +173,43 @@ def load_config() -> Dict[str, Any]:
       - ignore_patterns: List[str]
       - extra_regexes: List[str]
       - patterns: Dict[str, List[str]]
+      - languages: Dict[str, List[str]] (group -> file extensions)
+      - exclude: List[str] (file globs never scanned)
+      - max_added_lines: int, max_line_length: int (0 disables)
+      - regex_timeout_ms: int (0 disables)
+      - regex_safety: "warn" | "reject" | "off"
+      - regex_backend: "auto" | "re" | "re2"
+      - secrets: Dict (entropy, min_length, base64_entropy, hex_entropy,
+        prefixes); missing keys keep their defaults
+
+    The merged result is cached on disk (see `cache`), keyed by the state of
+    both files and the package source, so unchanged configs skip YAML
+    parsing entirely.
+
+    Returns:
+        Dict[str, Any]: Fully merged configuration.
+    """
+    home_file = Path.home() / ".config" / "my-pre-commit-checks.yaml"
+    local_file = Path.cwd() / CONFIG_FILE_NAME
+
+    # Defaults are part of the key so new default keys are never masked by
+    # an entry written before they existed.
+    key = cache.value_fingerprint([cache.file_fingerprint([home_file, local_file]), _DEFAULTS])
+    cached = cache.load("config", key)
+    if isinstance(cached, dict):
+        return cached
+
+    cfg = _load_files(home_file, local_file)
+    cache.store("config", key, cfg)
+    return cfg
+
+
+def _load_files(home_file: Path, local_file: Path) -> Dict[str, Any]:
+    """Read and merge the config files without consulting the cache.
+
+    Args:
+        home_file: Path of the per-user config file.
+        local_file: Path of the repository-local config file.
 
     Returns:
         Dict[str, Any]: Fully merged configuration.
@@ -90,33 +217,89 @@ def load_config() -> Dict[str, Any]:
     cfg: Dict[str, Any] = dict(_DEFAULTS)
 
     # 1) Home
-    home_file = Path.home() / ".config" / "my-pre-commit-checks.yaml"
     home_cfg = _read_yaml(home_file)
     if home_cfg:
         _merge(cfg, home_cfg)
 
     # 2) Local
-    local_file = Path.cwd() / ".my-pre-commit-checks.yaml"
     local_cfg = _read_yaml(local_file)
     if local_cfg:
         _merge(cfg, local_cfg)
 
-    # Type guards (best effort; keep it permissive for user files).
-    cfg.setdefault("paths", _DEFAULTS["paths"])
+    return _guard(cfg, _DEFAULTS)
+
+
+def load_directory_config(parent: Mapping[str, Any], directory: Path) -> Optional[Dict[str, Any]]:
+    """Refine a directory's inherited configuration with its own config file.
+
+    Nested files only refine what is matched ("patterns", "paths",
+    "extra_regexes", "ignore_patterns", "secrets", "languages" and the regex
+    settings). Which files and lines are scanned at all ("exclude",
+    "max_added_lines", "max_line_length") is decided once for the whole
+    diff from the repository configuration, so those keys have no effect
+    here.
+
+    Args:
+        parent: Resolved configuration of the enclosing directory.
+        directory: Directory that may hold a `CONFIG_FILE_NAME` file.
+
+    Returns:
+        Optional[Dict[str, Any]]: `parent` deep-merged with the file (see
+        `deep_merge`), or None if the directory has no usable config file.
+        Values of the wrong type fall back to the parent's.
+    """
+    own = _read_yaml(directory / CONFIG_FILE_NAME)
+    if not isinstance(own, dict) or not own:
+        return None
+    return _guard(deep_merge(parent, own), {**_DEFAULTS, **parent})
+
+
+def _guard(cfg: Dict[str, Any], fallback: Mapping[str, Any]) -> Dict[str, Any]:
+    """Replace missing or mistyped values (best effort; permissive for user files).
+
+    Args:
+        cfg: Merged configuration, updated in place.
+        fallback: Values to use instead (the defaults, or a parent config).
+
+    Returns:
+        Dict[str, Any]: `cfg`.
+    """
+    cfg.setdefault("paths", fallback["paths"])
     if not isinstance(cfg["paths"], list):
-        cfg["paths"] = list(_DEFAULTS["paths"])
+        cfg["paths"] = list(fallback["paths"])
 
-    cfg.setdefault("ignore_patterns", _DEFAULTS["ignore_patterns"])
+    cfg.setdefault("ignore_patterns", fallback["ignore_patterns"])
     if not isinstance(cfg["ignore_patterns"], list):
-        cfg["ignore_patterns"] = list(_DEFAULTS["ignore_patterns"])
+        cfg["ignore_patterns"] = list(fallback["ignore_patterns"])
 
-    cfg.setdefault("extra_regexes", _DEFAULTS["extra_regexes"])
+    cfg.setdefault("extra_regexes", fallback["extra_regexes"])
     if not isinstance(cfg["extra_regexes"], list):
-        cfg["extra_regexes"] = list(_DEFAULTS["extra_regexes"])
+        cfg["extra_regexes"] = list(fallback["extra_regexes"])
 
-    cfg.setdefault("patterns", _DEFAULTS["patterns"])
+    cfg.setdefault("patterns", fallback["patterns"])
     pats = cfg["patterns"]
     if not isinstance(pats, dict):
-        cfg["patterns"] = dict(_DEFAULTS["patterns"])
+        cfg["patterns"] = dict(fallback["patterns"])
+
+    cfg.setdefault("languages", fallback["languages"])
+    if not isinstance(cfg["languages"], dict):
+        cfg["languages"] = dict(fallback["languages"])
+
+    cfg.setdefault("exclude", fallback["exclude"])
+    if not isinstance(cfg["exclude"], list):
+        cfg["exclude"] = list(fallback["exclude"])
+
+    for limit in ("max_added_lines", "max_line_length", "regex_timeout_ms"):
+        cfg.setdefault(limit, fallback[limit])
+        if not isinstance(cfg[limit], int) or isinstance(cfg[limit], bool):
+            cfg[limit] = fallback[limit]
+
+    for key, choices in (("regex_safety", _REGEX_SAFETY), ("regex_backend", _REGEX_BACKENDS)):
+        cfg.setdefault(key, fallback[key])
+        if cfg[key] not in choices:
+            cfg[key] = fallback[key]
+
+    secrets = cfg.get("secrets")
+    cfg["secrets"] = {**fallback["secrets"], **(secrets if isinstance(secrets, dict) else {})}
 
     return cfg
@@ -0,0 +1,144 @@
+"""Structured parsing of unified diffs into per-file added-line records."""
+
+from __future__ import annotations
+
+import re
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional
+
+# @@ -old[,count] +new[,count] @@ optional section heading
+_HUNK_RE = re.compile(r"^@@ -\d+(?:,\d+)? \+(\d+)(?:,(\d+))? @@")
+
+_ESCAPES = {"a": 7, "b": 8, "t": 9, "n": 10, "v": 11, "f": 12, "r": 13, '"': 34, "\\": 92}
+
+
+class AddedLine(NamedTuple):
+    """One added line of a diff, located in the new version of its file."""
+
+    path: str
+    lineno: int
+    text: str
+
+
+def split_diff(diff_text: str) -> List[str]:
+    """Split diff text into lines the way git terminates them.
+
+    Only "\n" ends a line (a preceding "\r" is dropped). `str.splitlines()`
+    would also split inside an added line at form feeds, "\u2028" and the
+    like, and the second piece would not look like a diff line.
+
+    Args:
+        diff_text: Unified diff output.
+
+    Returns:
+        List[str]: Diff lines without line terminators.
+    """
+    lines = diff_text.split("\n")
+    if lines and not lines[-1]:
+        lines.pop()
+    return [line[:-1] if line.endswith("\r") else line for line in lines]
+
+
+def _unquote(path: str) -> str:
+    """Undo git's C-style quoting of unusual path names.
+
+    Args:
+        path: Path as printed by git, possibly wrapped in double quotes.
+
+    Returns:
+        str: Decoded path.
+    """
+    if len(path) < 2 or not (path.startswith('"') and path.endswith('"')):
+        return path
+    body = path[1:-1]
+    out = bytearray()
+    i = 0
+    while i < len(body):
+        ch = body[i]
+        if ch != "\\" or i + 1 >= len(body):
+            out.extend(ch.encode("utf-8"))
+            i += 1
+            continue
+        nxt = body[i + 1]
+        if nxt in "01234567":
+            out.append(int(body[i + 1 : i + 4], 8) & 0xFF)
+            i += 4
+        else:
+            out.append(_ESCAPES.get(nxt, ord(nxt)))
+            i += 2
+    return out.decode("utf-8", "replace")
+
+
+def _new_path(header_value: str) -> Optional[str]:
+    """Return the repository path from a '+++ ' header value.
+
+    Args:
+        header_value: Text after '+++ '.
+
+    Returns:
+        Optional[str]: Path without the 'b/' prefix, or None for /dev/null.
+    """
+    value = _unquote(header_value.rstrip("\t"))
+    if value == "/dev/null":
+        return None
+    return value[2:] if value.startswith("b/") else value
+
+
+def iter_added_lines(
+    diff_lines: Iterable[str], blobs: Optional[Dict[str, str]] = None
+) -> Iterator[AddedLine]:
+    """Yield (path, new-line-number, text) for every added line of a diff.
+
+    Hunk headers are used to track positions, so added lines whose content
+    itself starts with '++' are not mistaken for file headers.
+
+    Args:
+        diff_lines: Lines of unified diff output (any context size).
+        blobs: Optional dict that receives "<old>..<new>" blob ids from each
+            file's "index" header, keyed by path. Entries are added as the
+            headers are parsed, before that file's added lines are yielded.
+
+    Yields:
+        AddedLine: Added lines in diff order.
+    """
+    path: Optional[str] = None
+    index: Optional[str] = None
+    lineno = 0
+    remaining = 0  # lines of the new file still expected in the current hunk
+
+    for line in diff_lines:
+        if remaining > 0:
+            tag = line[:1]
+            if tag == "+":
+                if path is not None:
+                    yield AddedLine(path, lineno, line[1:])
+                lineno += 1
+                remaining -= 1
+                continue
+            if tag == " ":
+                lineno += 1
+                remaining -= 1
+                continue
+            if tag in ("-", "\\"):
+                continue
+            if not line:  # blank context line (diff.suppressBlankEmpty)
+                lineno += 1
+                remaining -= 1
+                continue
+            if not line.startswith(("diff ", "@@")):
+                continue  # stray line: keep reading the hunk
+            remaining = 0  # hunk shorter than announced: handle the header
+
+        if line.startswith("diff --git "):
+            path = None
+            index = None
+        elif line.startswith("index "):
+            index = line[6:].split(" ", 1)[0]
+        elif line.startswith("+++ "):
+            path = _new_path(line[4:])
+            if blobs is not None and path is not None and index is not None:
+                blobs[path] = index
+        elif line.startswith("@@"):
+            match = _HUNK_RE.match(line)
+            if match:
+                lineno = int(match.group(1))
+                remaining = 1 if match.group(2) is None else int(match.group(2))
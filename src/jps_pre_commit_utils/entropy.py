@@ -0,0 +1,179 @@
+"""High-entropy string detection for added lines (likely secrets).
+
+Lines are tokenized into base64- and hex-like runs, and the Shannon entropy
+of every candidate in a batch is computed at once. With NumPy installed,
+large batches use one byte-histogram array for all candidates; small
+batches (the usual commit) are counted in Python, so the hook never pays
+NumPy's import time for them.
+"""
+
+from __future__ import annotations
+
+import math
+import re
+from collections import Counter
+from functools import lru_cache
+from typing import Any, Dict, List, Mapping, Optional, Sequence
+
+# Candidates per batch before NumPy is worth importing and calling.
+NUMPY_MIN_TOKENS = 256
+
+# Candidates per histogram array (bounds it at about 4 MB).
+_NUMPY_CHUNK = 4096
+
+HEX_LABEL = "high-entropy hex string"
+BASE64_LABEL = "high-entropy base64 string"
+
+_HEX_RUN = re.compile(r"[0-9a-fA-F]+")
+
+# Alphabets spelled out in code (character tables, test data) look random
+# but are not secrets; runs inside them are never reported.
+_SEQUENCES = (
+    "ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789+/",
+    "abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789-_",
+    "0123456789ABCDEFabcdef",
+    "0123456789abcdefABCDEF",
+)
+
+
+@lru_cache(maxsize=None)
+def _numpy_module() -> Any:
+    """Import NumPy on first use.
+
+    Returns:
+        Any: The `numpy` module, or None if it is not installed.
+    """
+    try:
+        import numpy
+    except ImportError:
+        return None
+    return numpy
+
+
+def shannon_entropy(token: str) -> float:
+    """Return the Shannon entropy of a string, in bits per character.
+
+    Args:
+        token: Text to measure.
+
+    Returns:
+        float: Entropy (0.0 for an empty string).
+    """
+    size = len(token)
+    if not size:
+        return 0.0
+    return math.log2(size) - sum(c * math.log2(c) for c in Counter(token).values()) / size
+
+
+def entropies(tokens: Sequence[str]) -> List[float]:
+    """Return the Shannon entropy of each ASCII token.
+
+    Args:
+        tokens: ASCII strings.
+
+    Returns:
+        List[float]: Entropy per token, in input order.
+    """
+    np = _numpy_module() if len(tokens) >= NUMPY_MIN_TOKENS else None
+    if np is None:
+        return [shannon_entropy(t) for t in tokens]
+    out: List[float] = []
+    for start in range(0, len(tokens), _NUMPY_CHUNK):
+        chunk = tokens[start : start + _NUMPY_CHUNK]
+        count = len(chunk)
+        data = np.frombuffer("".join(chunk).encode("ascii"), dtype=np.uint8)
+        sizes = np.fromiter(map(len, chunk), dtype=np.int64, count=count)
+        owner = np.repeat(np.arange(count, dtype=np.int64), sizes)
+        # One 128-bin character histogram per token (tokens are ASCII).
+        hist = np.bincount(owner * 128 + data, minlength=count * 128).reshape(count, 128)
+        rows, cols = np.nonzero(hist)
+        counts = hist[rows, cols].astype(np.float64)
+        # H = log2(n) - sum(c * log2(c)) / n over the characters present.
+        weighted = np.bincount(rows, weights=counts * np.log2(counts), minlength=count)
+        out.extend((np.log2(sizes) - weighted / sizes).tolist())
+    return out
+
+
+class EntropyDetector:
+    """Flag lines containing long, high-entropy base64 or hex runs."""
+
+    def __init__(
+        self, min_length: int = 20, base64_limit: float = 4.5, hex_limit: float = 3.0
+    ) -> None:
+        """Set the thresholds.
+
+        Args:
+            min_length: Shortest run considered a candidate.
+            base64_limit: Entropy above which a base64-like run is reported.
+            hex_limit: Entropy above which a hex run (with at least one
+                digit and one letter) is reported.
+        """
+        self.min_length = min_length
+        self.base64_limit = base64_limit
+        self.hex_limit = hex_limit
+        # '=' only as trailing padding, so "key=value" splits at the '='.
+        self._token = re.compile(rf"[A-Za-z0-9+/_-]{{{min_length},}}={{0,2}}")
+
+    @classmethod
+    def from_config(cls, settings: object) -> Optional["EntropyDetector"]:
+        """Build a detector from the "secrets" config value.
+
+        Args:
+            settings: Mapping with "entropy" (bool, default False),
+                "min_length", "base64_entropy" and "hex_entropy"; missing
+                keys use the defaults.
+
+        Returns:
+            Optional[EntropyDetector]: None unless entropy checks are enabled.
+        """
+        if not isinstance(settings, Mapping) or not settings.get("entropy", False):
+            return None
+        try:
+            return cls(
+                max(1, int(settings.get("min_length", 20))),
+                float(settings.get("base64_entropy", 4.5)),
+                float(settings.get("hex_entropy", 3.0)),
+            )
+        except (TypeError, ValueError):
+            return cls()
+
+    def scan(self, lines: Sequence[str], ignore: Optional[re.Pattern] = None) -> Dict[int, str]:
+        """Find the lines with a high-entropy run, checking all candidates at once.
+
+        Args:
+            lines: Added line texts.
+            ignore: Optional allowlist; runs inside text it matches are ignored.
+
+        Returns:
+            Dict[int, str]: Line index -> `HEX_LABEL` or `BASE64_LABEL` for
+            the first high-entropy run on that line.
+        """
+        owners: List[int] = []
+        tokens: List[str] = []
+        findall = self._token.findall
+        for index, line in enumerate(lines):
+            found = findall(line)
+            if not found:
+                continue
+            if ignore is not None and ignore.search(line):
+                found = findall(ignore.sub("\0", line))
+            for token in found:
+                owners.append(index)
+                tokens.append(token.rstrip("="))
+        flagged: Dict[int, str] = {}
+        if not tokens:
+            return flagged
+        for index, token, bits in zip(owners, tokens, entropies(tokens)):
+            if index in flagged:
+                continue
+            if _HEX_RUN.fullmatch(token):
+                if bits <= self.hex_limit or token.isdigit() or token.isalpha():
+                    continue
+                label = HEX_LABEL
+            elif bits > self.base64_limit:
+                label = BASE64_LABEL
+            else:
+                continue
+            if not any(token in seq for seq in _SEQUENCES):
+                flagged[index] = label
+        return flagged
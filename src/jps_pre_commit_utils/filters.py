@@ -0,0 +1,212 @@
+"""Pre-scan classification of staged files that should not be scanned.
+
+Binary files, files marked ``binary`` or ``linguist-generated`` in
+``.gitattributes``, files matching the ``exclude`` globs and files with more
+than ``max_added_lines`` added lines are skipped before any of their lines
+reach the scanner. Individual lines longer than ``max_line_length`` (typically
+minified code or embedded base64) are skipped as well. The report also
+collects lines that a pattern could not check within its regex time budget.
+"""
+
+from __future__ import annotations
+
+import fnmatch
+import re
+from typing import Dict, Iterable, Iterator, List, Mapping, Optional, Sequence, Tuple
+
+from .diff_parser import AddedLine
+from .git_diff import get_range_numstat, get_staged_attributes, get_staged_numstat
+from .rules import Timeouts
+
+BINARY = "binary"
+GENERATED = "generated"
+EXCLUDED = "excluded"
+OVERSIZED = "oversized"
+
+_TRUTHY_ATTR = ("set", "true")
+
+
+class SkipReport:
+    """Files and lines left out of a scan, with the reason for each."""
+
+    def __init__(self, max_line_length: int = 0) -> None:
+        """Create an empty report.
+
+        Args:
+            max_line_length: Lines longer than this are skipped (0 disables).
+        """
+        self.files: Dict[str, str] = {}
+        self.max_line_length = max_line_length
+        self.long_lines = 0
+        self.timeouts = Timeouts()
+
+    def summary(self) -> Dict[str, int]:
+        """Return human-readable skip counts for the report.
+
+        Returns:
+            Dict[str, int]: Description -> count, omitting zero counts.
+        """
+        counts: Dict[str, int] = {}
+        for reason in self.files.values():
+            label = f"{reason} file(s)"
+            counts[label] = counts.get(label, 0) + 1
+        if self.long_lines:
+            counts[f"line(s) over {self.max_line_length} chars"] = self.long_lines
+        for (_group, pattern), lines in self.timeouts.pairs.items():
+            counts[f"line(s) for pattern '{pattern}' (regex time budget exceeded)"] = lines
+        return counts
+
+
+def compile_globs(globs: Iterable[str]) -> Tuple[Optional[re.Pattern], Optional[re.Pattern]]:
+    """Compile exclude globs into (full-path matcher, basename matcher).
+
+    Globs containing '/' are matched against the whole path; others against
+    the file name only, so ``package-lock.json`` matches at any depth.
+
+    Args:
+        globs: fnmatch-style patterns.
+
+    Returns:
+        Tuple[Optional[re.Pattern], Optional[re.Pattern]]: Matchers, or None
+        when there are no globs of that kind.
+    """
+    full: List[str] = []
+    base: List[str] = []
+    for glob in globs:
+        (full if "/" in glob else base).append(fnmatch.translate(glob))
+    return (
+        re.compile("|".join(full)) if full else None,
+        re.compile("|".join(base)) if base else None,
+    )
+
+
+def _is_excluded(path: str, matchers: Tuple[Optional[re.Pattern], Optional[re.Pattern]]) -> bool:
+    """Return True if `path` matches an exclude glob.
+
+    Args:
+        path: Repository-relative path.
+        matchers: Output of `compile_globs`.
+
+    Returns:
+        bool: Whether the path is excluded.
+    """
+    full, base = matchers
+    if full is not None and full.match(path):
+        return True
+    return base is not None and base.match(path.rsplit("/", 1)[-1]) is not None
+
+
+def _int_option(config: Mapping[str, object], key: str) -> int:
+    """Read a non-negative integer limit from config (0 when unset/invalid).
+
+    Args:
+        config: Loaded configuration.
+        key: Config key.
+
+    Returns:
+        int: The limit.
+    """
+    value = config.get(key)
+    return value if isinstance(value, int) and value > 0 else 0
+
+
+def classify_files(
+    numstat: Iterable[Tuple[Optional[int], Optional[int], str]],
+    attributes: Mapping[str, Mapping[str, str]],
+    config: Mapping[str, object],
+) -> SkipReport:
+    """Decide which files to skip from numstat output and gitattributes.
+
+    Args:
+        numstat: (added, deleted, path) tuples, counts None for binary files.
+        attributes: path -> attribute -> value from `git check-attr`.
+        config: Loaded configuration; reads "exclude", "max_added_lines" and
+            "max_line_length".
+
+    Returns:
+        SkipReport: Files to skip and the line-length limit.
+    """
+    globs = config.get("exclude")
+    matchers = compile_globs(globs if isinstance(globs, list) else [])
+    max_added = _int_option(config, "max_added_lines")
+
+    report = SkipReport(_int_option(config, "max_line_length"))
+    for added, _deleted, path in numstat:
+        attrs = attributes.get(path, {})
+        if added is None or attrs.get("binary") in _TRUTHY_ATTR:
+            report.files[path] = BINARY
+        elif attrs.get("linguist-generated") in _TRUTHY_ATTR:
+            report.files[path] = GENERATED
+        elif _is_excluded(path, matchers):
+            report.files[path] = EXCLUDED
+        elif max_added and added > max_added:
+            report.files[path] = OVERSIZED
+    return report
+
+
+def classify_staged_files(
+    config: Mapping[str, object], paths: Optional[Sequence[str]] = None
+) -> SkipReport:
+    """Classify the staged files using `git diff --numstat` and `git check-attr`.
+
+    Args:
+        config: Loaded configuration.
+        paths: Optional paths to limit the classification to.
+
+    Returns:
+        SkipReport: Files to skip and the line-length limit.
+    """
+    numstat = get_staged_numstat(paths)
+    text_paths = [path for added, _, path in numstat if added is not None]
+    attributes = get_staged_attributes(text_paths, ["binary", "linguist-generated"])
+    return classify_files(numstat, attributes, config)
+
+
+def classify_range_files(
+    config: Mapping[str, object],
+    from_ref: str,
+    to_ref: str,
+    paths: Optional[Sequence[str]] = None,
+) -> SkipReport:
+    """Classify the files changed between two revisions.
+
+    Attributes are read from the working tree's .gitattributes, since
+    `git check-attr` cannot read them from an arbitrary revision.
+
+    Args:
+        config: Loaded configuration.
+        from_ref: Base revision.
+        to_ref: Target revision.
+        paths: Optional paths to limit the classification to.
+
+    Returns:
+        SkipReport: Files to skip and the line-length limit.
+    """
+    numstat = get_range_numstat(from_ref, to_ref, paths)
+    text_paths = [path for added, _, path in numstat if added is not None]
+    attributes = get_staged_attributes(text_paths, ["binary", "linguist-generated"], cached=False)
+    return classify_files(numstat, attributes, config)
+
+
+def drop_skipped(records: Iterable[AddedLine], report: SkipReport) -> Iterator[AddedLine]:
+    """Filter out records of skipped files and over-long lines, counting the latter.
+
+    Skipped files are normally left out of the diff by git already (see
+    `git_diff.iter_staged_diff`); checking them here is a safety net.
+
+    Args:
+        records: Added lines in diff order.
+        report: Skip decisions; `long_lines` is updated as lines stream by.
+
+    Yields:
+        AddedLine: Records that should be scanned.
+    """
+    skipped = report.files
+    limit = report.max_line_length
+    for rec in records:
+        if rec.path in skipped:
+            continue
+        if limit and len(rec.text) > limit:
+            report.long_lines += 1
+            continue
+        yield rec
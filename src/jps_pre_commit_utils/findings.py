@@ -0,0 +1,119 @@
+"""Compact record type for scan findings.
+
+A noisy commit can produce hundreds of thousands of hits, and a dict per hit
+(five keys, often five dicts holding the same line) dominates memory. A
+`Finding` is a slotted object that references:
+
+- an interned `Rule` (group, pattern) shared by every hit of that pattern, and
+- the added line's text, shared by reference with every other finding on the
+  same line,
+
+plus the optional path and line number. It is also a read-only `Mapping`
+with the historical keys ("pattern", "line", "group", and "path"/"lineno" for
+located findings), so code written against the old dicts keeps working and
+``finding == {...}`` comparisons still hold.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Iterator, Mapping, NamedTuple, Optional, Tuple
+
+_PLAIN_KEYS = ("pattern", "line", "group")
+_LOCATED_KEYS = ("pattern", "line", "group", "path", "lineno")
+
+
+class Rule(NamedTuple):
+    """A pattern and the group it belongs to."""
+
+    group: str
+    pattern: str
+
+
+class Finding(Mapping[str, Any]):
+    """One pattern hit on one added line."""
+
+    __slots__ = ("rule", "line", "path", "lineno")
+
+    def __init__(
+        self, rule: Rule, line: str, path: Optional[str] = None, lineno: Optional[int] = None
+    ) -> None:
+        """Create a finding.
+
+        Args:
+            rule: Matched (group, pattern), shared by all findings of the pattern.
+            line: Added line text.
+            path: File path, for findings from located diff records.
+            lineno: Line number in the new version of `path`.
+        """
+        self.rule = rule
+        self.line = line
+        self.path = path
+        self.lineno = lineno
+
+    @property
+    def group(self) -> str:
+        """str: Group of the matched pattern."""
+        return self.rule.group
+
+    @property
+    def pattern(self) -> str:
+        """str: Source of the matched pattern."""
+        return self.rule.pattern
+
+    def __getitem__(self, key: str) -> Any:
+        """Return a field by its historical dict key.
+
+        Args:
+            key: One of "pattern", "line", "group", "path", "lineno".
+
+        Returns:
+            Any: The field value.
+
+        Raises:
+            KeyError: For unknown keys, and for "path"/"lineno" on findings
+                without a location.
+        """
+        if key == "pattern":
+            return self.rule.pattern
+        if key == "line":
+            return self.line
+        if key == "group":
+            return self.rule.group
+        if self.path is not None:
+            if key == "path":
+                return self.path
+            if key == "lineno":
+                return self.lineno
+        raise KeyError(key)
+
+    def __iter__(self) -> Iterator[str]:
+        """Iterate over the keys present on this finding.
+
+        Returns:
+            Iterator[str]: Keys in the historical dict order.
+        """
+        return iter(_PLAIN_KEYS if self.path is None else _LOCATED_KEYS)
+
+    def __len__(self) -> int:
+        """Return the number of keys.
+
+        Returns:
+            int: 3 for plain findings, 5 for located ones.
+        """
+        return len(_PLAIN_KEYS) if self.path is None else len(_LOCATED_KEYS)
+
+    def __repr__(self) -> str:
+        """Return a dict-like representation.
+
+        Returns:
+            str: Representation.
+        """
+        return f"Finding({dict(self)!r})"
+
+    def __reduce__(self) -> Tuple[Any, ...]:
+        """Pickle by fields (used when findings come back from worker processes).
+
+        Returns:
+            Tuple[Any, ...]: Constructor and arguments.
+        """
+        return (Finding, (self.rule, self.line, self.path, self.lineno))
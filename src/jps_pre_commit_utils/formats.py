@@ -0,0 +1,165 @@
+"""Machine-readable output formats written as findings are produced.
+
+Each writer consumes an iterable of findings (as yielded by
+`scanner.iter_findings`) and writes every record as soon as it arrives, so
+the full result list is never held in memory:
+
+- ``jsonl``: one JSON object per line.
+- ``json``: a single JSON array of the same objects.
+- ``sarif``: a SARIF 2.1.0 log with one result per finding, for code-review
+  tools that annotate lines.
+
+Every record carries ``group``, ``pattern``, ``path``, ``lineno`` and the
+added ``line``; ``path``/``lineno`` are null for findings without a location.
+"""
+
+from __future__ import annotations
+
+import json
+from typing import Any, Callable, Dict, Iterable, Mapping, Optional, TextIO
+
+SARIF_SCHEMA = "https://json.schemastore.org/sarif-2.1.0.json"
+_TOOL_NAME = "jps-pre-commit-utils"
+_TOOL_URI = "https://github.com/jai-python3/jps-pre-commit-utils"
+
+# Returns skip counts; called after the findings are exhausted, since lines
+# dropped while streaming are only known by then.
+SkipSummary = Callable[[], Mapping[str, int]]
+
+Writer = Callable[[Iterable[Mapping[str, Any]], TextIO, Optional[SkipSummary]], int]
+
+
+def finding_record(finding: Mapping[str, Any]) -> Dict[str, Any]:
+    """Return the stable, serializable form of a finding.
+
+    Args:
+        finding: Finding dict from the scanner.
+
+    Returns:
+        Dict[str, Any]: Record with group, pattern, path, lineno and line.
+    """
+    return {
+        "group": finding.get("group"),
+        "pattern": finding.get("pattern"),
+        "path": finding.get("path"),
+        "lineno": finding.get("lineno"),
+        "line": finding.get("line", ""),
+    }
+
+
+def write_jsonl(
+    findings: Iterable[Mapping[str, Any]],
+    stream: TextIO,
+    skipped: Optional[SkipSummary] = None,
+) -> int:
+    """Write one JSON object per finding, one per line.
+
+    Args:
+        findings: Findings, consumed lazily.
+        stream: Output text stream.
+        skipped: Unused; accepted for a uniform writer signature.
+
+    Returns:
+        int: Number of findings written.
+    """
+    count = 0
+    for finding in findings:
+        stream.write(json.dumps(finding_record(finding), ensure_ascii=False) + "\n")
+        count += 1
+    return count
+
+
+def write_json(
+    findings: Iterable[Mapping[str, Any]],
+    stream: TextIO,
+    skipped: Optional[SkipSummary] = None,
+) -> int:
+    """Write findings as one JSON array, element by element.
+
+    Args:
+        findings: Findings, consumed lazily.
+        stream: Output text stream.
+        skipped: Unused; accepted for a uniform writer signature.
+
+    Returns:
+        int: Number of findings written.
+    """
+    count = 0
+    stream.write("[")
+    for finding in findings:
+        stream.write(",\n  " if count else "\n  ")
+        stream.write(json.dumps(finding_record(finding), ensure_ascii=False))
+        count += 1
+    stream.write("\n]\n" if count else "]\n")
+    return count
+
+
+def _sarif_result(finding: Mapping[str, Any]) -> Dict[str, Any]:
+    """Convert a finding into a SARIF result object.
+
+    Args:
+        finding: Finding dict from the scanner.
+
+    Returns:
+        Dict[str, Any]: SARIF ``result``.
+    """
+    record = finding_record(finding)
+    group = record["group"]
+    where = f" (group: {group})" if group else ""
+    result: Dict[str, Any] = {
+        "ruleId": record["pattern"],
+        "level": "warning",
+        "message": {"text": f"Added line contains pattern '{record['pattern']}'{where}"},
+        "properties": {"group": group},
+    }
+    if record["path"]:
+        region: Dict[str, Any] = {"snippet": {"text": record["line"]}}
+        if record["lineno"]:
+            region["startLine"] = record["lineno"]
+        result["locations"] = [
+            {
+                "physicalLocation": {
+                    "artifactLocation": {"uri": record["path"]},
+                    "region": region,
+                }
+            }
+        ]
+    return result
+
+
+def write_sarif(
+    findings: Iterable[Mapping[str, Any]],
+    stream: TextIO,
+    skipped: Optional[SkipSummary] = None,
+) -> int:
+    """Write a SARIF 2.1.0 log, streaming the results array.
+
+    Args:
+        findings: Findings, consumed lazily.
+        stream: Output text stream.
+        skipped: Optional callable returning counts of files/lines that were
+            not scanned; called after all findings are written and stored
+            as run properties.
+
+    Returns:
+        int: Number of findings written.
+    """
+    tool = {"driver": {"name": _TOOL_NAME, "informationUri": _TOOL_URI}}
+    stream.write(f'{{"$schema": {json.dumps(SARIF_SCHEMA)}, "version": "2.1.0", "runs": [\n')
+    stream.write(f' {{"tool": {json.dumps(tool)}, "results": [')
+    count = 0
+    for finding in findings:
+        stream.write(",\n  " if count else "\n  ")
+        stream.write(json.dumps(_sarif_result(finding), ensure_ascii=False))
+        count += 1
+    stream.write("\n ]" if count else "]")
+    not_scanned = dict(skipped()) if skipped is not None else {}
+    stream.write(f', "properties": {json.dumps({"notScanned": not_scanned})}}}\n]}}\n')
+    return count
+
+
+WRITERS: Dict[str, Writer] = {
+    "json": write_json,
+    "jsonl": write_jsonl,
+    "sarif": write_sarif,
+}
@@ -1,8 +1,117 @@
-"""Minimal wrapper around `git diff` for staged changes."""
+"""Minimal wrappers around `git diff` and friends for the scan modes.
+
+Staged changes (the default), commit ranges and the tracked tree are all read
+through streaming subprocesses; blob contents are fetched in bulk from a
+single `git cat-file --batch` process.
+"""
 
 from __future__ import annotations
 
 import subprocess
+import tempfile
+import threading
+from typing import IO, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+# Colors, external diff drivers and custom prefixes would all break parsing.
+# Full blob ids on the "index" lines key the incremental result cache.
+_STAGED_DIFF_CMD: List[str] = [
+    "git",
+    "diff",
+    "--cached",
+    "--unified=0",
+    "--no-color",
+    "--no-ext-diff",
+    "--full-index",
+    "--src-prefix=a/",
+    "--dst-prefix=b/",
+]
+
+
+class GitError(RuntimeError):
+    """A git command failed (e.g. an unknown revision or not a repository)."""
+
+    @classmethod
+    def from_output(cls, cmd: List[str], code: int, stderr: bytes) -> "GitError":
+        """Describe a failed command by its first words and git's first message line.
+
+        Args:
+            cmd: Command that was run.
+            code: Its exit status.
+            stderr: What it wrote to stderr.
+
+        Returns:
+            GitError: Error with a one-line message.
+        """
+        lines = stderr.decode("utf-8", "replace").strip().splitlines()
+        message = lines[0] if lines else f"exit status {code}"
+        for prefix in ("fatal: ", "error: "):
+            if message.startswith(prefix):
+                message = message[len(prefix) :]
+        return cls(f"{' '.join(cmd[:2])} failed: {message}")
+
+
+# More excluded paths than this are filtered after parsing instead, keeping
+# the command line well below the OS argument-size limit.
+MAX_EXCLUDED_PATHS = 2000
+
+
+def _limit(
+    cmd: List[str], paths: Optional[Sequence[str]], exclude: Sequence[str] = ()
+) -> List[str]:
+    """Restrict a git command to the given paths.
+
+    Args:
+        cmd: Command starting with "git".
+        paths: Repository-relative paths, taken literally (no globbing), or
+            None for no restriction.
+        exclude: Paths to leave out; ignored when there are more than
+            `MAX_EXCLUDED_PATHS`.
+
+    Returns:
+        List[str]: The command, with pathspecs after "--" when given.
+    """
+    if len(exclude) > MAX_EXCLUDED_PATHS:
+        exclude = ()
+    if paths is None and not exclude:
+        return cmd
+    limited = list(cmd)
+    if "--" not in limited:
+        limited.append("--")
+    limited.extend(f":(literal){path}" for path in paths or ())
+    limited.extend(f":(exclude,literal){path}" for path in exclude)
+    return limited
+
+
+def with_rename_sources(
+    paths: Sequence[str], revisions: Sequence[str] = ("--cached",)
+) -> List[str]:
+    """Add the old names of renamed files to a path list.
+
+    Rename detection only pairs files inside the pathspec, so a diff limited
+    to a renamed file's new name would report its whole content as added.
+    Including the old name keeps the diff identical to the unrestricted one
+    for those files. Only names are compared, so this stays cheap.
+
+    Args:
+        paths: Repository-relative paths (e.g. pre-commit's file arguments).
+        revisions: "--cached" or the revisions to compare.
+
+    Returns:
+        List[str]: `paths` followed by the rename sources of any of them.
+    """
+    result = subprocess.run(
+        ["git", "diff", "--name-status", "-z", "--diff-filter=R", "--no-ext-diff", *revisions],
+        capture_output=True,
+        check=False,
+    )
+    fields = (result.stdout or b"").decode("utf-8", "replace").split("\0")
+    wanted = set(paths)
+    sources = [
+        fields[i + 1]
+        for i in range(0, len(fields) - 2, 3)
+        if fields[i + 2] in wanted and fields[i + 1] not in wanted
+    ]
+    return [*paths, *sources]
 
 
 def get_staged_diff() -> str:
@@ -12,9 +121,333 @@ def get_staged_diff() -> str:
         str: Raw unified diff text.
     """
     result = subprocess.run(
-        ["git", "diff", "--cached", "--unified=0"],
+        _STAGED_DIFF_CMD,
         capture_output=True,
         text=True,
         check=False,
     )
     return result.stdout or ""
+
+
+def _range_diff_cmd(from_ref: str, to_ref: str) -> List[str]:
+    """Return the diff command for a commit range.
+
+    Args:
+        from_ref: Base revision.
+        to_ref: Target revision.
+
+    Returns:
+        List[str]: Same options as the staged diff, between two revisions.
+    """
+    options = [arg for arg in _STAGED_DIFF_CMD[2:] if arg != "--cached"]
+    return ["git", "diff", *options, from_ref, to_ref, "--"]
+
+
+def iter_staged_diff(
+    paths: Optional[Sequence[str]] = None, exclude: Sequence[str] = ()
+) -> Iterator[str]:
+    """Yield the staged diff (unified=0) line by line as git produces it.
+
+    Unlike `get_staged_diff`, the output is never held in memory as a whole,
+    so peak memory stays bounded by the longest line rather than the diff
+    size. Lines are split like `diff_parser.split_diff` on the buffered output.
+
+    Args:
+        paths: Optional paths to limit the diff to (one git process either way).
+        exclude: Paths git should not diff at all (e.g. skipped files).
+
+    Yields:
+        str: Diff lines without line terminators.
+
+    Raises:
+        GitError: If git fails (e.g. on an unknown revision).
+    """
+    yield from _iter_output(_limit(_STAGED_DIFF_CMD, paths, exclude))
+
+
+def iter_range_diff(
+    from_ref: str,
+    to_ref: str = "HEAD",
+    paths: Optional[Sequence[str]] = None,
+    exclude: Sequence[str] = (),
+) -> Iterator[str]:
+    """Yield the diff between two revisions (unified=0) line by line.
+
+    Args:
+        from_ref: Base revision (e.g. a tag or commit).
+        to_ref: Target revision.
+        paths: Optional paths to limit the diff to.
+        exclude: Paths git should not diff at all.
+
+    Yields:
+        str: Diff lines without line terminators.
+
+    Raises:
+        GitError: If git fails (e.g. on an unknown revision).
+    """
+    yield from _iter_output(_limit(_range_diff_cmd(from_ref, to_ref), paths, exclude))
+
+
+def _iter_output(cmd: List[str]) -> Iterator[str]:
+    """Stream a command's output line by line, decoded as UTF-8.
+
+    Only "\n" (or "\r\n") ends a line: form feeds, "\u2028" and other
+    characters `str.splitlines()` breaks at are part of the line's content.
+
+    Args:
+        cmd: Command to run.
+
+    Yields:
+        str: Output lines without line terminators.
+
+    Raises:
+        GitError: If the command exits non-zero after its output was read
+            in full.
+    """
+    # A file rather than a pipe, so a chatty stderr cannot block the command.
+    with tempfile.TemporaryFile() as errors:
+        proc = subprocess.Popen(
+            cmd,
+            stdout=subprocess.PIPE,
+            stderr=errors,
+        )
+        try:
+            assert proc.stdout is not None
+            for raw in proc.stdout:
+                if raw.endswith(b"\n"):
+                    raw = raw[:-2] if raw.endswith(b"\r\n") else raw[:-1]
+                yield raw.decode("utf-8", "replace")
+        finally:
+            if proc.stdout is not None:
+                proc.stdout.close()
+            if proc.poll() is None:
+                proc.kill()
+            code = proc.wait()
+        if code:
+            errors.seek(0)
+            raise GitError.from_output(cmd, code, errors.read())
+
+
+def get_git_dir() -> Optional[str]:
+    """Return the repository's git directory (e.g. ".git"), if inside a repo.
+
+    Returns:
+        Optional[str]: Path printed by `git rev-parse --git-dir`, or None.
+    """
+    try:
+        result = subprocess.run(
+            ["git", "rev-parse", "--git-dir"],
+            capture_output=True,
+            text=True,
+            check=False,
+        )
+    except OSError:
+        return None
+    path = (result.stdout or "").strip()
+    return path if result.returncode == 0 and path else None
+
+
+def get_staged_numstat(
+    paths: Optional[Sequence[str]] = None,
+) -> List[Tuple[Optional[int], Optional[int], str]]:
+    """Return per-file added/deleted line counts for the staged diff.
+
+    Args:
+        paths: Optional paths to limit the counts to.
+
+    Returns:
+        List[Tuple[Optional[int], Optional[int], str]]: (added, deleted, path)
+        tuples; counts are None for files git considers binary. Renamed files
+        are reported under their new path.
+
+    Raises:
+        GitError: If git fails (e.g. on an unknown revision).
+    """
+    return _numstat(["--cached"], paths)
+
+
+def get_range_numstat(
+    from_ref: str, to_ref: str = "HEAD", paths: Optional[Sequence[str]] = None
+) -> List[Tuple[Optional[int], Optional[int], str]]:
+    """Return per-file added/deleted line counts between two revisions.
+
+    Args:
+        from_ref: Base revision.
+        to_ref: Target revision.
+        paths: Optional paths to limit the counts to.
+
+    Returns:
+        List[Tuple[Optional[int], Optional[int], str]]: As `get_staged_numstat`.
+
+    Raises:
+        GitError: If git fails (e.g. on an unknown revision).
+    """
+    return _numstat([from_ref, to_ref, "--"], paths)
+
+
+def _numstat(
+    revisions: List[str], paths: Optional[Sequence[str]] = None
+) -> List[Tuple[Optional[int], Optional[int], str]]:
+    """Run `git diff --numstat -z` and parse its output.
+
+    Args:
+        revisions: "--cached" or the revisions to compare.
+        paths: Optional paths to limit the counts to.
+
+    Returns:
+        List[Tuple[Optional[int], Optional[int], str]]: (added, deleted, path).
+
+    Raises:
+        GitError: If git fails (e.g. on an unknown revision).
+    """
+    cmd = _limit(["git", "diff", "--numstat", "-z", "--no-ext-diff", *revisions], paths)
+    result = subprocess.run(cmd, capture_output=True, check=False)
+    if result.returncode:
+        raise GitError.from_output(cmd, result.returncode, result.stderr or b"")
+    fields = (result.stdout or b"").decode("utf-8", "replace").split("\0")
+
+    stats: List[Tuple[Optional[int], Optional[int], str]] = []
+    i = 0
+    while i < len(fields):
+        entry = fields[i]
+        i += 1
+        if not entry:
+            continue
+        added, deleted, path = entry.split("\t", 2)
+        if not path:
+            # Rename/copy: the old and new paths follow as separate fields.
+            path = fields[i + 1] if i + 1 < len(fields) else ""
+            i += 2
+        stats.append(
+            (
+                int(added) if added.isdigit() else None,
+                int(deleted) if deleted.isdigit() else None,
+                path,
+            )
+        )
+    return stats
+
+
+def get_staged_attributes(
+    paths: Iterable[str], attrs: Iterable[str], cached: bool = True
+) -> Dict[str, Dict[str, str]]:
+    """Return gitattributes values for staged paths, read from the index.
+
+    Args:
+        paths: Repository-relative paths.
+        attrs: Attribute names (e.g. "binary", "linguist-generated").
+        cached: Read .gitattributes from the index; False reads the working
+            tree (used for commit ranges).
+
+    Returns:
+        Dict[str, Dict[str, str]]: path -> attribute -> value, where value is
+        "set", "unset", "unspecified" or the assigned string.
+    """
+    path_list = list(paths)
+    if not path_list:
+        return {}
+    source = ["--cached"] if cached else []
+    result = subprocess.run(
+        ["git", "check-attr", *source, "-z", "--stdin", *attrs],
+        input="\0".join(path_list).encode("utf-8") + b"\0",
+        capture_output=True,
+        check=False,
+    )
+    fields = (result.stdout or b"").decode("utf-8", "replace").split("\0")
+
+    values: Dict[str, Dict[str, str]] = {}
+    for i in range(0, len(fields) - 2, 3):
+        path, attr, value = fields[i : i + 3]
+        values.setdefault(path, {})[attr] = value
+    return values
+
+
+def list_tracked_blobs(paths: Optional[Sequence[str]] = None) -> List[Tuple[str, str]]:
+    """Return (path, blob id) for every regular file in the index.
+
+    Symlinks and submodules are left out: neither has scannable content.
+
+    Args:
+        paths: Optional paths to limit the listing to.
+
+    Returns:
+        List[Tuple[str, str]]: Entries in index (path) order.
+    """
+    result = subprocess.run(
+        _limit(["git", "ls-files", "--stage", "-z"], paths),
+        capture_output=True,
+        check=False,
+    )
+    entries: List[Tuple[str, str]] = []
+    for record in (result.stdout or b"").decode("utf-8", "replace").split("\0"):
+        if not record:
+            continue
+        info, path = record.split("\t", 1)
+        mode, oid, stage = info.split(" ")
+        if mode.startswith("100") and stage == "0":
+            entries.append((path, oid))
+    return entries
+
+
+def _feed(stream: IO[bytes], oids: List[str]) -> None:
+    """Write object ids to `git cat-file --batch` and close its input.
+
+    Args:
+        stream: The process's stdin.
+        oids: Object ids to request.
+    """
+    try:
+        for oid in oids:
+            stream.write(oid.encode("ascii") + b"\n")
+    except (BrokenPipeError, ValueError):  # pragma: no cover - reader gave up
+        pass
+    finally:
+        try:
+            stream.close()
+        except BrokenPipeError:  # pragma: no cover
+            pass
+
+
+def iter_blobs(oids: Iterable[str]) -> Iterator[Tuple[str, Optional[bytes]]]:
+    """Yield the contents of many blobs from one `git cat-file --batch` process.
+
+    Requests are written from a helper thread while contents are read, so
+    neither pipe can fill up and deadlock.
+
+    Args:
+        oids: Blob ids.
+
+    Yields:
+        Tuple[str, Optional[bytes]]: (oid, content), content None if missing.
+    """
+    oid_list = list(oids)
+    if not oid_list:
+        return
+    proc = subprocess.Popen(
+        ["git", "cat-file", "--batch"],
+        stdin=subprocess.PIPE,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.DEVNULL,
+    )
+    assert proc.stdin is not None and proc.stdout is not None
+    feeder = threading.Thread(target=_feed, args=(proc.stdin, oid_list), daemon=True)
+    feeder.start()
+    try:
+        out = proc.stdout
+        for _ in oid_list:
+            header = out.readline().split()
+            if not header:
+                break
+            if len(header) < 3 or header[1] == b"missing":
+                yield header[0].decode("ascii", "replace"), None
+                continue
+            size = int(header[2])
+            content = out.read(size)
+            out.read(1)  # trailing newline
+            yield header[0].decode("ascii"), content
+    finally:
+        proc.stdout.close()
+        if proc.poll() is None:
+            proc.kill()
+        proc.wait()
+        feeder.join()
@@ -32,12 +32,24 @@ def main() -> None:
         - Debug statements (pdb, ipdb, print, logger.debug)
         - Test code leakage (unittest.mock, pytest.skip)
         - Hardcoded paths (/tmp, /home/user, C:\\)
-        - Secrets/tokens (high-entropy strings, common patterns)
+        - Secrets/tokens (common token patterns; high-entropy strings if enabled)
         - Fully configurable via YAML
 
         Example:
             {YELLOW}jps-pre-commit-utils-checks --staged{RESET}
             {YELLOW}jps-pre-commit-utils-checks --config .pre-commit-checks.yaml{RESET}
+            {YELLOW}jps-pre-commit-utils-checks --jobs 0{RESET}  (scan large diffs on all CPUs)
+            {YELLOW}jps-pre-commit-utils-checks --all-files{RESET}  (audit every tracked file)
+            {YELLOW}jps-pre-commit-utils-checks --since <commit>{RESET}  (lines added since commit)
+            {YELLOW}jps-pre-commit-utils-checks --summary-only{RESET}  (per-pattern counts only)
+
+    {GREEN}jps-pre-commit-utils-server{RESET}
+        Keep config and compiled rules warm between runs. While it is running,
+        jps-pre-commit-utils-checks hands its work to the server automatically.
+
+        Example:
+            {YELLOW}jps-pre-commit-utils-server --idle-timeout 3600 &{RESET}
+            {YELLOW}jps-pre-commit-utils-server --stdio{RESET}  (JSON-RPC on stdin/stdout)
 
     {GREEN}jps-pre-commit-utils-help{RESET}
         Displays this overview of all available commands.
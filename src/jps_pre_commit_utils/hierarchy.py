@@ -0,0 +1,231 @@
+"""Per-directory configuration for monorepos.
+
+A `.my-pre-commit-checks.yaml` in a subdirectory refines the repository
+configuration for every file below it, and nested files refine their
+parents' in turn (see `config.deep_merge`). Directories are resolved once
+and kept in a prefix trie of path components. A directory without its own
+config file shares its parent's resolution, compiled rules included, so a
+commit touching thousands of files compiles one rule set per config file.
+"""
+
+from __future__ import annotations
+
+from itertools import chain, islice
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Mapping, Optional, Tuple
+
+from . import cache
+from .batch import Scanner
+from .config import load_directory_config
+from .diff_parser import AddedLine
+from .findings import Finding
+from .profiling import PatternCosts
+from .rules import Timeouts
+from .scanner import iter_findings
+
+Scan = Callable[[Iterable[AddedLine]], Iterable[Finding]]
+
+
+class _Resolved:
+    """A directory's effective configuration and, once needed, its compiled rules."""
+
+    __slots__ = ("config", "fingerprint", "_scanner")
+
+    def __init__(self, config: Mapping[str, Any], fingerprint: str) -> None:
+        """Store the configuration.
+
+        Args:
+            config: Effective configuration.
+            fingerprint: Cache-key material ("" for the repository root).
+        """
+        self.config = config
+        self.fingerprint = fingerprint
+        self._scanner: Optional[Scanner] = None
+
+    def scanner(self) -> Scanner:
+        """Return the compiled rules, building them on first use.
+
+        Returns:
+            Scanner: Scanner for `config`.
+        """
+        if self._scanner is None:
+            self._scanner = Scanner(self.config)
+        return self._scanner
+
+
+class _Node:
+    """One directory in the trie."""
+
+    __slots__ = ("children", "resolved")
+
+    def __init__(self, resolved: _Resolved) -> None:
+        """Create a leaf.
+
+        Args:
+            resolved: The directory's resolution.
+        """
+        self.children: Dict[str, _Node] = {}
+        self.resolved = resolved
+
+
+class ConfigTree:
+    """Resolve each directory's configuration once, along the path from the root."""
+
+    def __init__(self, config: Mapping[str, Any], root: Optional[Path] = None) -> None:
+        """Start a trie holding only the repository root.
+
+        Args:
+            config: Root configuration, as from `config.load_config`.
+            root: Directory that repository paths are relative to (default:
+                the current directory, where `load_config` looks too).
+        """
+        self.root = Path.cwd() if root is None else Path(root)
+        self._trie = _Node(_Resolved(config, ""))
+        # Repository-relative directories whose own config file was applied.
+        self.config_dirs: List[str] = []
+
+    def resolve(self, path: str) -> _Resolved:
+        """Return the resolution for the directory containing a file.
+
+        Args:
+            path: Repository-relative file path ('/'-separated).
+
+        Returns:
+            _Resolved: Shared by every directory with the same config files.
+        """
+        node = self._trie
+        parts = path.split("/")[:-1]
+        for depth, part in enumerate(parts):
+            child = node.children.get(part)
+            if child is None:
+                parent = node.resolved
+                own = load_directory_config(parent.config, self.root.joinpath(*parts[: depth + 1]))
+                if own is None:
+                    child = _Node(parent)
+                else:
+                    child = _Node(_Resolved(own, cache.value_fingerprint(own)))
+                    self.config_dirs.append("/".join(parts[: depth + 1]))
+                node.children[part] = child
+            node = child
+        return node.resolved
+
+    def config_for(self, path: str) -> Mapping[str, Any]:
+        """Return the effective configuration for a file.
+
+        Args:
+            path: Repository-relative file path.
+
+        Returns:
+            Mapping[str, Any]: Root configuration refined by nested config files.
+        """
+        return self.resolve(path).config
+
+    def fingerprint_for(self, path: str) -> str:
+        """Return cache-key material identifying a file's nested config files.
+
+        Args:
+            path: Repository-relative file path.
+
+        Returns:
+            str: "" for files governed by the root configuration alone.
+        """
+        return self.resolve(path).fingerprint
+
+    def iter_findings(
+        self,
+        records: Iterable[AddedLine],
+        scan_root: Scan,
+        jobs: int = 1,
+        timeouts: Optional[Timeouts] = None,
+        pattern_costs: Optional[PatternCosts] = None,
+    ) -> Iterator[Finding]:
+        """Scan each run of records with the configuration of its directory.
+
+        Records governed by the root configuration go to `scan_root`; others
+        are scanned with their directory's compiled rules (in worker
+        processes when `jobs` is not 1 and the run is large).
+
+        Args:
+            records: Added lines in diff order.
+            scan_root: Scanner for records under the root configuration.
+            jobs: Worker processes for large runs (1 scans in-process).
+            timeouts: Optional record of pattern/line pairs skipped for time.
+            pattern_costs: Optional per-pattern profiling accumulator.
+
+        Yields:
+            Finding: Findings in diff order.
+        """
+        root = self._trie.resolved
+        for resolved, run in self._runs(records):
+            if resolved is root:
+                yield from scan_root(run)
+            elif pattern_costs is not None:
+                yield from iter_findings(run, resolved.config, pattern_costs, timeouts)
+            elif jobs == 1:
+                yield from resolved.scanner().iter_findings(run, timeouts)
+            else:
+                from .parallel import PARALLEL_MIN_LINES, iter_parallel
+
+                head = list(islice(run, PARALLEL_MIN_LINES))
+                if len(head) < PARALLEL_MIN_LINES:
+                    yield from resolved.scanner().iter_findings(head, timeouts)
+                else:
+                    yield from iter_parallel(
+                        chain(head, run), resolved.config, jobs, timeouts=timeouts
+                    )
+
+    def _runs(
+        self, records: Iterable[AddedLine]
+    ) -> Iterator[Tuple[_Resolved, Iterator[AddedLine]]]:
+        """Split records into consecutive runs sharing one resolution.
+
+        Each run must be consumed before the next one is requested. Without
+        records, one empty run under the root configuration is produced, so
+        the root scanner still sees the (empty) input.
+
+        Args:
+            records: Added lines in diff order.
+
+        Yields:
+            Tuple[_Resolved, Iterator[AddedLine]]: Resolution and its records.
+        """
+        stream = iter(records)
+        pending: List[AddedLine] = []
+        empty = True
+        for first in stream:
+            empty = False
+            pending.append(first)
+            while pending:
+                rec = pending.pop()
+                current = self.resolve(rec.path)
+                yield current, self._run(rec, stream, current, pending)
+        if empty:
+            yield self._trie.resolved, iter(())
+
+    def _run(
+        self,
+        first: AddedLine,
+        stream: Iterator[AddedLine],
+        current: _Resolved,
+        pending: List[AddedLine],
+    ) -> Iterator[AddedLine]:
+        """Yield records until one belongs to another resolution.
+
+        Args:
+            first: First record of the run.
+            stream: Remaining records.
+            current: The run's resolution.
+            pending: Receives the record that starts the next run.
+
+        Yields:
+            AddedLine: Records of the run.
+        """
+        yield first
+        last_path = first.path
+        for rec in stream:
+            if rec.path != last_path:
+                last_path = rec.path
+                if self.resolve(rec.path) is not current:
+                    pending.append(rec)
+                    return
+            yield rec
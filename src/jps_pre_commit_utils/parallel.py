@@ -0,0 +1,189 @@
+"""Opt-in multi-process scanning for large staged changesets."""
+
+from __future__ import annotations
+
+import os
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from itertools import islice
+from typing import Deque, Iterable, Iterator, List, Mapping, Optional, Tuple
+
+from .diff_parser import AddedLine
+from .findings import Finding
+from .rules import Timeouts
+from .scanner import iter_findings, ruleset_for
+
+# Below this many added lines the pool startup costs more than it saves.
+PARALLEL_MIN_LINES = 50_000
+
+# Added lines per task; large enough to amortize pickling, small enough to balance.
+CHUNK_LINES = 5_000
+
+_WORKER_CONFIG: Optional[Mapping[str, object]] = None
+
+
+def _init_worker(config: Mapping[str, object]) -> None:
+    """Receive the config once per worker and compile its rule set eagerly.
+
+    Args:
+        config: Loaded configuration.
+    """
+    global _WORKER_CONFIG
+    _WORKER_CONFIG = config
+    ruleset_for(config)
+
+
+def _scan_chunk(records: List[AddedLine]) -> Tuple[List[Finding], Timeouts]:
+    """Scan one chunk inside a worker process.
+
+    Args:
+        records: Added lines, grouped by file.
+
+    Returns:
+        Tuple[List[Finding], Timeouts]: Findings for the chunk, in input
+        order, and the pattern/line pairs skipped for time.
+    """
+    assert _WORKER_CONFIG is not None
+    timeouts = Timeouts()
+    return list(iter_findings(records, _WORKER_CONFIG, timeouts=timeouts)), timeouts
+
+
+def _chunks(records: Iterator[AddedLine], size: int) -> Iterator[List[AddedLine]]:
+    """Split records into chunks of about `size` lines, preferring file boundaries.
+
+    Consecutive small files share a chunk; a file larger than `size` is split.
+
+    Args:
+        records: Added lines in diff order.
+        size: Target lines per chunk.
+
+    Yields:
+        List[AddedLine]: Chunks in diff order.
+    """
+    chunk: List[AddedLine] = []
+    for rec in records:
+        if len(chunk) >= size and rec.path != chunk[-1].path:
+            yield chunk
+            chunk = []
+        elif len(chunk) >= 2 * size:
+            yield chunk
+            chunk = []
+        chunk.append(rec)
+    if chunk:
+        yield chunk
+
+
+def resolve_jobs(jobs: int) -> int:
+    """Translate a --jobs value into a worker count (0 means all CPUs).
+
+    Args:
+        jobs: Requested job count.
+
+    Returns:
+        int: Number of workers, at least 1.
+    """
+    if jobs <= 0:
+        return os.cpu_count() or 1
+    return jobs
+
+
+def scan_parallel(
+    records: Iterable[AddedLine],
+    config: Mapping[str, object],
+    jobs: int,
+    min_lines: int = PARALLEL_MIN_LINES,
+    chunk_lines: int = CHUNK_LINES,
+    timeouts: Optional[Timeouts] = None,
+) -> List[Finding]:
+    """Scan added lines with a process pool, falling back to serial for small diffs.
+
+    See `iter_parallel` for how the input is consumed.
+
+    Args:
+        records: Added lines in diff order.
+        config: Loaded configuration.
+        jobs: Worker processes (0 means all CPUs).
+        min_lines: Minimum added lines before a pool is started.
+        chunk_lines: Target added lines per task.
+        timeouts: Optional record of pattern/line pairs skipped for time.
+
+    Returns:
+        List[Finding]: Findings in file/line order.
+    """
+    return list(iter_parallel(records, config, jobs, min_lines, chunk_lines, timeouts))
+
+
+def iter_parallel(
+    records: Iterable[AddedLine],
+    config: Mapping[str, object],
+    jobs: int,
+    min_lines: int = PARALLEL_MIN_LINES,
+    chunk_lines: int = CHUNK_LINES,
+    timeouts: Optional[Timeouts] = None,
+) -> Iterator[Finding]:
+    """Yield findings from a process-pool scan as each chunk completes, in order.
+
+    The input is consumed lazily: the first `min_lines` records are buffered
+    to decide whether a pool is worthwhile, and at most a few chunks per
+    worker are in flight at once. Findings are yielded in diff order,
+    identical to `scanner.iter_findings`.
+
+    Args:
+        records: Added lines in diff order.
+        config: Loaded configuration.
+        jobs: Worker processes (0 means all CPUs).
+        min_lines: Minimum added lines before a pool is started.
+        chunk_lines: Target added lines per task.
+        timeouts: Optional record of pattern/line pairs skipped for time;
+            each worker's record is merged in as its chunk completes.
+
+    Yields:
+        Finding: Findings in file/line order.
+    """
+    workers = resolve_jobs(jobs)
+    stream = iter(records)
+    head = list(islice(stream, min_lines))
+    if workers == 1 or len(head) < min_lines:
+        yield from iter_findings(_chain(head, stream), config, timeouts=timeouts)
+        return
+
+    merged = timeouts if timeouts is not None else Timeouts()
+    pending: Deque[Future[Tuple[List[Finding], Timeouts]]] = deque()
+    with ProcessPoolExecutor(
+        max_workers=workers, initializer=_init_worker, initargs=(dict(config),)
+    ) as pool:
+        for chunk in _chunks(_chain(head, stream), chunk_lines):
+            pending.append(pool.submit(_scan_chunk, chunk))
+            if len(pending) >= 2 * workers:
+                yield from _collect(pending.popleft(), merged)
+        while pending:
+            yield from _collect(pending.popleft(), merged)
+
+
+def _collect(future: Future[Tuple[List[Finding], Timeouts]], timeouts: Timeouts) -> List[Finding]:
+    """Wait for a chunk and merge its skipped pairs.
+
+    Args:
+        future: Pending `_scan_chunk` result.
+        timeouts: Record receiving the chunk's skipped pairs.
+
+    Returns:
+        List[Finding]: The chunk's findings.
+    """
+    findings, skipped = future.result()
+    timeouts.merge(skipped)
+    return findings
+
+
+def _chain(head: List[AddedLine], rest: Iterator[AddedLine]) -> Iterator[AddedLine]:
+    """Yield buffered records, then the remainder of the stream.
+
+    Args:
+        head: Already-consumed records.
+        rest: Remaining records.
+
+    Yields:
+        AddedLine: Records in original order.
+    """
+    yield from head
+    yield from rest
@@ -0,0 +1,185 @@
+"""Per-stage timing, allocation and per-pattern cost profiling for the hook.
+
+Enabled with ``--profile`` or ``JPS_PRECOMMIT_PROFILE=1``. A disabled
+`Profiler` is a no-op, so call sites do not need to branch.
+
+Streaming stages (git output, diff parsing) run interleaved with scanning, so
+their times are measured exclusively: time spent pulling from an inner timed
+stage is charged to that stage, not to the caller.
+"""
+
+from __future__ import annotations
+
+import json
+import sys
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, TextIO, Tuple, TypeVar
+
+T = TypeVar("T")
+
+# (group, pattern) -> [seconds, calls, hits]
+PatternCosts = Dict[Tuple[str, str], List[float]]
+
+PROFILE_ENV = "JPS_PRECOMMIT_PROFILE"
+
+# Number of patterns listed in the human summary.
+_TOP_PATTERNS = 10
+
+
+class Profiler:
+    """Collect wall time and allocations per stage and regex cost per pattern."""
+
+    def __init__(self, enabled: bool = False, trace_memory: bool = True) -> None:
+        """Create a profiler.
+
+        Args:
+            enabled: When False every method is a cheap no-op.
+            trace_memory: Track allocations with tracemalloc (slows the run).
+        """
+        self.enabled = enabled
+        self.stages: Dict[str, Dict[str, float]] = {}
+        self.pattern_costs: Optional[PatternCosts] = {} if enabled else None
+        self._nested = 0.0
+        self._tracemalloc: Any = None
+        self._started = time.perf_counter()
+        if enabled and trace_memory:
+            import tracemalloc
+
+            tracemalloc.start()
+            self._tracemalloc = tracemalloc
+
+    def _charge(self, name: str, elapsed: float, before: float) -> None:
+        """Add exclusive time to a stage and report the total to outer stages.
+
+        Args:
+            name: Stage name.
+            elapsed: Wall time of the call, including inner stages.
+            before: Value of the nested-time counter when the call started.
+        """
+        stage = self.stages.setdefault(name, {"seconds": 0.0})
+        stage["seconds"] += elapsed - (self._nested - before)
+        self._nested = before + elapsed
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        """Time a sequential stage and record its allocations.
+
+        Args:
+            name: Stage name.
+
+        Yields:
+            None
+        """
+        if not self.enabled:
+            yield
+            return
+        tm = self._tracemalloc
+        if tm is not None:
+            tm.reset_peak()
+            mem_before = tm.get_traced_memory()[0]
+        before = self._nested
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._charge(name, time.perf_counter() - start, before)
+            if tm is not None:
+                current, peak = tm.get_traced_memory()
+                stage = self.stages[name]
+                stage["alloc_bytes"] = float(current - mem_before)
+                stage["peak_bytes"] = float(peak - mem_before)
+
+    def wrap(self, name: str, iterable: Iterable[T]) -> Iterable[T]:
+        """Charge the time spent producing each item of `iterable` to `name`.
+
+        Args:
+            name: Stage name.
+            iterable: Lazily produced items.
+
+        Returns:
+            Iterable[T]: The same items (unchanged when disabled).
+        """
+        if not self.enabled:
+            return iterable
+        return self._timed(name, iter(iterable))
+
+    def _timed(self, name: str, it: Iterator[T]) -> Iterator[T]:
+        """Yield from `it`, timing each `next()` exclusively.
+
+        Args:
+            name: Stage name.
+            it: Source iterator.
+
+        Yields:
+            T: Items of `it`.
+        """
+        self.stages.setdefault(name, {"seconds": 0.0, "items": 0.0})
+        while True:
+            before = self._nested
+            start = time.perf_counter()
+            try:
+                item = next(it)
+            except StopIteration:
+                self._charge(name, time.perf_counter() - start, before)
+                return
+            self._charge(name, time.perf_counter() - start, before)
+            self.stages[name]["items"] += 1
+            yield item
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return the profile as a JSON-friendly dict.
+
+        Returns:
+            Dict[str, Any]: Stages, pattern costs, total wall time and peak memory.
+        """
+        patterns = [
+            {"group": g, "pattern": p, "seconds": c[0], "calls": int(c[1]), "hits": int(c[2])}
+            for (g, p), c in sorted(
+                (self.pattern_costs or {}).items(), key=lambda kv: kv[1][0], reverse=True
+            )
+        ]
+        data: Dict[str, Any] = {
+            "total_seconds": time.perf_counter() - self._started,
+            "stages": self.stages,
+            "patterns": patterns,
+        }
+        if self._tracemalloc is not None:
+            data["traced_peak_bytes"] = self._tracemalloc.get_traced_memory()[1]
+        return data
+
+    def write_json(self, path: Path) -> None:
+        """Write the profile to `path` (parent directories are created).
+
+        Args:
+            path: Output file.
+        """
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(self.to_dict(), indent=2) + "\n")
+
+    def print_summary(self, stream: Optional[TextIO] = None) -> None:
+        """Print a human-readable summary (stderr by default).
+
+        Args:
+            stream: Output stream.
+        """
+        out = stream or sys.stderr
+        data = self.to_dict()
+        print(f"\nProfile (total {data['total_seconds'] * 1000:.1f} ms)", file=out)
+        for name, stage in data["stages"].items():
+            extra = ""
+            if "alloc_bytes" in stage:
+                extra = f"  alloc {stage['alloc_bytes'] / 1024:.0f} KiB"
+                extra += f"  peak {stage['peak_bytes'] / 1024:.0f} KiB"
+            if "items" in stage:
+                extra += f"  {int(stage['items'])} items"
+            print(f"  {name:<16} {stage['seconds'] * 1000:9.2f} ms{extra}", file=out)
+        if data["patterns"]:
+            print("  slowest patterns:", file=out)
+            for p in data["patterns"][:_TOP_PATTERNS]:
+                print(
+                    f"    {p['seconds'] * 1000:9.2f} ms  {p['calls']:>8} calls "
+                    f"{p['hits']:>6} hits  [{p['group']}] {p['pattern']}",
+                    file=out,
+                )
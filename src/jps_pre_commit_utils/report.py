@@ -1,33 +1,175 @@
-"""Reporting utilities (Rich with plain-text fallback)."""
+"""Reporting utilities (Rich with plain-text fallback).
+
+Rich is imported lazily: a clean run whose output is not a terminal renders
+exactly the same text without it, so the import is skipped entirely. When it
+is used, one console renders the whole report in batches of lines rather than
+one ``print`` per finding.
+"""
 
 from __future__ import annotations
 
-from typing import Iterable, Mapping
+import sys
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Optional, Tuple
+
+# Report lines rendered per console write.
+_BATCH_LINES = 256
+
+# Added lines longer than this are shortened in the report.
+_MAX_LINE_CHARS = 200
+
+
+def _rich_console_class() -> Any:
+    """Import and return ``rich.console.Console``, or None if unavailable.
+
+    Returns:
+        Any: The Console class, or None when Rich cannot be imported.
+    """
+    try:
+        from rich.console import Console
+    except Exception:  # pragma: no cover
+        return None
+    return Console
+
+
+def _strip_markup(msg: str) -> str:
+    """Strip the simple [color] tags used by this module.
+
+    Args:
+        msg: Message template with Rich markup.
+
+    Returns:
+        str: The template without markup.
+    """
+    txt = msg.replace("[bold cyan]", "").replace("[/bold cyan]", "")
+    txt = txt.replace("[green]", "").replace("[/green]", "")
+    txt = txt.replace("[yellow]", "").replace("[/yellow]", "")
+    txt = txt.replace("[red]", "").replace("[/red]", "")
+    txt = txt.replace("[cyan]", "").replace("[/cyan]", "")
+    return txt
+
+
+def _is_terminal() -> bool:
+    """Return True when stdout is an interactive terminal.
+
+    Returns:
+        bool: Whether colour output would be visible.
+    """
+    try:
+        return sys.stdout.isatty()
+    except (AttributeError, ValueError):
+        return False
+
+
+def _shorten(text: str, limit: int = _MAX_LINE_CHARS) -> str:
+    """Shorten long added lines so one minified line cannot flood the report.
+
+    Args:
+        text: Line content.
+        limit: Maximum number of characters kept.
+
+    Returns:
+        str: The text, cut to `limit` characters plus an ellipsis if longer.
+    """
+    return text if len(text) <= limit else text[:limit] + "…"
+
+
+class _Writer:
+    """Buffer report lines and write them in batches through a single console."""
+
+    def __init__(self, plain: bool = False) -> None:
+        """Create the writer.
+
+        Args:
+            plain: Write plain text without Rich (and without importing it).
+        """
+        self._console = None
+        self._escape: Callable[[str], str] = str
+        Console = None if plain else _rich_console_class()
+        if Console is not None:
+            from rich.markup import escape as escape_markup
+
+            # Findings echo arbitrary source text: never interpret it as
+            # markup or emoji codes, highlight it, or wrap it mid-line.
+            self._console = Console(highlight=False, emoji=False, soft_wrap=True)
+            self._escape = escape_markup
+        self._lines: List[str] = []
+
+    def emit(self, template: str, **values: Any) -> None:
+        """Queue one message.
+
+        Args:
+            template: Message with Rich markup and ``str.format`` fields.
+            **values: Field values; these are escaped, never parsed as markup.
+        """
+        if self._console is None:
+            self._lines.append(_strip_markup(template).format(**values))
+        else:
+            escape = self._escape
+            fields = {key: escape(str(value)) for key, value in values.items()}
+            self._lines.append(template.format(**fields))
+        if len(self._lines) >= _BATCH_LINES:
+            self.flush()
+
+    def flush(self) -> None:
+        """Write all queued messages."""
+        if not self._lines:
+            return
+        text = "\n".join(self._lines)
+        self._lines.clear()
+        if self._console is None:
+            sys.stdout.write(text + "\n")
+        else:
+            self._console.print(text)
+
+
+def _print_skipped(writer: _Writer, skipped: Optional[Mapping[str, int]]) -> None:
+    """Print what was left out of the scan, if anything.
 
-try:
-    from rich.console import Console
-except Exception:  # pragma: no cover
-    Console = None
+    Args:
+        writer: Report writer.
+        skipped: Description -> count (e.g. {"binary file(s)": 2}).
+    """
+    if not skipped:
+        return
+    parts = ", ".join(f"{count} {label}" for label, count in skipped.items())
+    writer.emit("[cyan]ℹ️ Not scanned: {parts}[/cyan]", parts=parts)
 
 
-def _console_print(msg: str) -> None:
-    """Print using Rich if available; otherwise plain print.
+def _print_finding(writer: _Writer, finding: Mapping[str, Any]) -> None:
+    """Print a single finding.
 
     Args:
-        msg: Message string, may include Rich markup.
+        writer: Report writer.
+        finding: Result dict (see `print_report`).
     """
-    if Console is not None:
-        Console().print(msg)
+    pat = finding.get("pattern", "?")
+    line = _shorten(finding.get("line", ""))
+    group = finding.get("group", "")
+    path = finding.get("path", "")
+    where = f" at {path}:{finding.get('lineno', '?')}" if path else ""
+    if group:
+        writer.emit(
+            "[yellow]Added line contains pattern:[/yellow] "
+            "'{pat}' (group: {group}){where} → {line}",
+            pat=pat,
+            group=group,
+            where=where,
+            line=line,
+        )
     else:
-        # Strip simple [color] tags for a plain fallback.
-        txt = msg.replace("[bold cyan]", "").replace("[/bold cyan]", "")
-        txt = txt.replace("[green]", "").replace("[/green]", "")
-        txt = txt.replace("[yellow]", "").replace("[/yellow]", "")
-        txt = txt.replace("[red]", "").replace("[/red]", "")
-        print(txt)
+        writer.emit(
+            "[yellow]Added line contains pattern:[/yellow] '{pat}'{where} → {line}",
+            pat=pat,
+            where=where,
+            line=line,
+        )
 
 
-def print_report(findings: Iterable[Mapping[str, str]]) -> None:
+def print_report(
+    findings: Iterable[Mapping[str, Any]],
+    skipped: Optional[Mapping[str, int]] = None,
+    max_per_pattern: Optional[int] = None,
+) -> None:
     """Pretty-print the findings with a header and summary.
 
     Args:
@@ -35,25 +177,46 @@ def print_report(findings: Iterable[Mapping[str, str]]) -> None:
             - 'pattern' (str)
             - 'line' (str)
             - optional: 'group' (str)
+            - optional: 'path' (str) and 'lineno' (int)
+        skipped: Optional counts of files/lines that were not scanned, keyed
+            by description.
+        max_per_pattern: Print at most this many findings per (group, pattern)
+            and a count of the rest; 0 prints counts only, None prints all.
     """
     items = list(findings)
 
-    _console_print("\n[bold cyan]🔍 Pre-commit inserted-line scan results[/bold cyan]")
+    # Nothing to highlight and nowhere to show colour: don't load Rich.
+    writer = _Writer(plain=not items and not _is_terminal())
+    writer.emit("\n[bold cyan]🔍 Pre-commit inserted-line scan results[/bold cyan]")
 
     if not items:
-        _console_print("[green]✅ No issues detected.[/green]")
+        writer.emit("[green]✅ No issues detected.[/green]")
+        _print_skipped(writer, skipped)
+        writer.flush()
         return
 
+    counts: Dict[Tuple[str, str], int] = {}
     for f in items:
-        pat = f.get("pattern", "?")
-        line = f.get("line", "")
-        group = f.get("group", "")
-        if group:
-            _console_print(
-                "[yellow]Added line contains pattern:[/yellow] "
-                f"'{pat}' (group: {group}) → {line}"
+        key = (f.get("group", ""), f.get("pattern", "?"))
+        seen = counts.get(key, 0) + 1
+        counts[key] = seen
+        if max_per_pattern is None or seen <= max_per_pattern:
+            _print_finding(writer, f)
+
+    if max_per_pattern is not None:
+        for (group, pat), count in counts.items():
+            hidden = count - max_per_pattern
+            if hidden <= 0:
+                continue
+            label = f" (group: {group})" if group else ""
+            writer.emit(
+                "[cyan]… {hidden} more finding(s) for '{pat}'{label} ({count} total)[/cyan]",
+                hidden=hidden,
+                pat=pat,
+                label=label,
+                count=count,
             )
-        else:
-            _console_print("[yellow]Added line contains pattern:[/yellow] " f"'{pat}' → {line}")
 
-    _console_print(f"\n[red]⚠️ Total findings: {len(items)}[/red]")
+    _print_skipped(writer, skipped)
+    writer.emit("\n[red]⚠️ Total findings: {total}[/red]", total=len(items))
+    writer.flush()
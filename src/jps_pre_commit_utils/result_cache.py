@@ -0,0 +1,266 @@
+"""Incremental result cache: re-runs only rescan files whose staged diff changed.
+
+When a commit is rejected, the developer typically fixes one file and runs
+the hook again. Each file's findings are therefore stored under a key made
+of its path, its "<old>..<new>" blob ids from the diff's ``index`` header,
+and a fingerprint of the configuration (rules, routing and limits) and the
+package source. A file whose key is unchanged produces the same added lines
+and so the same findings: its records are dropped before the regex engine
+and the stored findings are replayed in their original diff position.
+
+Entries live in ``<git-dir>/jps-pre-commit-cache/results.json`` (or under
+``$JPS_PRECOMMIT_CACHE_DIR`` when set) and are evicted least-recently-used
+once the entry or stored-finding limits are exceeded. ``JPS_PRECOMMIT_NO_CACHE=1``
+disables the cache, and any IO or decoding problem is treated as a miss.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import time
+from collections import deque
+from pathlib import Path
+from typing import (
+    Any,
+    Callable,
+    Container,
+    Deque,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Tuple,
+)
+
+from . import cache
+from .diff_parser import AddedLine
+from .findings import Finding, Rule
+from .git_diff import get_git_dir
+
+_DIR_NAME = "jps-pre-commit-cache"
+_FILE_NAME = "results.json"
+
+# Eviction limits: files remembered, and findings stored across all files.
+MAX_ENTRIES = 4096
+MAX_FINDINGS = 20_000
+
+Scan = Callable[[Iterable[AddedLine]], Iterable[Finding]]
+
+
+def results_path() -> Optional[Path]:
+    """Return the file holding cached results, or None when unavailable.
+
+    Returns:
+        Optional[Path]: Cache file path; None if caching is disabled or the
+        working directory is not inside a git repository.
+    """
+    if not cache.enabled():
+        return None
+    override = os.environ.get("JPS_PRECOMMIT_CACHE_DIR")
+    if override:
+        return Path(override) / _DIR_NAME / _FILE_NAME
+    git_dir = get_git_dir()
+    if git_dir is None:
+        return None
+    return Path(git_dir) / _DIR_NAME / _FILE_NAME
+
+
+class ResultCache:
+    """Per-file findings keyed by staged blob ids and the config fingerprint."""
+
+    def __init__(
+        self,
+        path: Optional[Path],
+        config: Mapping[str, Any],
+        max_entries: int = MAX_ENTRIES,
+        max_findings: int = MAX_FINDINGS,
+        salt_for: Optional[Callable[[str], str]] = None,
+    ) -> None:
+        """Load the cache file (a missing or unreadable file starts empty).
+
+        Args:
+            path: Cache file, or None for a cache that never hits or saves.
+            config: Loaded configuration; part of every key.
+            max_entries: Maximum number of files kept.
+            max_findings: Maximum number of findings kept across all files.
+            salt_for: Optional path -> extra key material, for settings that
+                vary by file (e.g. `hierarchy.ConfigTree.fingerprint_for`).
+        """
+        self.path = path
+        self.salt_for = salt_for
+        self.max_entries = max_entries
+        self.max_findings = max_findings
+        self.hits = 0
+        self.misses = 0
+        self._salt = cache.value_fingerprint(dict(config))
+        self._entries: Dict[str, Dict[str, Any]] = {}
+        self._dirty = False
+        if path is not None:
+            try:
+                data = json.loads(path.read_text())
+            except (OSError, ValueError):
+                data = None
+            if isinstance(data, dict):
+                self._entries = {
+                    key: entry
+                    for key, entry in data.items()
+                    if isinstance(entry, dict)
+                    and isinstance(entry.get("used"), (int, float))
+                    and isinstance(entry.get("findings"), list)
+                }
+
+    def key(self, path: str, blob_ids: str) -> str:
+        """Return the cache key for one file of the diff.
+
+        Args:
+            path: File path in the new tree.
+            blob_ids: "<old>..<new>" blob ids from the diff's index header.
+
+        Returns:
+            str: Hex digest.
+        """
+        salt = self._salt if self.salt_for is None else self._salt + self.salt_for(path)
+        return hashlib.sha256(f"{salt}\0{path}\0{blob_ids}".encode()).hexdigest()
+
+    def scan(
+        self,
+        records: Iterable[AddedLine],
+        blobs: Mapping[str, str],
+        scan: Scan,
+        incomplete: Container[str] = (),
+    ) -> Iterator[Finding]:
+        """Scan records, replaying cached findings for unchanged files.
+
+        Records of files with a cache hit never reach `scan`; every other
+        file's findings are recorded, and stored by `save`, once the stream
+        is exhausted. Findings come out in diff order, as if every record
+        had been scanned, even when `scan` reads ahead (as the parallel
+        scanner does).
+
+        Args:
+            records: Added lines in diff order.
+            blobs: Path -> blob ids, filled by `iter_added_lines` as it parses.
+            scan: Scanner for the remaining records (e.g. `iter_findings`).
+            incomplete: Paths whose findings must not be stored, checked once
+                the stream is exhausted (e.g. files where a pattern ran out
+                of time, see `rules.Timeouts.paths`).
+
+        Yields:
+            Finding: Findings in diff order.
+        """
+        if self.path is None:
+            yield from scan(records)
+            return
+
+        order: Dict[str, int] = {}
+        replay: Deque[Tuple[int, Finding]] = deque()
+        fresh: Dict[str, List[Finding]] = {}
+        keys: Dict[str, str] = {}
+
+        def uncached() -> Iterator[AddedLine]:
+            last_path: Optional[str] = None
+            hit = False
+            for rec in records:
+                if rec.path != last_path:
+                    last_path = rec.path
+                    order[rec.path] = len(order)
+                    hit = self._replay(rec.path, blobs, order[rec.path], replay, keys, fresh)
+                if not hit:
+                    yield rec
+
+        for finding in scan(uncached()):
+            path = finding.get("path")
+            position = len(order) if path is None else order.get(path, len(order))
+            while replay and replay[0][0] < position:
+                yield replay.popleft()[1]
+            if path in fresh:
+                fresh[path].append(finding)
+            yield finding
+        while replay:
+            yield replay.popleft()[1]
+
+        for path, found in fresh.items():
+            if path not in incomplete:
+                self._put(keys[path], found)
+
+    def _replay(
+        self,
+        path: str,
+        blobs: Mapping[str, str],
+        position: int,
+        replay: Deque[Tuple[int, Finding]],
+        keys: Dict[str, str],
+        fresh: Dict[str, List[Finding]],
+    ) -> bool:
+        """Queue a file's cached findings, or start recording it on a miss.
+
+        Args:
+            path: File path.
+            blobs: Path -> blob ids.
+            position: Index of the file in diff order.
+            replay: Queue of (position, finding) to emit.
+            keys: Receives the cache key of files being recorded.
+            fresh: Receives an empty findings list for files being recorded.
+
+        Returns:
+            bool: True if the file was served from the cache.
+        """
+        blob_ids = blobs.get(path)
+        if blob_ids is None:
+            return False
+        key = self.key(path, blob_ids)
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            keys[path] = key
+            fresh[path] = []
+            return False
+        self.hits += 1
+        entry["used"] = time.time()
+        self._dirty = True
+        rules: Dict[Tuple[str, str], Rule] = {}
+        for lineno, group, pattern, text in entry["findings"]:
+            rule = rules.get((group, pattern))
+            if rule is None:
+                rule = rules[(group, pattern)] = Rule(group, pattern)
+            replay.append((position, Finding(rule, text, path, lineno)))
+        return True
+
+    def _put(self, key: str, findings: List[Finding]) -> None:
+        """Record a file's findings.
+
+        Args:
+            key: Cache key of the file.
+            findings: All findings of the file.
+        """
+        self._entries[key] = {
+            "used": time.time(),
+            "findings": [[f["lineno"], f["group"], f["pattern"], f["line"]] for f in findings],
+        }
+        self._dirty = True
+
+    def _evict(self) -> None:
+        """Drop least-recently-used entries until both limits are met."""
+        total = sum(len(entry["findings"]) for entry in self._entries.values())
+        if len(self._entries) <= self.max_entries and total <= self.max_findings:
+            return
+        by_age = sorted(self._entries, key=lambda k: self._entries[k]["used"])
+        for key in by_age:
+            if len(self._entries) <= self.max_entries and total <= self.max_findings:
+                break
+            total -= len(self._entries.pop(key)["findings"])
+
+    def save(self) -> None:
+        """Write the cache back if it changed; failures are ignored."""
+        if self.path is None or not self._dirty:
+            return
+        self._evict()
+        try:
+            cache.write_atomic(self.path, json.dumps(self._entries, separators=(",", ":")))
+        except (OSError, TypeError, ValueError):
+            return
+        self._dirty = False
@@ -3,7 +3,63 @@
 from __future__ import annotations
 
 import re
-from typing import Dict, List
+import signal
+import threading
+import time
+from functools import lru_cache
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    FrozenSet,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+)
+
+try:
+    from re import _parser as _sre_parse  # type: ignore[attr-defined]  # Python 3.11+
+except ImportError:  # pragma: no cover
+    import sre_parse as _sre_parse
+
+# Flags that cannot be expressed inside a shared alternation without changing
+# the meaning of the other alternatives.
+_GLOBAL_FLAGS = re.IGNORECASE | re.MULTILINE | re.DOTALL | re.VERBOSE | re.ASCII | re.LOCALE
+
+# Numbered or named back-references and conditional group references
+# ("(?(1)...)") shift meaning once a pattern is embedded.
+_BACKREF_RE = re.compile(r"\\[1-9]|\(\?P=|\(\?\(")
+
+# Character classes wider than this are not worth a first-character guard.
+_MAX_FIRST_CHARS = 64
+
+_REPEATS = {_sre_parse.MAX_REPEAT, _sre_parse.MIN_REPEAT}
+_REPEATS.add(getattr(_sre_parse, "POSSESSIVE_REPEAT", _sre_parse.MAX_REPEAT))
+
+# Repeats that can backtrack into their body (possessive ones cannot).
+_BACKTRACKING_REPEATS = {_sre_parse.MAX_REPEAT, _sre_parse.MIN_REPEAT}
+
+# A pattern that overruns its time budget this many times is not run again
+# for the rest of the scan.
+MAX_TIMEOUTS = 3
+
+# Matcher backends: "re" only, "re2" (linear-time, via google-re2, with `re`
+# as the per-pattern fallback), or "auto" (re2 when installed and some
+# pattern lacks a literal anchor; see `RuleSet`).
+REGEX_BACKENDS = ("auto", "re", "re2")
+
+# Syntax that both engines accept but read differently: POSIX classes are
+# plain characters to `re`, and "{,n}" is a repeat to `re` but literal to RE2.
+_RE2_MISREAD = re.compile(r"\[:|\{,")
+
+# ASCII characters that `re` counts as whitespace but RE2's \s does not,
+# and the newline, before which `re` (but not RE2) lets a final `$` match.
+_RE2_ODD_SPACE = re.compile(r"[\n\x0b\x1c-\x1f]")
 
 
 def _as_list(value: object) -> List[str]:
@@ -27,6 +83,9 @@ def _as_list(value: object) -> List[str]:
 def compile_patterns(pattern_cfg: object) -> Dict[str, List[re.Pattern]]:
     """Compile configured patterns.
 
+    A pattern listed in several groups is compiled once, and every group
+    holds the same object, so `RuleSet` evaluates it once per line.
+
     Args:
         pattern_cfg: Expected `Dict[str, Iterable[str]]`, but tolerant.
 
@@ -37,15 +96,1081 @@ def compile_patterns(pattern_cfg: object) -> Dict[str, List[re.Pattern]]:
         return {}
 
     compiled: Dict[str, List[re.Pattern]] = {}
+    unique: Dict[str, re.Pattern] = {}
 
     for group, raw in pattern_cfg.items():
         patterns = _as_list(raw)
         if not patterns:
             continue
         try:
-            compiled[group] = [re.compile(p) for p in patterns]
+            compiled[group] = [
+                unique[p] if p in unique else unique.setdefault(p, re.compile(p)) for p in patterns
+            ]
         except re.error:
             # If a pattern fails to compile, skip that group entirely.
             continue
 
     return compiled
+
+
+def compile_allowlist(patterns: object) -> Optional[re.Pattern]:
+    """Compile `ignore_patterns` into one alternation.
+
+    Unlike `compile_patterns`, an invalid entry only drops that entry
+    (including one that cannot be combined, e.g. with inline global flags).
+
+    Args:
+        patterns: Expected `List[str]`, but tolerant.
+
+    Returns:
+        Optional[re.Pattern]: Combined allowlist, or None if empty.
+    """
+    valid: List[str] = []
+    combined: Optional[re.Pattern] = None
+    for p in _as_list(patterns):
+        try:
+            combined = re.compile("|".join([*valid, f"(?:{p})"]))
+        except re.error:
+            continue
+        valid.append(f"(?:{p})")
+    return combined
+
+
+def _is_combinable(pat: re.Pattern) -> bool:
+    """Return True if a pattern can be embedded in a shared alternation.
+
+    Args:
+        pat: Compiled pattern.
+
+    Returns:
+        bool: False for bytes patterns, patterns carrying global flags and
+        patterns using back-references or conditional group references.
+    """
+    if not isinstance(pat.pattern, str):
+        return False
+    if pat.flags & _GLOBAL_FLAGS:
+        return False
+    return _BACKREF_RE.search(pat.pattern) is None
+
+
+def _first_of_item(op: Any, av: Any) -> Tuple[Optional[FrozenSet[str]], bool]:
+    """Return (possible first characters, can-match-empty) for one parse node.
+
+    Args:
+        op: sre opcode.
+        av: Opcode argument.
+
+    Returns:
+        Tuple[Optional[FrozenSet[str]], bool]: None as the set means "unknown".
+    """
+    if op is _sre_parse.LITERAL:
+        return frozenset(chr(av)), False
+    if op is _sre_parse.AT:
+        return frozenset(), True
+    if op is _sre_parse.IN:
+        members: Set[str] = set()
+        for item_op, item_av in av:
+            if item_op is _sre_parse.LITERAL:
+                members.add(chr(item_av))
+            elif item_op is _sre_parse.RANGE and item_av[1] - item_av[0] < _MAX_FIRST_CHARS:
+                members.update(chr(c) for c in range(item_av[0], item_av[1] + 1))
+            else:
+                return None, False
+        return frozenset(members), False
+    if op is _sre_parse.SUBPATTERN:
+        if av[1] or av[2]:
+            # Scoped flags such as (?i:...) change what the literals match.
+            return None, False
+        return _first_of_seq(av[-1])
+    if op is getattr(_sre_parse, "ATOMIC_GROUP", None):
+        return _first_of_seq(av)
+    if op is _sre_parse.BRANCH:
+        union: Set[str] = set()
+        nullable = False
+        for branch in av[1]:
+            chars, empty = _first_of_seq(branch)
+            if chars is None:
+                return None, False
+            union |= chars
+            nullable = nullable or empty
+        return frozenset(union), nullable
+    if op in _REPEATS:
+        chars, empty = _first_of_seq(av[2])
+        return chars, empty or av[0] == 0
+    return None, False
+
+
+def _first_of_seq(items: Any) -> Tuple[Optional[FrozenSet[str]], bool]:
+    """Return (possible first characters, can-match-empty) for a node sequence.
+
+    Args:
+        items: Parsed sre sequence.
+
+    Returns:
+        Tuple[Optional[FrozenSet[str]], bool]: None as the set means "unknown".
+    """
+    result: Set[str] = set()
+    for op, av in items:
+        chars, empty = _first_of_item(op, av)
+        if chars is None:
+            return None, False
+        result |= chars
+        if not empty:
+            return frozenset(result), False
+    return frozenset(result), True
+
+
+def first_chars(pattern: str) -> Optional[FrozenSet[str]]:
+    """Return the set of characters any match of `pattern` must start with.
+
+    Args:
+        pattern: Regex source.
+
+    Returns:
+        Optional[FrozenSet[str]]: Possible first characters, or None when the
+        pattern may match the empty string or starts with an open class.
+    """
+    try:
+        chars, empty = _first_of_seq(_sre_parse.parse(pattern))
+    except (re.error, RecursionError):
+        return None
+    if chars is None or empty or not chars:
+        return None
+    return chars
+
+
+def _min_width(items: Sequence[Any], state: Any) -> int:
+    """Return the shortest text a node sequence can match.
+
+    Args:
+        items: Parse nodes.
+        state: Parser state of the enclosing pattern.
+
+    Returns:
+        int: Minimum match length.
+    """
+    return int(_sre_parse.SubPattern(state, list(items)).getwidth()[0])
+
+
+def _repeats_alone(items: Sequence[Any], state: Any) -> bool:
+    """Return True if one node can match repeatedly while the rest match nothing.
+
+    Inside another repeat, such a sequence can split the same text into
+    iterations in exponentially many ways, e.g. the body of ``(a+)+`` or
+    ``(\\w+\\s?)*``. A required separator (``(\\s*,\\s*\\w+)*``) rules this out.
+
+    Args:
+        items: Parse nodes of a sequence.
+        state: Parser state of the enclosing pattern.
+
+    Returns:
+        bool: Whether the sequence is ambiguous on its own.
+    """
+    items = list(items)
+    for i, (op, av) in enumerate(items):
+        if op in _BACKTRACKING_REPEATS:
+            inner = av[1] > 1
+        elif op is _sre_parse.SUBPATTERN:
+            inner = _repeats_alone(av[-1], state)
+        elif op is _sre_parse.BRANCH:
+            inner = any(_repeats_alone(branch, state) for branch in av[1])
+        else:
+            inner = False
+        if inner and _min_width(items[:i] + items[i + 1 :], state) == 0:
+            return True
+    return False
+
+
+def _risk_of_seq(items: Any, state: Any) -> Optional[str]:
+    """Find a repeat in `items` that is prone to catastrophic backtracking.
+
+    Args:
+        items: Parse nodes.
+        state: Parser state of the enclosing pattern.
+
+    Returns:
+        Optional[str]: Description of the problem, or None.
+    """
+    for op, av in items:
+        if op in _REPEATS:
+            body = av[2]
+            if op in _BACKTRACKING_REPEATS and av[1] > 1 and _repeats_alone(body, state):
+                return "nested quantifier"
+            children: List[Any] = [body]
+        elif op is _sre_parse.SUBPATTERN:
+            children = [av[-1]]
+        elif op is _sre_parse.BRANCH:
+            children = list(av[1])
+        elif op in (_sre_parse.ASSERT, _sre_parse.ASSERT_NOT):
+            children = [av[1]]
+        elif op is getattr(_sre_parse, "ATOMIC_GROUP", None):
+            children = [av]
+        else:
+            children = []
+        for child in children:
+            found = _risk_of_seq(child, state)
+            if found is not None:
+                return found
+    return None
+
+
+def backtracking_risk(pattern: str, flags: int = 0) -> Optional[str]:
+    """Return why `pattern` may backtrack catastrophically, or None if it looks safe.
+
+    This is a static heuristic: it flags repeats whose body can split the
+    same text into iterations in many ways (nested quantifiers such as
+    ``(a+)+$`` or ``(\\w+\\s?)*``), which take exponential time on near-miss
+    lines. It does not catch every slow pattern, which is why scans also
+    enforce a time budget (see `TimeBudget`).
+
+    Args:
+        pattern: Regex source.
+        flags: Flags the pattern is compiled with.
+
+    Returns:
+        Optional[str]: Short description of the problem, or None.
+    """
+    try:
+        parsed = _sre_parse.parse(pattern, flags)
+        return _risk_of_seq(parsed, parsed.state)
+    except (re.error, RecursionError, TypeError):
+        return None
+
+
+def _best(candidates: List[FrozenSet[str]]) -> Optional[FrozenSet[str]]:
+    """Pick the most selective anchor set: longest shortest-alternative, then fewest.
+
+    Args:
+        candidates: Alternative anchor sets, any one of which is required.
+
+    Returns:
+        Optional[FrozenSet[str]]: Best candidate, or None if there are none.
+    """
+    if not candidates:
+        return None
+    return max(candidates, key=lambda c: (min(len(a) for a in c), -len(c)))
+
+
+def _anchors_of_seq(items: Any) -> Optional[FrozenSet[str]]:
+    """Return a set of literals, one of which every match of `items` contains.
+
+    Args:
+        items: Parsed sre sequence.
+
+    Returns:
+        Optional[FrozenSet[str]]: Required literal alternatives, or None.
+    """
+    candidates: List[FrozenSet[str]] = []
+    run: List[str] = []
+
+    def flush() -> None:
+        if run:
+            candidates.append(frozenset(["".join(run)]))
+            run.clear()
+
+    for op, av in items:
+        if op is _sre_parse.LITERAL:
+            run.append(chr(av))
+            continue
+        if op is _sre_parse.SUBPATTERN and not av[1] and not av[2]:
+            # A plain group is required as a whole: keep extending the run
+            # only if it is purely literal, otherwise look inside it.
+            inner = av[-1]
+            if all(i_op is _sre_parse.LITERAL for i_op, _ in inner):
+                run.extend(chr(i_av) for _, i_av in inner)
+                continue
+            flush()
+            nested = _anchors_of_seq(inner)
+        elif op is _sre_parse.BRANCH:
+            flush()
+            alternatives: set = set()
+            for branch in av[1]:
+                found = _anchors_of_seq(branch)
+                if found is None:
+                    alternatives.clear()
+                    break
+                alternatives |= found
+            nested = frozenset(alternatives) if alternatives else None
+        elif op in _REPEATS and av[0] >= 1:
+            flush()
+            nested = _anchors_of_seq(av[2])
+        else:
+            # Anything else (classes, optional parts, assertions) ends the
+            # current literal run without contributing a candidate.
+            flush()
+            continue
+        if nested is not None:
+            candidates.append(nested)
+    flush()
+    return _best(candidates)
+
+
+def literal_anchors(pattern: str, flags: int = 0) -> Optional[FrozenSet[str]]:
+    """Return literal substrings, one of which must occur in any matching line.
+
+    For example ``use\\s+Data::Dumper`` yields ``{"Data::Dumper"}`` and
+    ``foo|bar`` yields ``{"foo", "bar"}``.
+
+    Args:
+        pattern: Regex source.
+        flags: Flags the pattern is compiled with.
+
+    Returns:
+        Optional[FrozenSet[str]]: Anchors of at least two characters, or None
+        when no such required literal can be proven (including any
+        case-insensitive pattern).
+    """
+    if flags & re.IGNORECASE:
+        return None
+    try:
+        parsed = _sre_parse.parse(pattern, flags)
+    except (re.error, RecursionError):
+        return None
+    if parsed.state.flags & re.IGNORECASE:
+        return None
+    anchors = _anchors_of_seq(parsed)
+    if anchors is None or min(len(a) for a in anchors) < 2:
+        return None
+    return anchors
+
+
+def _minimal_anchors(anchors: Iterable[str]) -> List[str]:
+    """Drop anchors that contain a shorter anchor (the shorter one implies them).
+
+    Args:
+        anchors: All anchors in use.
+
+    Returns:
+        List[str]: Anchors sufficient to decide whether any anchor is present.
+    """
+    ordered = sorted(set(anchors), key=len)
+    kept: List[str] = []
+    for anchor in ordered:
+        if not any(k in anchor for k in kept):
+            kept.append(anchor)
+    return kept
+
+
+def _combine(patterns: Sequence[re.Pattern]) -> Optional[re.Pattern]:
+    """Join patterns into a single alternation used as a line prefilter.
+
+    When every alternative starts with a known character, the alternation is
+    guarded by a lookahead character class so the engine can skip positions
+    that cannot begin any match.
+
+    Args:
+        patterns: Combinable compiled patterns.
+
+    Returns:
+        Optional[re.Pattern]: Combined regex, or None if there is nothing to
+        combine or the engine rejects the result.
+    """
+    sources = list(dict.fromkeys(p.pattern for p in patterns))
+    if not sources:
+        return None
+
+    body = "|".join(f"(?:{s})" for s in sources)
+    guard: set = set()
+    for source in sources:
+        chars = first_chars(source)
+        if chars is None:
+            guard.clear()
+            break
+        guard |= chars
+    if guard and len(guard) <= _MAX_FIRST_CHARS:
+        cls = "".join(re.escape(c) for c in sorted(guard))
+        body = f"(?=[{cls}])(?:{body})"
+
+    try:
+        return re.compile(body)
+    except (re.error, OverflowError, RecursionError):
+        return None
+
+
+@lru_cache(maxsize=1)
+def _re2_module() -> Any:
+    """Import google-re2 if it is installed.
+
+    Returns:
+        Any: The ``re2`` module, or None when it is missing or lacks the
+        pattern-set API.
+    """
+    try:
+        import re2
+    except ImportError:
+        return None
+    if not (hasattr(re2, "Set") and hasattr(re2, "Options")):
+        return None
+    return re2
+
+
+def resolve_backend(name: object) -> str:
+    """Map a configured backend name to the one that will actually be used.
+
+    Args:
+        name: "auto", "re" or "re2" (anything else means "auto").
+
+    Returns:
+        str: "re2" if requested (or "auto") and google-re2 is installed,
+        otherwise "re".
+    """
+    if name == "re":
+        return "re"
+    return "re2" if _re2_module() is not None else "re"
+
+
+class _LinearSet:
+    """Patterns compiled into one RE2 set, so a single pass finds every match.
+
+    Patterns RE2 cannot compile (look-around, back-references, possessive
+    repeats, ...) or would read differently are left out; `indices` maps
+    set members back to positions in the input list.
+    """
+
+    def __init__(self, re2: Any, patterns: Sequence[re.Pattern]) -> None:
+        """Compile the set.
+
+        Args:
+            re2: The google-re2 module.
+            patterns: Compiled `re` patterns, in slot order.
+        """
+        options = re2.Options()
+        options.log_errors = False
+        self._set = re2.Set.SearchSet(options)
+        self.indices: List[int] = []
+        for position, pat in enumerate(patterns):
+            source = pat.pattern
+            if not isinstance(source, str) or not source.isascii() or _RE2_MISREAD.search(source):
+                continue
+            try:
+                self._set.Add(source)
+            except re2.error:
+                continue
+            self.indices.append(position)
+        if self.indices:
+            self._set.Compile()
+        self.match: Callable[[str], Optional[List[int]]] = self._set.Match
+
+
+def linear_safe(line: str) -> bool:
+    """Return True if RE2 and `re` agree on every supported pattern for `line`.
+
+    RE2's character classes (\\w, \\d, \\s, \\b) and case folding are
+    ASCII-only, so lines with other characters stay on `re`, as do lines
+    containing a newline (where `$` differs).
+
+    Args:
+        line: Text to scan.
+
+    Returns:
+        bool: Whether the line may be matched with RE2.
+    """
+    return line.isascii() and (line.isprintable() or _RE2_ODD_SPACE.search(line) is None)
+
+
+class RegexTimeout(Exception):
+    """A regex call exceeded its time budget (raised by `TimeBudget`)."""
+
+
+class Timeouts:
+    """Pattern/line pairs skipped because a regex call ran out of time."""
+
+    def __init__(self) -> None:
+        """Create an empty record."""
+        self.pairs: Dict[Tuple[str, str], int] = {}
+        self.paths: Set[str] = set()
+
+    def add(self, key: Tuple[str, str], path: Optional[str]) -> None:
+        """Count one skipped line for a (group, pattern) pair.
+
+        Args:
+            key: (group, pattern source).
+            path: File of the skipped line, if known.
+        """
+        self.pairs[key] = self.pairs.get(key, 0) + 1
+        if path is not None:
+            self.paths.add(path)
+
+    def merge(self, other: "Timeouts") -> None:
+        """Add another record's counts (e.g. from a worker process) to this one.
+
+        Args:
+            other: Record to merge.
+        """
+        for key, count in other.pairs.items():
+            self.pairs[key] = self.pairs.get(key, 0) + count
+        self.paths |= other.paths
+
+
+class TimeBudget:
+    """Bound how long any single regex call may run during a scan.
+
+    Python's `re` cannot be given a deadline, but it does check for signals
+    while matching. On the main thread of a Unix process, a watchdog timer
+    therefore fires every `seconds`; a call that is still running at two
+    consecutive ticks is interrupted with `RegexTimeout`, so no call runs
+    longer than twice the budget. Elsewhere (other threads, platforms
+    without ``setitimer``, or while another interval timer is running) calls
+    are timed instead and overruns are detected after the fact.
+
+    Either way the (group, pattern) pair is skipped for that line and
+    recorded in `timeouts`; after `MAX_TIMEOUTS` overruns the pattern is
+    skipped for the rest of the scan. Use as a context manager around the
+    scan.
+    """
+
+    def __init__(self, seconds: float, timeouts: Optional[Timeouts] = None) -> None:
+        """Create a budget.
+
+        Args:
+            seconds: Maximum time per regex call.
+            timeouts: Record receiving skipped pairs (a new one by default).
+        """
+        self.seconds = seconds
+        self.timeouts = timeouts if timeouts is not None else Timeouts()
+        self.path: Optional[str] = None
+        self._overruns: Dict[Tuple[str, str], int] = {}
+        self._disabled: Set[Tuple[str, str]] = set()
+        self._calls = 0
+        self._seen = -1
+        self._armed = False
+        self._watchdog = False
+        self._previous: Any = None
+
+    def __enter__(self) -> "TimeBudget":
+        """Start the watchdog when signals can be used.
+
+        Returns:
+            TimeBudget: This budget.
+        """
+        if (
+            hasattr(signal, "setitimer")
+            and threading.current_thread() is threading.main_thread()
+            and signal.getitimer(signal.ITIMER_REAL)[0] == 0
+        ):
+            self._previous = signal.signal(signal.SIGALRM, self._on_alarm)
+            signal.setitimer(signal.ITIMER_REAL, self.seconds, self.seconds)
+            self._watchdog = True
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        """Stop the watchdog and restore the previous SIGALRM handler.
+
+        Args:
+            *exc_info: Exception details (ignored).
+        """
+        if self._watchdog:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+            signal.signal(signal.SIGALRM, self._previous or signal.SIG_DFL)
+            self._watchdog = False
+
+    def _on_alarm(self, signum: int, frame: Any) -> None:
+        """Interrupt a regex call that has been running for a whole tick.
+
+        Args:
+            signum: Signal number.
+            frame: Interrupted frame.
+
+        Raises:
+            RegexTimeout: If the same guarded call was running at the last tick.
+        """
+        if self._armed and self._calls == self._seen:
+            self._armed = False
+            raise RegexTimeout()
+        self._seen = self._calls
+
+    def call(
+        self, key: Tuple[str, str], func: Callable[[str], Any], line: str, skips: bool = True
+    ) -> Any:
+        """Run one regex operation on `line` within the budget.
+
+        Args:
+            key: (group, pattern source) charged for the call.
+            func: Bound regex method, e.g. ``pattern.search``.
+            line: Text to match.
+            skips: Whether an overrun means the line goes unchecked for `key`
+                and is recorded in `timeouts` (False for the prefilter, whose
+                patterns are then checked one by one).
+
+        Returns:
+            Any: What `func` returned.
+
+        Raises:
+            RegexTimeout: If the call overran, or `key` already overran too
+                often.
+        """
+        if self._disabled and key in self._disabled:
+            if skips:
+                self.timeouts.add(key, self.path)
+            raise RegexTimeout()
+        if self._watchdog:
+            self._calls += 1
+            self._armed = True
+            try:
+                result = func(line)
+            except RegexTimeout:
+                self._overrun(key, skips)
+                raise
+            finally:
+                self._armed = False
+            return result
+        start = time.perf_counter()
+        result = func(line)
+        if time.perf_counter() - start > self.seconds:
+            self._overrun(key, skips)
+            raise RegexTimeout()
+        return result
+
+    def _overrun(self, key: Tuple[str, str], skips: bool) -> None:
+        """Count an overrun of `key` on the current line.
+
+        Args:
+            key: (group, pattern source).
+            skips: Whether to record the line as skipped for `key`.
+        """
+        self._overruns[key] = self._overruns.get(key, 0) + 1
+        if self._overruns[key] >= MAX_TIMEOUTS:
+            self._disabled.add(key)
+        if skips:
+            self.timeouts.add(key, self.path)
+
+
+# Budget key for the allowlist (its patterns are combined into one regex).
+_ALLOWLIST_KEY = ("ignore_patterns", "<allowlist>")
+_PREFILTER_KEY = ("*", "<prefilter>")
+_RE2_SET_KEY = ("*", "<re2 set>")
+
+
+# How a slot is pre-screened before its own regex runs.
+_ANCHORED, _COMBINED, _STANDALONE = 0, 1, 2
+
+# One distinct pattern: (pattern, screen kind, anchors, slot positions of
+# every (group, pattern) pair it stands for, budget/profiling key).
+_Unit = Tuple[re.Pattern, int, FrozenSet[str], Tuple[int, ...], Tuple[str, str]]
+
+
+class RuleSet:
+    """Matcher engine over all compiled pattern groups.
+
+    Patterns with a required literal (see `literal_anchors`) are indexed by
+    that literal: a line that contains none of the anchors never reaches the
+    regex engine for them. The remaining combinable patterns are folded into
+    one alternation so that a line is scanned once. Only lines that pass a
+    prefilter are re-checked pattern by pattern to recover every
+    (group, pattern) pair, in configuration order. A pattern shared by
+    several groups runs once, and a hit is reported for each of its groups.
+
+    With the "re2" backend, every pattern RE2 supports is compiled into one
+    linear-time pattern set that reports all matching patterns in a single
+    pass; the rest keep the prefilters above. Lines RE2 would read
+    differently (see `linear_safe`) are matched with `re` alone, so both
+    backends produce the same findings. "auto" keeps `re` when every pattern
+    has literal anchors: substring screening rejects clean lines more
+    cheaply than a call into the set.
+    """
+
+    def __init__(
+        self,
+        compiled: Mapping[str, Sequence[re.Pattern]],
+        anchor_table: Optional[Mapping[str, Optional[List[str]]]] = None,
+        ignore: Optional[re.Pattern] = None,
+        costs: Optional[Dict[Tuple[str, str], List[float]]] = None,
+        backend: str = "re",
+    ) -> None:
+        """Build the matcher.
+
+        Args:
+            compiled: Group -> compiled regex list, as from `compile_patterns`.
+            anchor_table: Optional precomputed `anchor_table()` output (e.g.
+                from the on-disk cache), keyed by pattern source; patterns
+                missing from it are analyzed.
+            ignore: Optional allowlist from `compile_allowlist`; text it
+                matches is masked out before patterns are applied.
+            costs: Optional dict to accumulate per-pattern profiling data into,
+                as (group, pattern) -> [seconds, calls, hits]. Profiling adds
+                overhead, so memoized rule sets never carry it.
+            backend: "re", "re2" to use a linear-time pattern set (falls
+                back to "re" when google-re2 is not installed), or "auto".
+        """
+        self.ignore = ignore
+        self.costs = costs
+        self._requested = backend
+        self.backend = resolve_backend(backend)
+        # (group, pattern) -> why it may backtrack catastrophically; filled
+        # in by the scanner, which applies the "regex_safety" policy.
+        self.unsafe: Dict[Tuple[str, str], str] = {}
+        self.groups: Dict[str, List[re.Pattern]] = {g: list(p) for g, p in compiled.items()}
+        self._slots: List[Tuple[str, re.Pattern, int, FrozenSet[str]]] = []
+        self._anchor_table: Dict[str, Optional[List[str]]] = {}
+
+        combinable: List[re.Pattern] = []
+        seen: Dict[re.Pattern, Tuple[int, FrozenSet[str]]] = {}
+        for group, pats in self.groups.items():
+            for pat in pats:
+                if pat in seen:
+                    kind, anchors = seen[pat]
+                    self._slots.append((group, pat, kind, anchors))
+                    continue
+                found = self._anchors_for(pat, anchor_table or {})
+                if found is not None:
+                    kind, anchors = _ANCHORED, found
+                elif _is_combinable(pat):
+                    combinable.append(pat)
+                    kind, anchors = _COMBINED, frozenset()
+                else:
+                    kind, anchors = _STANDALONE, frozenset()
+                seen[pat] = (kind, anchors)
+                self._slots.append((group, pat, kind, anchors))
+
+        self._prefilter = _combine(combinable)
+        if self._prefilter is None and combinable:
+            self._slots = [
+                (g, p, _STANDALONE if kind == _COMBINED else kind, a)
+                for g, p, kind, a in self._slots
+            ]
+        self._anchors = sorted({a for *_, anchors in self._slots for a in anchors})
+        self._screen = _minimal_anchors(self._anchors)
+        self._has_standalone = any(kind == _STANDALONE for _, _, kind, _ in self._slots)
+        self._units = self._build_units()
+        self._fanout = len(self._units) < len(self._slots)
+        self._subsets: Dict[FrozenSet[str], RuleSet] = {}
+        if backend != "re2" and self._prefilter is None and not self._has_standalone:
+            self.backend = "re"
+
+        self._match_any = self._match if costs is None else self._match_profiled
+        self._linear: Optional[_LinearSet] = None
+        self._rest: Optional[RuleSet] = None
+        self._rest_slots: Dict[Tuple[str, re.Pattern], List[int]] = {}
+        self._linear_positions: List[Tuple[int, ...]] = []
+        if self.backend == "re2" and self._slots:
+            self._init_linear()
+
+    def _build_units(self) -> List[_Unit]:
+        """Group the slots by distinct pattern, in order of first appearance.
+
+        Returns:
+            List[_Unit]: One entry per distinct pattern.
+        """
+        positions: Dict[re.Pattern, List[int]] = {}
+        firsts: List[Tuple[str, re.Pattern, int, FrozenSet[str]]] = []
+        for position, slot in enumerate(self._slots):
+            owned = positions.get(slot[1])
+            if owned is None:
+                positions[slot[1]] = [position]
+                firsts.append(slot)
+            else:
+                owned.append(position)
+        return [
+            (pat, kind, anchors, tuple(positions[pat]), (group, pat.pattern))
+            for group, pat, kind, anchors in firsts
+        ]
+
+    def _init_linear(self) -> None:
+        """Build the RE2 pattern set and a `re` RuleSet for the leftovers."""
+        linear = _LinearSet(_re2_module(), [unit[0] for unit in self._units])
+        if not linear.indices:
+            return
+        self._linear = linear
+        self._linear_positions = [self._units[i][3] for i in linear.indices]
+        in_set = set(linear.indices)
+        rest: Dict[str, List[re.Pattern]] = {}
+        for index, unit in enumerate(self._units):
+            if index in in_set:
+                continue
+            for position in unit[3]:
+                group, pat, _, _ = self._slots[position]
+                rest.setdefault(group, []).append(pat)
+                self._rest_slots.setdefault((group, pat), []).append(position)
+        if rest:
+            self._rest = RuleSet(rest, self._anchor_table, None, self.costs)
+        self._match_any = self._match_dispatch
+
+    def _anchors_for(
+        self, pat: re.Pattern, known: Mapping[str, Optional[List[str]]]
+    ) -> Optional[FrozenSet[str]]:
+        """Look up or compute the literal anchors of a pattern.
+
+        Args:
+            pat: Compiled pattern.
+            known: Precomputed anchors keyed by pattern source.
+
+        Returns:
+            Optional[FrozenSet[str]]: Anchors, or None if the pattern has none.
+        """
+        if not isinstance(pat.pattern, str):
+            return None
+        if pat.pattern in known:
+            stored = known[pat.pattern]
+            anchors = frozenset(stored) if stored else None
+        else:
+            anchors = literal_anchors(pat.pattern, pat.flags)
+        self._anchor_table[pat.pattern] = sorted(anchors) if anchors else None
+        return anchors
+
+    def anchor_table(self) -> Dict[str, Optional[List[str]]]:
+        """Return per-pattern anchors in a JSON-friendly form for caching.
+
+        Returns:
+            Dict[str, Optional[List[str]]]: Pattern source -> anchors or None.
+        """
+        return dict(self._anchor_table)
+
+    def restrict(self, groups: FrozenSet[str]) -> "RuleSet":
+        """Return a RuleSet limited to `groups` (memoized per group set).
+
+        The subset gets its own prefilters, so e.g. Python files are never
+        screened against anchors that only Perl rules need.
+
+        Args:
+            groups: Group names to keep; unknown names are ignored.
+
+        Returns:
+            RuleSet: Matcher over the selected groups, in original order.
+        """
+        subset = self._subsets.get(groups)
+        if subset is None:
+            kept = {g: p for g, p in self.groups.items() if g in groups}
+            if len(kept) == len(self.groups):
+                subset = self
+            else:
+                subset = RuleSet(kept, self._anchor_table, self.ignore, self.costs, self._requested)
+            self._subsets[groups] = subset
+        return subset
+
+    def __bool__(self) -> bool:
+        """Return True if at least one pattern is configured."""
+        return bool(self._slots)
+
+    def match(
+        self, line: str, budget: Optional[TimeBudget] = None
+    ) -> Iterator[Tuple[str, re.Pattern]]:
+        """Yield each (group, pattern) pair that matches the line.
+
+        The allowlist is only consulted for lines that already have a hit, so
+        clean lines never pay for it. When it matches, allowlisted spans are
+        replaced by a NUL character and the line is matched again.
+
+        Args:
+            line: Text to scan.
+            budget: Optional per-call time budget. Pairs that overrun it are
+                skipped (and recorded by the budget); if the allowlist
+                overruns, the line's hits are reported unfiltered.
+
+        Yields:
+            Tuple[str, re.Pattern]: Matching group name and pattern.
+        """
+        match = self._match_any
+        ignore = self.ignore
+        if ignore is None:
+            yield from match(line, budget)
+            return
+        hits = list(match(line, budget))
+        if not hits:
+            return
+        try:
+            if budget is None:
+                masked = ignore.sub("\0", line) if ignore.search(line) else None
+            elif budget.call(_ALLOWLIST_KEY, ignore.search, line):
+                masked = budget.call(_ALLOWLIST_KEY, lambda text: ignore.sub("\0", text), line)
+            else:
+                masked = None
+        except RegexTimeout:
+            masked = None
+        if masked is None:
+            yield from hits
+            return
+        yield from match(masked, budget)
+
+    def _match_dispatch(
+        self, line: str, budget: Optional[TimeBudget] = None
+    ) -> Iterator[Tuple[str, re.Pattern]]:
+        """Match with the RE2 set where that is exact, otherwise with `re`.
+
+        Args:
+            line: Text to scan.
+            budget: Optional per-call time budget (RE2 runs in linear time and
+                is not charged).
+
+        Returns:
+            Iterator[Tuple[str, re.Pattern]]: Matching group name and pattern.
+        """
+        if linear_safe(line):
+            return self._match_linear(line, budget)
+        if self.costs is None:
+            return self._match(line, budget)
+        return self._match_profiled(line, budget)
+
+    def _match_linear(
+        self, line: str, budget: Optional[TimeBudget] = None
+    ) -> Iterator[Tuple[str, re.Pattern]]:
+        """Yield matching pairs using the RE2 set plus `re` for the leftovers.
+
+        Args:
+            line: Text to scan (`linear_safe`).
+            budget: Optional per-call time budget for the `re` leftovers.
+
+        Yields:
+            Tuple[str, re.Pattern]: Matching group name and pattern, in
+            configuration order.
+        """
+        linear = self._linear
+        assert linear is not None
+        if self.costs is None:
+            found = linear.match(line)
+        else:
+            start = time.perf_counter()
+            found = linear.match(line)
+            entry = self.costs.setdefault(_RE2_SET_KEY, [0.0, 0, 0])
+            entry[0] += time.perf_counter() - start
+            entry[1] += 1
+            entry[2] += 1 if found else 0
+        positions: List[int] = []
+        if found:
+            linear_positions = self._linear_positions
+            for i in found:
+                positions.extend(linear_positions[i])
+        if self._rest is not None:
+            for hit in self._rest._match_any(line, budget):
+                positions.extend(self._rest_slots[hit])
+            # A pattern listed twice in one group is reported once per listing.
+            positions = list(set(positions))
+        if not positions:
+            return
+        positions.sort()
+        slots = self._slots
+        for position in positions:
+            group, pat, _, _ = slots[position]
+            yield group, pat
+
+    def _match(
+        self, line: str, budget: Optional[TimeBudget] = None
+    ) -> Iterator[Tuple[str, re.Pattern]]:
+        """Yield matching (group, pattern) pairs without applying the allowlist.
+
+        Args:
+            line: Text to scan.
+            budget: Optional per-call time budget.
+
+        Yields:
+            Tuple[str, re.Pattern]: Matching group name and pattern.
+        """
+        fanout = self._fanout
+        hits: List[int] = []
+        for pat, _, _, positions, key in self._candidates(line, budget):
+            if budget is None:
+                if pat.search(line) is None:
+                    continue
+            else:
+                try:
+                    if budget.call(key, pat.search, line) is None:
+                        continue
+                except RegexTimeout:
+                    continue
+            if fanout:
+                hits.extend(positions)
+            else:
+                yield key[0], pat
+        if hits:
+            yield from self._fan_out(hits)
+
+    def _match_profiled(
+        self, line: str, budget: Optional[TimeBudget] = None
+    ) -> Iterator[Tuple[str, re.Pattern]]:
+        """Like `_match`, charging time, calls and hits to `self.costs`.
+
+        Prefilter work is charged to the pseudo-pattern ("*", "<prefilter>"),
+        and a pattern shared by several groups to the first of them.
+
+        Args:
+            line: Text to scan.
+            budget: Optional per-call time budget.
+
+        Yields:
+            Tuple[str, re.Pattern]: Matching group name and pattern.
+        """
+        costs = self.costs
+        assert costs is not None
+        start = time.perf_counter()
+        candidates = self._candidates(line, budget)
+        entry = costs.setdefault(_PREFILTER_KEY, [0.0, 0, 0])
+        entry[0] += time.perf_counter() - start
+        entry[1] += 1
+        entry[2] += 1 if candidates else 0
+        hits: List[int] = []
+        for pat, _, _, positions, key in candidates:
+            start = time.perf_counter()
+            try:
+                if budget is None:
+                    hit = pat.search(line) is not None
+                else:
+                    hit = budget.call(key, pat.search, line) is not None
+            except RegexTimeout:
+                hit = False
+            entry = costs.setdefault(key, [0.0, 0, 0])
+            entry[0] += time.perf_counter() - start
+            entry[1] += 1
+            if hit:
+                entry[2] += 1
+                hits.extend(positions)
+        if hits:
+            yield from self._fan_out(hits)
+
+    def _fan_out(self, positions: List[int]) -> Iterator[Tuple[str, re.Pattern]]:
+        """Yield the (group, pattern) pair of each hit slot, in configuration order.
+
+        Args:
+            positions: Slot positions of the patterns that matched.
+
+        Yields:
+            Tuple[str, re.Pattern]: Matching group name and pattern.
+        """
+        if self._fanout:
+            positions.sort()
+        slots = self._slots
+        for position in positions:
+            group, pat, _, _ = slots[position]
+            yield group, pat
+
+    def _candidates(self, line: str, budget: Optional[TimeBudget] = None) -> Sequence[_Unit]:
+        """Return the distinct patterns that pass the prefilters for `line`.
+
+        Args:
+            line: Text to scan.
+            budget: Optional per-call time budget. If the combined prefilter
+                overruns it, every combined pattern becomes a candidate and
+                is checked (and timed) on its own.
+
+        Returns:
+            Sequence[_Unit]: Patterns whose own regex still has to run, in
+            order of first appearance (empty for clean lines).
+        """
+        anchored = False
+        for anchor in self._screen:
+            if anchor in line:
+                anchored = True
+                break
+        prefilter = self._prefilter
+        if prefilter is None:
+            combined = False
+        elif budget is None:
+            combined = prefilter.search(line) is not None
+        else:
+            try:
+                hit = budget.call(_PREFILTER_KEY, prefilter.search, line, skips=False)
+                combined = hit is not None
+            except RegexTimeout:
+                combined = True
+        if not (anchored or combined or self._has_standalone):
+            return ()
+
+        present = {a for a in self._anchors if a in line} if anchored else set()
+        candidates = []
+        for unit in self._units:
+            kind = unit[1]
+            if kind == _ANCHORED:
+                if present.isdisjoint(unit[2]):
+                    continue
+            elif kind == _COMBINED and not combined:
+                continue
+            candidates.append(unit)
+        return candidates
@@ -2,45 +2,474 @@
 
 from __future__ import annotations
 
-from typing import Dict, Iterable, List, Mapping, Union
+import json
+import posixpath
+import re
+import time
+from functools import lru_cache
+from itertools import islice
+from typing import (
+    Any,
+    Dict,
+    FrozenSet,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Set,
+    Tuple,
+    Union,
+)
 
-from .rules import compile_patterns
+from . import cache
+from .diff_parser import AddedLine
+from .entropy import EntropyDetector
+from .findings import Finding, Rule
+from .profiling import PatternCosts
+from .rules import (
+    RuleSet,
+    TimeBudget,
+    Timeouts,
+    backtracking_risk,
+    compile_allowlist,
+    compile_patterns,
+)
 
-Added = Union[str, Iterable[str]]
+Added = Union[str, Iterable[Union[str, AddedLine]]]
 
 
-def scan_diff(diff_text: Added, config: Mapping[str, object]) -> List[Dict[str, str]]:
+class LanguageRouter:
+    """Map file paths to the pattern groups that apply to them."""
+
+    def __init__(self, languages: object, groups: Iterable[str]) -> None:
+        """Build the extension table.
+
+        Args:
+            languages: Value of the "languages" config key
+                (group -> list of extensions).
+            groups: All configured pattern groups.
+        """
+        groups = list(groups)
+        by_ext: Dict[str, Set[str]] = {}
+        if isinstance(languages, dict):
+            for group, exts in languages.items():
+                if group not in groups or not isinstance(exts, (list, tuple)):
+                    continue
+                for ext in exts:
+                    ext = str(ext).lower()
+                    by_ext.setdefault(ext if ext.startswith(".") else f".{ext}", set()).add(group)
+        routed = set().union(*by_ext.values()) if by_ext else set()
+        shared = frozenset(g for g in groups if g not in routed)
+        self._routes: Dict[str, FrozenSet[str]] = {
+            ext: frozenset(gs) | shared for ext, gs in by_ext.items()
+        }
+
+    def route(self, path: str) -> Optional[FrozenSet[str]]:
+        """Return the groups for `path`, or None if every group applies.
+
+        Args:
+            path: Repository-relative file path.
+
+        Returns:
+            Optional[FrozenSet[str]]: Applicable groups.
+        """
+        return self._routes.get(posixpath.splitext(path)[1].lower())
+
+
+# Config keys that feed the rule set, and the group names used for the
+# non-"patterns" ones.
+_RULE_KEYS = (
+    "patterns",
+    "paths",
+    "extra_regexes",
+    "ignore_patterns",
+    "regex_safety",
+    "regex_backend",
+    "secrets",
+)
+PATHS_GROUP = "paths"
+EXTRA_GROUP = "extra_regexes"
+IGNORE_GROUP = "ignore_patterns"
+SECRETS_GROUP = "secrets"
+
+# Added lines per entropy batch, and the profiling key its time is charged to.
+ENTROPY_BLOCK = 4096
+_ENTROPY_KEY = ("*", "<entropy>")
+
+
+def _rule_spec(config: Mapping[str, object]) -> Dict[str, object]:
+    """Extract the config keys that determine the rule set.
+
+    Args:
+        config: Loaded configuration.
+
+    Returns:
+        Dict[str, object]: Subset of config relevant to rule compilation.
+    """
+    return {key: config.get(key) for key in _RULE_KEYS if config.get(key) is not None}
+
+
+def ruleset_for(config: Mapping[str, object]) -> RuleSet:
+    """Return the (memoized) RuleSet for a configuration.
+
+    Args:
+        config: Loaded configuration.
+
+    Returns:
+        RuleSet: Matcher for the configured groups.
+    """
+    spec = _rule_spec(config)
+    try:
+        raw_json = json.dumps(spec)
+        cacheable = json.loads(raw_json) == spec
+    except (TypeError, ValueError):
+        cacheable = False
+    if not cacheable:
+        return _build_ruleset(spec, None)
+    return _cached_ruleset(raw_json)
+
+
+@lru_cache(maxsize=32)
+def _cached_ruleset(raw_json: str) -> RuleSet:
+    """Compile a RuleSet once per distinct rule config in this process.
+
+    Literal-anchor analysis is also persisted on disk, keyed by the rule
+    config and package version, so later processes skip it.
+
+    Args:
+        raw_json: JSON encoding of `_rule_spec(config)`.
+
+    Returns:
+        RuleSet: Matcher for the configured groups.
+    """
+    spec = json.loads(raw_json)
+    key = cache.value_fingerprint(spec)
+    table = cache.load("rules", key)
+    ruleset = _build_ruleset(spec, table if isinstance(table, dict) else None)
+    if not isinstance(table, dict):
+        cache.store("rules", key, ruleset.anchor_table())
+    return ruleset
+
+
+def _build_ruleset(
+    spec: Mapping[str, object],
+    anchor_table: Optional[Dict[str, Any]],
+    costs: Optional[PatternCosts] = None,
+) -> RuleSet:
+    """Compile all rule-bearing config keys into one RuleSet.
+
+    `paths` become escaped literal patterns in the "paths" group,
+    `extra_regexes` become the "extra_regexes" group and `secrets.prefixes`
+    the "secrets" group (all apply to every file), and `ignore_patterns`
+    become the allowlist. Unless
+    `regex_safety` is "off", patterns prone to catastrophic backtracking are
+    listed in `RuleSet.unsafe`; with "reject" they are also left out.
+    `regex_backend` selects the matcher engine (see `RuleSet`).
+
+    Args:
+        spec: Output of `_rule_spec`.
+        anchor_table: Optional cached literal-anchor analysis.
+        costs: Optional per-pattern profiling accumulator.
+
+    Returns:
+        RuleSet: Matcher for the configured groups.
+    """
+    raw_patterns = spec.get("patterns", {})
+    groups: Dict[str, object] = dict(raw_patterns) if isinstance(raw_patterns, dict) else {}
+    paths = spec.get("paths")
+    if isinstance(paths, list) and paths and PATHS_GROUP not in groups:
+        groups[PATHS_GROUP] = [re.escape(str(p)) for p in paths if p]
+    extra = spec.get("extra_regexes")
+    if isinstance(extra, list) and extra and EXTRA_GROUP not in groups:
+        groups[EXTRA_GROUP] = extra
+    secrets = spec.get("secrets")
+    prefixes = secrets.get("prefixes") if isinstance(secrets, dict) else None
+    if isinstance(prefixes, list) and prefixes and SECRETS_GROUP not in groups:
+        groups[SECRETS_GROUP] = prefixes
+    ignore = spec.get("ignore_patterns")
+
+    unsafe: Dict[Tuple[str, str], str] = {}
+    safety = spec.get("regex_safety", "warn")
+    if safety != "off":
+        for group, raw in [*groups.items(), (IGNORE_GROUP, ignore)]:
+            if isinstance(raw, str):
+                raw = [raw]
+            for pattern in raw if isinstance(raw, list) else []:
+                reason = backtracking_risk(str(pattern))
+                if reason is not None:
+                    unsafe[(group, str(pattern))] = reason
+    if safety == "reject" and unsafe:
+        groups = {g: _without(raw, g, unsafe) for g, raw in groups.items()}
+        ignore = _without(ignore, IGNORE_GROUP, unsafe)
+
+    ruleset = RuleSet(
+        compile_patterns(groups),
+        anchor_table,
+        compile_allowlist(ignore),
+        costs,
+        str(spec.get("regex_backend", "auto")),
+    )
+    ruleset.unsafe = unsafe
+    return ruleset
+
+
+def _without(raw: object, group: str, unsafe: Mapping[Tuple[str, str], str]) -> object:
+    """Drop a group's unsafe patterns from its configured value.
+
+    Args:
+        raw: Configured pattern or pattern list.
+        group: Group name.
+        unsafe: (group, pattern) -> reason.
+
+    Returns:
+        object: `raw` without the unsafe patterns (unchanged if not a list/str).
+    """
+    if isinstance(raw, str):
+        raw = [raw]
+    if not isinstance(raw, list):
+        return raw
+    return [p for p in raw if (group, str(p)) not in unsafe]
+
+
+def unsafe_patterns(config: Mapping[str, object]) -> Dict[Tuple[str, str], str]:
+    """Return the configured patterns prone to catastrophic backtracking.
+
+    Args:
+        config: Loaded configuration.
+
+    Returns:
+        Dict[Tuple[str, str], str]: (group, pattern) -> reason, in config
+        order; the "ignore_patterns" group holds allowlist entries. Empty
+        when "regex_safety" is "off".
+    """
+    return dict(ruleset_for(config).unsafe)
+
+
+def scan_diff(
+    diff_text: Added,
+    config: Mapping[str, object],
+    pattern_costs: Optional[PatternCosts] = None,
+    timeouts: Optional[Timeouts] = None,
+) -> List[Finding]:
     """Scan added lines and return list of findings.
 
-    Accepts either a single string (with newlines) or an iterable of lines.
+    Accepts either a single string (with newlines), an iterable of lines, or
+    an iterable of `AddedLine` records from `diff_parser.iter_added_lines`.
 
     Args:
         diff_text: Added lines to scan.
-        config: Loaded configuration; reads the "patterns" key.
+        config: Loaded configuration; reads "patterns", "paths",
+            "extra_regexes", "ignore_patterns", "secrets" and "languages".
+        pattern_costs: Optional dict that receives per-pattern regex time,
+            call and hit counts (see `profiling.Profiler`).
+        timeouts: Optional record of pattern/line pairs skipped for
+            exceeding "regex_timeout_ms" (see `iter_findings`).
 
     Returns:
-        List[Dict[str, str]]: Each finding has:
+        List[Finding]: Each finding is a read-only mapping with:
             - "pattern": matched pattern string
             - "line": offending line (raw)
-            - "group": (optional) group name from pattern bundle
+            - "group": group name from pattern bundle
+            - "path", "lineno": location, when scanning `AddedLine` records
+    """
+    return list(iter_findings(diff_text, config, pattern_costs, timeouts))
+
+
+def iter_findings(
+    diff_text: Added,
+    config: Mapping[str, object],
+    pattern_costs: Optional[PatternCosts] = None,
+    timeouts: Optional[Timeouts] = None,
+) -> Iterator[Finding]:
+    """Lazily scan added lines, yielding findings as they are found.
+
+    Lines are consumed one at a time, so a generator of lines (e.g. streamed
+    from `git diff`) is never materialized. `AddedLine` records are checked
+    only against the groups routed to their file's extension; plain strings
+    are checked against every group.
+
+    Every regex call is bounded by "regex_timeout_ms" (see
+    `rules.TimeBudget`): a pattern that runs out of time on a line is skipped
+    for that line, and after repeated overruns for the rest of the scan.
+
+    With "secrets.entropy" enabled, lines holding a long base64 or hex run
+    whose Shannon entropy exceeds the configured limit are reported in the
+    "secrets" group (see `entropy.EntropyDetector`), whatever the file type.
+
+    Args:
+        diff_text: Added lines to scan (string or iterable of lines/records).
+        config: Loaded configuration; reads "patterns", "paths",
+            "extra_regexes", "ignore_patterns", "secrets" and "languages".
+        pattern_costs: Optional per-pattern profiling accumulator; when given,
+            an instrumented (non-memoized) rule set is used.
+        timeouts: Optional record that receives the pattern/line pairs skipped
+            for exceeding the time budget.
+
+    Yields:
+        Finding: Findings in the same shape and order as `scan_diff`. Findings
+        of one pattern share a `Rule`, and findings on one line share its text.
     """
-    raw_patterns = config.get("patterns", {})
-    compiled = compile_patterns(raw_patterns)
+    yield from CompiledRules(config, pattern_costs).iter_findings(diff_text, timeouts)
 
-    # Normalize lines
-    if isinstance(diff_text, str):
-        lines = diff_text.splitlines()
-    else:
-        lines = list(diff_text)
 
-    findings: List[Dict[str, str]] = []
+class CompiledRules:
+    """Everything `iter_findings` builds from a configuration, built once.
 
-    if not compiled or not lines:
-        return findings
+    Hold one of these to scan many inputs with the same configuration
+    without re-deriving the rule set, language routing and entropy detector
+    per call (see `batch.Scanner`).
+    """
+
+    def __init__(
+        self, config: Mapping[str, object], pattern_costs: Optional[PatternCosts] = None
+    ) -> None:
+        """Compile the rules.
+
+        Args:
+            config: Loaded configuration.
+            pattern_costs: Optional per-pattern profiling accumulator; when
+                given, an instrumented (non-memoized) rule set is built.
+        """
+        self.config = config
+        if pattern_costs is None:
+            self.ruleset = ruleset_for(config)
+        else:
+            self.ruleset = _build_ruleset(_rule_spec(config), None, pattern_costs)
+        self.router = LanguageRouter(config.get("languages"), self.ruleset.groups)
+        self.detector = EntropyDetector.from_config(config.get("secrets"))
+
+    def __bool__(self) -> bool:
+        """Return True if any pattern or the entropy check is configured."""
+        return bool(self.ruleset) or self.detector is not None
+
+    def iter_findings(
+        self, diff_text: Added, timeouts: Optional[Timeouts] = None
+    ) -> Iterator[Finding]:
+        """Scan with the compiled rules (see the module-level `iter_findings`).
+
+        Args:
+            diff_text: Added lines to scan (string or iterable of lines/records).
+            timeouts: Optional record of pattern/line pairs skipped for time.
+
+        Yields:
+            Finding: Findings in input order.
+        """
+        if not self:
+            return
+        ruleset, router, detector = self.ruleset, self.router, self.detector
+        # One shared Rule per (group, compiled pattern) hit by this scan.
+        rules: Dict[Tuple[str, re.Pattern], Rule] = {}
+
+        lines = diff_text.splitlines() if isinstance(diff_text, str) else diff_text
+        budget_ms = self.config.get("regex_timeout_ms")
+        if not isinstance(budget_ms, int) or budget_ms <= 0:
+            if detector is None:
+                yield from _iter_matches(lines, ruleset, router, rules, None)
+            else:
+                yield from _iter_entropy(lines, ruleset, router, rules, None, detector)
+            return
+        with TimeBudget(budget_ms / 1000, timeouts) as budget:
+            if detector is None:
+                yield from _iter_matches(lines, ruleset, router, rules, budget)
+            else:
+                yield from _iter_entropy(lines, ruleset, router, rules, budget, detector)
+
+
+def _iter_entropy(
+    lines: Iterable[Union[str, AddedLine]],
+    ruleset: RuleSet,
+    router: LanguageRouter,
+    rules: Dict[Tuple[str, re.Pattern], Rule],
+    budget: Optional[TimeBudget],
+    detector: EntropyDetector,
+) -> Iterator[Finding]:
+    """Like `_iter_matches`, adding high-entropy findings for every file.
+
+    Lines are read in blocks of `ENTROPY_BLOCK` so that each block's
+    candidates are measured in one batch. A line's entropy finding follows
+    its pattern findings.
+
+    Args:
+        lines: Plain lines or located records.
+        ruleset: Matcher for all groups.
+        router: Extension -> groups table.
+        rules: Interned `Rule` per (group, compiled pattern).
+        budget: Optional per-call time budget.
+        detector: High-entropy string detector.
+
+    Yields:
+        Finding: Findings in input order.
+    """
+    labels: Dict[str, Rule] = {}
+    costs = ruleset.costs
+    stream = iter(lines)
+    while True:
+        block = list(islice(stream, ENTROPY_BLOCK))
+        if not block:
+            return
+        texts = [item.text if isinstance(item, AddedLine) else item for item in block]
+        start = time.perf_counter() if costs is not None else 0.0
+        flagged = detector.scan(texts, ruleset.ignore)
+        if costs is not None:
+            entry = costs.setdefault(_ENTROPY_KEY, [0.0, 0, 0])
+            entry[0] += time.perf_counter() - start
+            entry[1] += len(block)
+            entry[2] += len(flagged)
+        done = 0
+        for index in sorted(flagged):
+            yield from _iter_matches(block[done : index + 1], ruleset, router, rules, budget)
+            done = index + 1
+            rule = labels.get(flagged[index])
+            if rule is None:
+                rule = labels[flagged[index]] = Rule(SECRETS_GROUP, flagged[index])
+            item = block[index]
+            if isinstance(item, AddedLine):
+                yield Finding(rule, item.text, item.path, item.lineno)
+            else:
+                yield Finding(rule, item)
+        if done < len(block):
+            yield from _iter_matches(block[done:], ruleset, router, rules, budget)
+
+
+def _iter_matches(
+    lines: Iterable[Union[str, AddedLine]],
+    ruleset: RuleSet,
+    router: LanguageRouter,
+    rules: Dict[Tuple[str, re.Pattern], Rule],
+    budget: Optional[TimeBudget],
+) -> Iterator[Finding]:
+    """Match each line against the rules routed to its file.
+
+    Args:
+        lines: Plain lines or located records.
+        ruleset: Matcher for all groups.
+        router: Extension -> groups table.
+        rules: Interned `Rule` per (group, compiled pattern), filled as hits occur.
+        budget: Optional per-call time budget.
+
+    Yields:
+        Finding: Findings in input order.
+    """
+    last_path: Optional[str] = None
+    active = ruleset
+    for item in lines:
+        if not isinstance(item, AddedLine):
+            for hit in ruleset.match(item, budget):
+                rule = rules.get(hit)
+                if rule is None:
+                    rule = rules[hit] = Rule(hit[0], hit[1].pattern)
+                yield Finding(rule, item)
+            continue
 
-    for line in lines:
-        for group, patterns in compiled.items():
-            for pat in patterns:
-                if pat.search(line):
-                    findings.append({"pattern": pat.pattern, "line": line, "group": group})
-    return findings
+        if item.path != last_path:
+            last_path = item.path
+            groups = router.route(item.path)
+            active = ruleset if groups is None else ruleset.restrict(groups)
+            if budget is not None:
+                budget.path = item.path
+        for hit in active.match(item.text, budget):
+            rule = rules.get(hit)
+            if rule is None:
+                rule = rules[hit] = Rule(hit[0], hit[1].pattern)
+            yield Finding(rule, item.text, item.path, item.lineno)
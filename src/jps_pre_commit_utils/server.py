@@ -0,0 +1,470 @@
+"""Long-lived scan server that keeps configuration and compiled rules warm.
+
+Editors and CI bots that scan many diffs should not pay interpreter start-up,
+config loading and rule compilation for each one. The server speaks
+newline-delimited JSON-RPC 2.0, either on a Unix socket (by default
+``<git-dir>/jps-pre-commit.sock``, which the hook entry point picks up
+automatically through `client`) or on stdin/stdout with ``--stdio``.
+
+Methods:
+
+- ``scan``: ``{"diff": "<unified diff>"}`` or ``{"lines": [...], "path": "a.py"}``
+  (``path`` optional, ``start`` is the first line number) returns
+  ``{"findings": [{"group", "pattern", "path", "lineno", "line"}, ...]}``,
+  plus ``"timeouts"`` when a pattern ran out of time on some lines.
+- ``check``: ``{"argv": [...], "cwd": "...", "env": {...}}`` runs the hook's
+  CLI in that directory, with the caller's ``GIT_*`` variables (``env``)
+  replacing the server's own, and returns ``{"exit_code", "stdout", "stderr"}``.
+- ``ping`` returns ``{"pid": ...}``; ``shutdown`` stops the server.
+
+An optional ``cwd`` selects which repository's ``.my-pre-commit-checks.yaml``
+applies. Configuration is reloaded whenever either YAML file changes.
+Requests are handled one at a time, on the main thread, so the regex time
+budget can interrupt a runaway pattern (see `rules.TimeBudget`).
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import socketserver
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Sequence, TextIO, Tuple
+
+from . import cli, client
+from .config import load_config
+from .diff_parser import AddedLine, iter_added_lines, split_diff
+from .formats import finding_record
+from .rules import Timeouts
+from .scanner import iter_findings, ruleset_for
+
+# JSON-RPC 2.0 error codes.
+PARSE_ERROR = -32700
+INVALID_REQUEST = -32600
+METHOD_NOT_FOUND = -32601
+INVALID_PARAMS = -32602
+INTERNAL_ERROR = -32603
+
+_Signature = Tuple[Optional[Tuple[int, int]], ...]
+
+# Seconds a connection may wait between requests before it is closed.
+_IDLE_CONNECTION_TIMEOUT = 5.0
+
+
+def _config_files(cwd: str) -> List[Path]:
+    """Return the config files `load_config` reads for a working directory.
+
+    Args:
+        cwd: Working directory.
+
+    Returns:
+        List[Path]: Home and local config file paths.
+    """
+    return [
+        Path.home() / ".config" / "my-pre-commit-checks.yaml",
+        Path(cwd) / ".my-pre-commit-checks.yaml",
+    ]
+
+
+def _signature(paths: Sequence[Path]) -> _Signature:
+    """Return (mtime, size) of each file, None for missing files.
+
+    Args:
+        paths: Files to stat.
+
+    Returns:
+        _Signature: One entry per path.
+    """
+    sig: List[Optional[Tuple[int, int]]] = []
+    for path in paths:
+        try:
+            st = path.stat()
+            sig.append((st.st_mtime_ns, st.st_size))
+        except OSError:
+            sig.append(None)
+    return tuple(sig)
+
+
+@contextlib.contextmanager
+def _in_directory(cwd: Optional[str]) -> Iterator[None]:
+    """Temporarily change the working directory.
+
+    Args:
+        cwd: Directory to switch to, or None to stay put.
+
+    Yields:
+        None
+    """
+    if not cwd:
+        yield
+        return
+    previous = os.getcwd()
+    os.chdir(cwd)
+    try:
+        yield
+    finally:
+        os.chdir(previous)
+
+
+@contextlib.contextmanager
+def _git_environment(env: Dict[str, str]) -> Iterator[None]:
+    """Temporarily replace the ``GIT_*`` environment variables.
+
+    Every git process started meanwhile (diff, numstat, check-attr, ...)
+    inherits them, so it sees the same index and repository as the caller.
+
+    Args:
+        env: The caller's ``GIT_*`` variables.
+
+    Yields:
+        None
+    """
+    saved = {key: value for key, value in os.environ.items() if key.startswith("GIT_")}
+    for key in saved:
+        del os.environ[key]
+    os.environ.update(env)
+    try:
+        yield
+    finally:
+        for key in [key for key in os.environ if key.startswith("GIT_")]:
+            del os.environ[key]
+        os.environ.update(saved)
+
+
+class RequestError(Exception):
+    """A request that cannot be served, with its JSON-RPC error code."""
+
+    def __init__(self, code: int, message: str) -> None:
+        """Create the error.
+
+        Args:
+            code: JSON-RPC error code.
+            message: Human-readable description.
+        """
+        super().__init__(message)
+        self.code = code
+
+
+class ScanServer:
+    """Serve scan requests against warm, automatically reloaded configs."""
+
+    def __init__(self) -> None:
+        """Create a server with no configuration loaded yet."""
+        self._configs: Dict[str, Tuple[_Signature, Dict[str, Any]]] = {}
+        self._lock = threading.Lock()
+        self.stopped = False
+        self.last_request = time.monotonic()
+
+    def config(self, cwd: str) -> Dict[str, Any]:
+        """Return the configuration for `cwd`, reloading it if a file changed.
+
+        Args:
+            cwd: Working directory whose local config applies.
+
+        Returns:
+            Dict[str, Any]: Loaded configuration (its rules are compiled).
+        """
+        signature = _signature(_config_files(cwd))
+        cached = self._configs.get(cwd)
+        if cached is not None and cached[0] == signature:
+            return cached[1]
+        with _in_directory(cwd):
+            cfg = load_config()
+        ruleset_for(cfg)
+        self._configs[cwd] = (signature, cfg)
+        return cfg
+
+    def handle_line(self, line: str) -> Optional[str]:
+        """Handle one newline-delimited request.
+
+        Args:
+            line: JSON-RPC request text.
+
+        Returns:
+            Optional[str]: Response text, or None for notifications.
+        """
+        try:
+            message = json.loads(line)
+        except ValueError:
+            return json.dumps(_error(None, PARSE_ERROR, "Parse error"))
+        response = self.handle(message)
+        return None if response is None else json.dumps(response, ensure_ascii=False)
+
+    def handle(self, message: Any) -> Optional[Dict[str, Any]]:
+        """Dispatch a decoded request.
+
+        Args:
+            message: Decoded JSON-RPC request.
+
+        Returns:
+            Optional[Dict[str, Any]]: Response object, or None for notifications.
+        """
+        if not isinstance(message, dict) or not isinstance(message.get("method"), str):
+            return _error(None, INVALID_REQUEST, "Invalid Request")
+        msg_id = message.get("id")
+        params = message.get("params") or {}
+        handler = getattr(self, "_rpc_" + message["method"], None)
+        if handler is None:
+            result: Dict[str, Any] = _error(msg_id, METHOD_NOT_FOUND, "Method not found")
+        elif not isinstance(params, dict):
+            result = _error(msg_id, INVALID_PARAMS, "params must be an object")
+        else:
+            with self._lock:
+                self.last_request = time.monotonic()
+                try:
+                    result = {"jsonrpc": "2.0", "id": msg_id, "result": handler(params)}
+                except RequestError as exc:
+                    result = _error(msg_id, exc.code, str(exc))
+                except Exception as exc:  # keep serving after a bad request
+                    result = _error(msg_id, INTERNAL_ERROR, f"{type(exc).__name__}: {exc}")
+        return None if "id" not in message else result
+
+    def _rpc_scan(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        """Scan a diff or a list of lines.
+
+        Args:
+            params: "diff" or "lines" (+ optional "path", "start"), and "cwd".
+
+        Returns:
+            Dict[str, Any]: {"findings": [...]}, plus "timeouts" (group,
+            pattern and number of lines) for patterns that ran out of time.
+
+        Raises:
+            RequestError: If neither "diff" nor "lines" is given.
+        """
+        cfg = self.config(params.get("cwd") or os.getcwd())
+        if isinstance(params.get("diff"), str):
+            records: Any = iter_added_lines(split_diff(params["diff"]))
+        elif isinstance(params.get("lines"), list):
+            lines = [str(line) for line in params["lines"]]
+            path = params.get("path")
+            if path:
+                start = int(params.get("start", 1))
+                records = [AddedLine(path, start + i, text) for i, text in enumerate(lines)]
+            else:
+                records = lines
+        else:
+            raise RequestError(INVALID_PARAMS, "scan needs 'diff' (str) or 'lines' (list)")
+        timeouts = Timeouts()
+        findings = [finding_record(f) for f in iter_findings(records, cfg, timeouts=timeouts)]
+        result: Dict[str, Any] = {"findings": findings}
+        if timeouts.pairs:
+            result["timeouts"] = [
+                {"group": group, "pattern": pattern, "lines": lines}
+                for (group, pattern), lines in timeouts.pairs.items()
+            ]
+        return result
+
+    def _rpc_check(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        """Run the hook's CLI, capturing its output.
+
+        Args:
+            params: "argv" (list of str), "cwd" and "env" (the caller's
+                ``GIT_*`` variables; none when omitted).
+
+        Returns:
+            Dict[str, Any]: {"exit_code", "stdout", "stderr"}.
+        """
+        argv = [str(arg) for arg in params.get("argv") or []]
+        env = params.get("env") or {}
+        if not isinstance(env, dict):
+            raise RequestError(INVALID_PARAMS, "env must be an object")
+        git_env = {str(k): str(v) for k, v in env.items() if str(k).startswith("GIT_")}
+        out, err = io.StringIO(), io.StringIO()
+        with (
+            _git_environment(git_env),
+            _in_directory(params.get("cwd")),
+            contextlib.redirect_stdout(out),
+            contextlib.redirect_stderr(err),
+        ):
+            try:
+                code = cli.main(argv)
+            except SystemExit as exc:  # argparse errors
+                code = exc.code if isinstance(exc.code, int) else 2
+        return {"exit_code": code, "stdout": out.getvalue(), "stderr": err.getvalue()}
+
+    def _rpc_ping(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        """Report that the server is alive.
+
+        Args:
+            params: Unused.
+
+        Returns:
+            Dict[str, Any]: {"pid": process id}.
+        """
+        return {"pid": os.getpid()}
+
+    def _rpc_shutdown(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        """Stop serving after this request.
+
+        Args:
+            params: Unused.
+
+        Returns:
+            Dict[str, Any]: Empty result.
+        """
+        self.stopped = True
+        return {}
+
+
+def _error(msg_id: Any, code: int, message: str) -> Dict[str, Any]:
+    """Build a JSON-RPC error response.
+
+    Args:
+        msg_id: Request id (None if unknown).
+        code: Error code.
+        message: Error message.
+
+    Returns:
+        Dict[str, Any]: Response object.
+    """
+    return {"jsonrpc": "2.0", "id": msg_id, "error": {"code": code, "message": message}}
+
+
+def serve_stdio(server: ScanServer, stdin: TextIO, stdout: TextIO) -> None:
+    """Serve requests read line by line from `stdin` until EOF or shutdown.
+
+    Args:
+        server: Request handler.
+        stdin: Request stream.
+        stdout: Response stream (captured output of "check" never goes here).
+    """
+    for line in stdin:
+        if not line.strip():
+            continue
+        response = server.handle_line(line)
+        if response is not None:
+            stdout.write(response + "\n")
+            stdout.flush()
+        if server.stopped:
+            break
+
+
+class _Handler(socketserver.StreamRequestHandler):
+    """Serve newline-delimited requests on one connection."""
+
+    server: "_UnixServer"
+
+    # Connections are served one at a time, so an idle one must not hold
+    # the server for long.
+    timeout = _IDLE_CONNECTION_TIMEOUT
+
+    def handle(self) -> None:
+        """Answer requests until the client disconnects or goes idle."""
+        try:
+            for raw in self.rfile:
+                response = self.server.scan_server.handle_line(raw.decode("utf-8", "replace"))
+                if response is not None:
+                    self.wfile.write(response.encode("utf-8") + b"\n")
+                    self.wfile.flush()
+                if self.server.scan_server.stopped:
+                    break
+        except OSError:  # idle timeout or client gone
+            return
+
+
+class _UnixServer(socketserver.UnixStreamServer):
+    """Unix socket server handling each connection in the serving thread.
+
+    Scans therefore run on the main thread, where `rules.TimeBudget` can
+    interrupt a catastrophic pattern with its SIGALRM watchdog.
+    """
+
+    def __init__(self, path: str, scan_server: ScanServer) -> None:
+        """Bind the socket.
+
+        Args:
+            path: Socket path.
+            scan_server: Request handler.
+        """
+        self.scan_server = scan_server
+        super().__init__(path, _Handler)
+
+
+def serve_unix(server: ScanServer, path: Path, idle_timeout: float = 0.0) -> None:
+    """Serve on a Unix socket until shutdown or `idle_timeout` idle seconds.
+
+    A stale socket file left by a crashed server is replaced; a live one is
+    an error.
+
+    Args:
+        server: Request handler.
+        path: Socket path.
+        idle_timeout: Exit after this many seconds without requests (0 = never).
+
+    Raises:
+        RuntimeError: If another server is already listening on `path`.
+    """
+    if path.exists():
+        if client.request(path, "ping") is not None:
+            raise RuntimeError(f"a server is already listening on {path}")
+        path.unlink()
+    unix = _UnixServer(str(path), server)
+    unix.timeout = 0.5
+    try:
+        os.chmod(path, 0o600)
+        while not server.stopped:
+            unix.handle_request()
+            if idle_timeout and time.monotonic() - server.last_request > idle_timeout:
+                break
+    finally:
+        unix.server_close()
+        with contextlib.suppress(OSError):
+            path.unlink()
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """Run the scan server.
+
+    Args:
+        argv: Command-line arguments without the program name.
+
+    Returns:
+        int: Exit code.
+    """
+    parser = argparse.ArgumentParser(
+        prog="jps-pre-commit-utils-server",
+        description="Keep config and compiled rules warm and serve scans over JSON-RPC.",
+    )
+    parser.add_argument(
+        "--stdio", action="store_true", help="Serve on stdin/stdout instead of a socket."
+    )
+    parser.add_argument(
+        "--socket",
+        type=Path,
+        default=None,
+        help="Socket path (default: <git-dir>/jps-pre-commit.sock, where the hook looks).",
+    )
+    parser.add_argument(
+        "--idle-timeout",
+        type=float,
+        default=0.0,
+        metavar="SECONDS",
+        help="Exit after this long without requests (default: never).",
+    )
+    args = parser.parse_args(sys.argv[1:] if argv is None else list(argv))
+
+    server = ScanServer()
+    server.config(os.getcwd())  # warm up before accepting requests
+    if args.stdio:
+        serve_stdio(server, sys.stdin, sys.stdout)
+        return 0
+    path = args.socket or client.socket_path()
+    if path is None:
+        parser.error("not inside a git repository; pass --socket")
+    try:
+        serve_unix(server, path, args.idle_timeout)
+    except RuntimeError as exc:
+        print(exc, file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,82 @@
+"""Whole-tree scan mode (--all-files): every line of every tracked file.
+
+Tracked files are listed from the index, classified by path and
+gitattributes up front (excluded/generated/binary), and the remaining blobs
+are read in bulk from one `git cat-file --batch` process. Each line is then
+presented to the scanner as an `AddedLine`, so routing, filtering, caching
+and parallel scanning work exactly as for diffs.
+"""
+
+from __future__ import annotations
+
+from typing import Dict, Iterator, List, Mapping, Optional, Sequence, Tuple
+
+from .diff_parser import AddedLine
+from .filters import BINARY, OVERSIZED, SkipReport, _int_option, classify_files
+from .git_diff import get_staged_attributes, iter_blobs, list_tracked_blobs
+
+# Like git, treat a blob as binary if its first 8000 bytes contain a NUL.
+_BINARY_PROBE = 8000
+
+
+def classify_tree_files(
+    config: Mapping[str, object], paths: Optional[Sequence[str]] = None
+) -> Tuple[SkipReport, List[Tuple[str, str]]]:
+    """List tracked files and skip those excluded by path or attributes.
+
+    Args:
+        config: Loaded configuration.
+        paths: Optional paths to limit the listing to.
+
+    Returns:
+        Tuple[SkipReport, List[Tuple[str, str]]]: Skip decisions so far, and
+        the (path, blob id) entries left to read.
+    """
+    entries = list_tracked_blobs(paths)
+    attributes = get_staged_attributes(
+        [path for path, _ in entries], ["binary", "linguist-generated"]
+    )
+    # Line counts are unknown until the blobs are read; see iter_tree_lines.
+    report = classify_files([(0, 0, path) for path, _ in entries], attributes, config)
+    return report, [(path, oid) for path, oid in entries if path not in report.files]
+
+
+def iter_tree_lines(
+    entries: List[Tuple[str, str]],
+    report: SkipReport,
+    config: Mapping[str, object],
+    blobs: Optional[Dict[str, str]] = None,
+) -> Iterator[AddedLine]:
+    """Yield every line of the given blobs as located records.
+
+    Binary blobs and files with more than ``max_added_lines`` lines are
+    recorded in `report` and skipped.
+
+    Args:
+        entries: (path, blob id) pairs, as returned by `classify_tree_files`.
+        report: Receives content-based skip decisions.
+        config: Loaded configuration; reads "max_added_lines".
+        blobs: Optional dict that receives path -> blob id for each file
+            before its lines are yielded (keys the result cache).
+
+    Yields:
+        AddedLine: Lines in path order, numbered from 1.
+    """
+    max_lines = _int_option(config, "max_added_lines")
+    contents = iter_blobs(oid for _, oid in entries)
+    for (path, oid), (_, content) in zip(entries, contents):
+        if content is None:
+            continue
+        if b"\0" in content[:_BINARY_PROBE]:
+            report.files[path] = BINARY
+            continue
+        lines = content.decode("utf-8", "replace").split("\n")
+        if lines[-1] == "":
+            lines.pop()
+        if max_lines and len(lines) > max_lines:
+            report.files[path] = OVERSIZED
+            continue
+        if blobs is not None:
+            blobs[path] = oid
+        for lineno, text in enumerate(lines, 1):
+            yield AddedLine(path, lineno, text[:-1] if text.endswith("\r") else text)
@@ -0,0 +1,17 @@
+"""Shared pytest fixtures."""
+
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def _isolated_cache(tmp_path_factory: pytest.TempPathFactory, monkeypatch: pytest.MonkeyPatch):
+    """Keep the on-disk cache out of the developer's home directory.
+
+    Also ignore any scan server the developer has running.
+
+    Args:
+        tmp_path_factory: pytest temporary directory factory.
+        monkeypatch: pytest monkeypatch fixture.
+    """
+    monkeypatch.setenv("JPS_PRECOMMIT_CACHE_DIR", str(tmp_path_factory.mktemp("cache")))
+    monkeypatch.setenv("JPS_PRECOMMIT_NO_SERVER", "1")
@@ -0,0 +1,68 @@
+"""Unit tests for jps_pre_commit_utils.baseline."""
+
+import pytest
+
+from jps_pre_commit_utils import cli
+from jps_pre_commit_utils.baseline import Baseline, fingerprint
+from jps_pre_commit_utils.filters import SkipReport
+from jps_pre_commit_utils.findings import Finding, Rule
+
+TODO = Rule("python", "TODO")
+
+
+def test_fingerprint_ignores_whitespace_and_line_numbers():
+    """Re-indented or moved lines keep their fingerprint; other fields do not."""
+    base = fingerprint(Finding(TODO, "    x = 1  # TODO", "a.py", 3))
+    assert fingerprint(Finding(TODO, "x = 1 # TODO", "a.py", 40)) == base
+    assert fingerprint(Finding(TODO, "x = 2  # TODO", "a.py", 3)) != base
+    assert fingerprint(Finding(TODO, "    x = 1  # TODO", "b.py", 3)) != base
+    assert fingerprint(Finding(Rule("yaml", "TODO"), "    x = 1  # TODO", "a.py", 3)) != base
+
+
+def test_baseline_round_trips_through_binary_file(tmp_path):
+    """Saved fingerprints load back unchanged from the compact file.
+
+    Args:
+        tmp_path: pytest temporary directory fixture.
+    """
+    findings = [Finding(TODO, f"# TODO {i}", "a.py", i) for i in range(1000)]
+    path = tmp_path / "baseline.bin"
+    Baseline.from_findings(findings).save(path)
+
+    loaded = Baseline.load(path)
+    assert path.stat().st_size == 8 + 8 * 1000
+    assert len(loaded) == 1000
+    assert findings[10] in loaded
+    new = Finding(TODO, "# TODO new", "a.py", 1)
+    assert list(loaded.filter([findings[0], new, findings[1]])) == [new]
+    assert loaded.suppressed == 2
+
+    (tmp_path / "bad.bin").write_bytes(b"not a baseline")
+    with pytest.raises(ValueError):
+        Baseline.load(tmp_path / "bad.bin")
+
+
+def test_cli_writes_and_applies_baseline(monkeypatch, tmp_path, capsys):
+    """--write-baseline accepts current findings; --baseline suppresses only those.
+
+    Args:
+        monkeypatch: pytest monkeypatch fixture.
+        tmp_path: pytest temporary directory fixture.
+        capsys: pytest capture system fixture.
+    """
+    diff = ["+++ b/a.py", "@@ -0,0 +1,2 @@", "+# TODO old", "+print(1)"]
+    monkeypatch.setattr(cli, "load_config", lambda: {"patterns": {"python": ["TODO"]}})
+    monkeypatch.setattr(cli, "classify_staged_files", lambda cfg, paths=None: SkipReport())
+    monkeypatch.setattr(cli, "iter_staged_diff", lambda paths=None, exclude=(): iter(diff))
+    path = tmp_path / "baseline.bin"
+
+    assert cli.main(["--no-cache", "--write-baseline", str(path)]) == 0
+    assert "Wrote 1 accepted findings" in capsys.readouterr().err
+    assert cli.main(["--no-cache", "--baseline", str(path)]) == 0
+
+    diff.append("+  # TODO new")
+    diff[1] = "@@ -0,0 +1,3 @@"
+    assert cli.main(["--no-cache", "--format", "jsonl", "--baseline", str(path)]) == 1
+    out, err = capsys.readouterr()
+    assert "TODO new" in out and "TODO old" not in out
+    assert "1 findings suppressed by the baseline" in err
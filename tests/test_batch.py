@@ -0,0 +1,55 @@
+"""Unit tests for jps_pre_commit_utils.batch."""
+
+from jps_pre_commit_utils import scanner
+from jps_pre_commit_utils.batch import BatchStats, Scanner
+from jps_pre_commit_utils.diff_parser import iter_added_lines
+
+CONFIG = {
+    "patterns": {"python": [r"\bprint\(", "TODO"], "perl": [r"print\s+"]},
+    "languages": {"python": [".py"], "perl": [".pl"]},
+}
+
+
+def _diff(n: int) -> str:
+    path = "a.py" if n % 2 else "b.pl"
+    body = [f"+value = {i}" for i in range(n)] + ["+print(x)  # TODO"]
+    return "\n".join([f"+++ b/{path}", f"@@ -0,0 +1,{len(body)} @@", *body]) + "\n"
+
+
+def test_scan_many_matches_scan_diff_per_diff():
+    """Each result should equal scan_diff on that diff, in input order."""
+    diffs = [_diff(n) for n in range(5)]
+    stats = BatchStats()
+    results = list(Scanner(CONFIG).scan_many(iter(diffs), stats=stats))
+
+    assert [r.position for r in results] == list(range(5))
+    for n, (diff, result) in enumerate(zip(diffs, results)):
+        assert result.findings == scanner.scan_diff(iter_added_lines(diff.splitlines()), CONFIG)
+        assert result.lines == n + 1
+    assert stats.diffs == 5
+    assert stats.findings == sum(len(r.findings) for r in results)
+    assert stats.by_group == {"python": 4}
+    assert stats.diffs_with_findings == 2
+    assert stats.as_dict()["lines"] == sum(r.lines for r in results)
+
+
+def test_scan_many_in_processes_matches_serial():
+    """A process pool should yield the same results in the same order."""
+    diffs = [_diff(n) for n in range(7)]
+    batch = Scanner(CONFIG)
+    serial = [r.findings for r in batch.scan_many(diffs)]
+    pooled = [r.findings for r in batch.scan_many((d.splitlines() for d in diffs), jobs=2)]
+    assert pooled == serial
+
+
+def test_scanner_loads_config_when_omitted(monkeypatch):
+    """Without a config the usual YAML files should be read once.
+
+    Args:
+        monkeypatch: pytest monkeypatch fixture.
+    """
+    from jps_pre_commit_utils import config
+
+    monkeypatch.setattr(config, "load_config", lambda: {"patterns": {"g": ["TODO"]}})
+    findings = Scanner().scan("+++ b/x.txt\n@@ -0,0 +1 @@\n+TODO\n")
+    assert [(f.path, f.lineno, f.pattern) for f in findings] == [("x.txt", 1, "TODO")]
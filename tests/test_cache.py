@@ -0,0 +1,80 @@
+"""Unit tests for jps_pre_commit_utils.cache and its callers."""
+
+from pathlib import Path
+
+import yaml
+
+import jps_pre_commit_utils.config as config
+from jps_pre_commit_utils import cache, scanner
+
+
+def test_store_and_load_roundtrip() -> None:
+    """A stored value should be returned for the same key."""
+    cache.store("demo", "abc", {"x": [1, 2]})
+    assert cache.load("demo", "abc") == {"x": [1, 2]}
+    assert cache.load("demo", "other") is None
+
+
+def test_cache_can_be_disabled(monkeypatch: object) -> None:
+    """JPS_PRECOMMIT_NO_CACHE=1 should turn store/load into no-ops.
+
+    Args:
+        monkeypatch: pytest monkeypatch fixture.
+    """
+    monkeypatch.setenv("JPS_PRECOMMIT_NO_CACHE", "1")
+    cache.store("demo", "abc", {"x": 1})
+    assert cache.load("demo", "abc") is None
+
+
+def test_file_fingerprint_tracks_content(tmp_path: Path) -> None:
+    """Editing or creating a file should change the fingerprint.
+
+    Args:
+        tmp_path: pytest temporary directory fixture.
+    """
+    target = tmp_path / "cfg.yaml"
+    missing = cache.file_fingerprint([target])
+    target.write_text("a: 1\n")
+    first = cache.file_fingerprint([target])
+    target.write_text("a: 2\n")
+    assert len({missing, first, cache.file_fingerprint([target])}) == 3
+
+
+def test_load_config_served_from_cache(monkeypatch: object, tmp_path: Path) -> None:
+    """A second load with unchanged files should not parse YAML again.
+
+    Args:
+        monkeypatch: pytest monkeypatch fixture.
+        tmp_path: pytest temporary directory fixture.
+    """
+    monkeypatch.setattr(Path, "home", lambda: tmp_path)
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / ".my-pre-commit-checks.yaml").write_text(yaml.safe_dump({"paths": ["/x"]}))
+
+    first = config.load_config()
+
+    def fail(path):
+        raise AssertionError("YAML should not be re-read")
+
+    monkeypatch.setattr(config, "_read_yaml", fail)
+    assert config.load_config() == first
+
+
+def test_scan_diff_compiles_once_per_config(monkeypatch: object) -> None:
+    """Repeated scan_diff calls with the same patterns should reuse the RuleSet.
+
+    Args:
+        monkeypatch: pytest monkeypatch fixture.
+    """
+    calls = []
+    real = scanner.compile_patterns
+
+    def counting(cfg):
+        calls.append(cfg)
+        return real(cfg)
+
+    monkeypatch.setattr(scanner, "compile_patterns", counting)
+    cfg = {"patterns": {"python": ["memo_only_pattern"]}}
+    for _ in range(3):
+        assert scanner.scan_diff(["memo_only_pattern here"], cfg)
+    assert len(calls) == 1
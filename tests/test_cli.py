@@ -1,5 +1,8 @@
 # tests/test_cli.py
+import json
+
 from jps_pre_commit_utils import cli
+from jps_pre_commit_utils.filters import SkipReport
 
 
 def test_cli_main_invokes_all_components(monkeypatch: object):
@@ -11,13 +14,16 @@ def test_cli_main_invokes_all_components(monkeypatch: object):
 
     called = {}
 
-    monkeypatch.setattr(cli, "get_staged_diff", lambda: "diff content")
+    monkeypatch.setattr(
+        cli, "iter_staged_diff", lambda paths=None, exclude=(): iter(["+diff content"])
+    )
+    monkeypatch.setattr(cli, "classify_staged_files", lambda cfg, paths=None: SkipReport())
     monkeypatch.setattr(cli, "load_config", lambda: {"patterns": {"python": ["TODO"]}})
     monkeypatch.setattr(
-        cli, "scan_diff", lambda diff, cfg: [{"pattern": "TODO", "line": "TODO: fix"}]
+        cli, "scan_diff", lambda diff, cfg, **kw: [{"pattern": "TODO", "line": "TODO: fix"}]
     )
     monkeypatch.setattr(
-        cli, "print_report", lambda findings: called.setdefault("printed", findings)
+        cli, "print_report", lambda findings, **kw: called.setdefault("printed", findings)
     )
 
     result = cli.main()
@@ -32,10 +38,60 @@ def test_cli_main_returns_zero_when_no_findings(monkeypatch: object):
         monkeypatch: pytest monkeypatch fixture.
     """
 
-    monkeypatch.setattr(cli, "get_staged_diff", lambda: "")
+    monkeypatch.setattr(cli, "iter_staged_diff", lambda paths=None, exclude=(): iter([]))
+    monkeypatch.setattr(cli, "classify_staged_files", lambda cfg, paths=None: SkipReport())
     monkeypatch.setattr(cli, "load_config", lambda: {"patterns": {}})
-    monkeypatch.setattr(cli, "scan_diff", lambda diff, cfg: [])
-    monkeypatch.setattr(cli, "print_report", lambda findings: None)
+    monkeypatch.setattr(cli, "scan_diff", lambda diff, cfg, **kw: [])
+    monkeypatch.setattr(cli, "print_report", lambda findings, **kw: None)
 
     result = cli.main()
     assert result == 0
+
+
+def test_extract_added_lines_skips_headers_only():
+    """Added lines are returned without '+', file headers are skipped."""
+    diff = "diff --git a/x.py b/x.py\n+++ b/x.py\n@@ -0,0 +1,2 @@\n+print(1)\n+++x\n-old\n"
+    assert cli._extract_added_lines(diff) == ["print(1)", "++x"]
+
+
+def test_cli_main_streams_jsonl(monkeypatch: object, capsys: object):
+    """--format jsonl should write one located record per finding to stdout.
+
+    Args:
+        monkeypatch: pytest monkeypatch fixture.
+        capsys: pytest capture system fixture.
+    """
+    monkeypatch.setattr(
+        cli,
+        "iter_staged_diff",
+        lambda paths=None, exclude=(): iter(["+++ b/a.py", "@@ -0,0 +1 @@", "+# TODO"]),
+    )
+    monkeypatch.setattr(cli, "classify_staged_files", lambda cfg, paths=None: SkipReport())
+    monkeypatch.setattr(cli, "load_config", lambda: {"patterns": {"python": ["TODO"]}})
+
+    assert cli.main(["--format", "jsonl"]) == 1
+    out = capsys.readouterr().out
+    assert json.loads(out) == {
+        "group": "python",
+        "pattern": "TODO",
+        "path": "a.py",
+        "lineno": 1,
+        "line": "# TODO",
+    }
+
+
+def test_cli_main_warns_about_unsafe_patterns(monkeypatch: object, capsys: object):
+    """Patterns prone to catastrophic backtracking are named on stderr.
+
+    Args:
+        monkeypatch: pytest monkeypatch fixture.
+        capsys: pytest capture system fixture.
+    """
+    monkeypatch.setattr(cli, "iter_staged_diff", lambda paths=None, exclude=(): iter([]))
+    monkeypatch.setattr(cli, "classify_staged_files", lambda cfg, paths=None: SkipReport())
+    monkeypatch.setattr(cli, "load_config", lambda: {"patterns": {"custom": [r"(a+)+$"]}})
+    monkeypatch.setattr(cli, "print_report", lambda findings, **kw: None)
+
+    assert cli.main() == 0
+    err = capsys.readouterr().err
+    assert "'(a+)+$' in 'custom' may backtrack catastrophically (nested quantifier)" in err
@@ -0,0 +1,89 @@
+"""Unit tests for jps_pre_commit_utils.diff_parser."""
+
+from jps_pre_commit_utils.diff_parser import AddedLine, iter_added_lines, split_diff
+
+DIFF = r"""diff --git a/x.py b/x.py
+index 1111111..2222222 100644
+--- a/x.py
++++ b/x.py
+@@ -1,0 +2,2 @@
++print(1)
++++not a header
+@@ -10 +12 @@
+-old
++new
+diff --git "a/sp\303\251c.pl" "b/sp\303\251c.pl"
+new file mode 100644
+--- /dev/null
++++ "b/sp\303\251c.pl"
+@@ -0,0 +1 @@
++hello
+\ No newline at end of file
+diff --git a/gone b/gone
+deleted file mode 100644
+--- a/gone
++++ /dev/null
+@@ -1 +0,0 @@
+-bye
+"""
+
+
+def test_iter_added_lines_tracks_path_and_line_numbers():
+    """Records should carry the new-file path and line number."""
+    assert list(iter_added_lines(DIFF.splitlines())) == [
+        AddedLine("x.py", 2, "print(1)"),
+        AddedLine("x.py", 3, "++not a header"),
+        AddedLine("x.py", 12, "new"),
+        AddedLine("spéc.pl", 1, "hello"),
+    ]
+
+
+def test_iter_added_lines_counts_context_lines():
+    """Context lines in wider diffs should advance the new-file line number."""
+    diff = ["+++ b/a.yml", "@@ -1,2 +1,3 @@", " keep", "+added", " keep"]
+    assert list(iter_added_lines(diff)) == [AddedLine("a.yml", 2, "added")]
+
+
+def test_iter_added_lines_keeps_reading_past_stray_lines():
+    """An unexpected line inside a hunk must not hide the added lines after it."""
+    diff = [
+        "+++ b/a.py",
+        "@@ -0,0 +1,4 @@",
+        "+one",
+        "stray",
+        "",
+        "+three",
+        "+four",
+        "diff --git a/b.py b/b.py",
+        "+++ b/b.py",
+        "@@ -0,0 +7 @@",
+        "+seven",
+    ]
+    assert [(r.path, r.lineno, r.text) for r in iter_added_lines(diff)] == [
+        ("a.py", 1, "one"),
+        ("a.py", 3, "three"),
+        ("a.py", 4, "four"),
+        ("b.py", 7, "seven"),
+    ]
+
+
+def test_split_diff_breaks_at_newlines_only():
+    """Only "\\n" ends a diff line; other line-break characters are content."""
+    assert split_diff("+a\fb\r\n+c\u2028d\x1c\n+e") == ["+a\fb", "+c\u2028d\x1c", "+e"]
+    assert split_diff("") == []
+
+
+def test_iter_added_lines_collects_blob_ids():
+    """Index headers should be recorded per path before its lines are yielded."""
+    diff = [
+        "diff --git a/x.py b/x.py",
+        f"index {'1' * 40}..{'2' * 40} 100644",
+        "--- a/x.py",
+        "+++ b/x.py",
+        "@@ -0,0 +1 @@",
+        "+new",
+    ]
+    blobs = {}
+    for rec in iter_added_lines(diff, blobs):
+        assert rec.path in blobs
+    assert blobs == {"x.py": "1" * 40 + ".." + "2" * 40}
@@ -0,0 +1,58 @@
+"""Unit tests for jps_pre_commit_utils.entropy."""
+
+import re
+
+import pytest
+
+from jps_pre_commit_utils import entropy
+from jps_pre_commit_utils.entropy import (
+    BASE64_LABEL,
+    HEX_LABEL,
+    EntropyDetector,
+    shannon_entropy,
+)
+
+SECRET = "wJalrXUtnFEMI/K7MDENG/bPxRfiCYzEXAMPLEKEY+9q"
+DIGEST = "9f86d081884c7d659a2feaa0c55ad015a3bf4f1b"
+
+
+def test_shannon_entropy_bits_per_char():
+    """Entropy should be 0 for one repeated char and log2(k) for k equally common."""
+    assert shannon_entropy("") == 0.0
+    assert shannon_entropy("aaaa") == 0.0
+    assert shannon_entropy("abcd") == pytest.approx(2.0)
+
+
+def test_numpy_histograms_match_python(monkeypatch):
+    """The vectorized path should agree with the per-token computation.
+
+    Args:
+        monkeypatch: pytest monkeypatch fixture.
+    """
+    pytest.importorskip("numpy")
+    monkeypatch.setattr(entropy, "NUMPY_MIN_TOKENS", 0)
+    tokens = [SECRET, DIGEST, "a" * 30, "value_config_handler"]
+    assert entropy.entropies(tokens) == pytest.approx([shannon_entropy(t) for t in tokens])
+
+
+def test_detector_flags_random_runs_only():
+    """Random base64/hex runs are reported; identifiers, numbers and alphabets are not."""
+    lines = [
+        f'aws_secret = "{SECRET}"',
+        f"digest: {DIGEST}",
+        "def test_scan_many_in_processes_matches_serial():",
+        "id = 12345678901234567890123",
+        'table = "ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz"',
+        f"short = {SECRET[:12]}",
+    ]
+    assert EntropyDetector().scan(lines) == {0: BASE64_LABEL, 1: HEX_LABEL}
+
+
+def test_detector_respects_allowlist_and_config():
+    """Allowlisted spans are skipped, and the check is opt-in."""
+    line = f"token = {SECRET}"
+    assert EntropyDetector().scan([line], re.compile(r"wJalr\S+")) == {}
+    assert EntropyDetector.from_config({}) is None
+    assert EntropyDetector.from_config({"entropy": False}) is None
+    strict = EntropyDetector.from_config({"entropy": True, "base64_entropy": 6})
+    assert strict is not None and strict.scan([line]) == {}
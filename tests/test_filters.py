@@ -0,0 +1,48 @@
+"""Unit tests for jps_pre_commit_utils.filters."""
+
+from jps_pre_commit_utils.diff_parser import AddedLine
+from jps_pre_commit_utils.filters import classify_files, drop_skipped
+
+CONFIG = {
+    "exclude": ["*.min.js", "vendor/*", "package-lock.json"],
+    "max_added_lines": 100,
+    "max_line_length": 20,
+}
+
+
+def test_classify_files_reasons():
+    """Each skip reason should be detected from numstat and attributes."""
+    numstat = [
+        (None, None, "img.png"),
+        (3, 0, "gen/api.py"),
+        (5, 0, "web/app.min.js"),
+        (5, 0, "vendor/lib.py"),
+        (5, 0, "deep/dir/package-lock.json"),
+        (500, 0, "fixtures/big.yaml"),
+        (5, 0, "src/ok.py"),
+    ]
+    attrs = {"gen/api.py": {"linguist-generated": "set", "binary": "unspecified"}}
+    report = classify_files(numstat, attrs, CONFIG)
+    assert report.files == {
+        "img.png": "binary",
+        "gen/api.py": "generated",
+        "web/app.min.js": "excluded",
+        "vendor/lib.py": "excluded",
+        "deep/dir/package-lock.json": "excluded",
+        "fixtures/big.yaml": "oversized",
+    }
+
+
+def test_drop_skipped_filters_and_counts():
+    """Skipped files and over-long lines should never reach the scanner."""
+    report = classify_files([(None, None, "b.bin"), (2, 0, "a.py")], {}, CONFIG)
+    records = [
+        AddedLine("b.bin", 1, "TODO"),
+        AddedLine("a.py", 1, "short TODO"),
+        AddedLine("a.py", 2, "x" * 50),
+    ]
+    assert list(drop_skipped(records, report)) == [records[1]]
+    assert report.summary() == {"binary file(s)": 1, "line(s) over 20 chars": 1}
+
+    report.timeouts.add(("custom", "(a+)+$"), "a.py")
+    assert report.summary()["line(s) for pattern '(a+)+$' (regex time budget exceeded)"] == 1
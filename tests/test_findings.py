@@ -0,0 +1,38 @@
+"""Unit tests for jps_pre_commit_utils.findings."""
+
+import pickle
+
+from jps_pre_commit_utils import scanner
+from jps_pre_commit_utils.diff_parser import AddedLine
+from jps_pre_commit_utils.findings import Finding, Rule
+
+
+def test_finding_behaves_like_the_old_dicts():
+    """Findings compare equal to, and read like, the dicts they replace."""
+    plain = Finding(Rule("python", "TODO"), "# TODO")
+    located = Finding(Rule("python", "TODO"), "# TODO", "a.py", 7)
+
+    assert plain == {"pattern": "TODO", "line": "# TODO", "group": "python"}
+    assert dict(located) == {
+        "pattern": "TODO",
+        "line": "# TODO",
+        "group": "python",
+        "path": "a.py",
+        "lineno": 7,
+    }
+    assert plain.get("path") is None and "path" not in plain
+    assert located.get("lineno") == 7
+    assert pickle.loads(pickle.dumps(located)) == located
+
+
+def test_findings_share_rules_and_line_text():
+    """Hits of one pattern share a Rule; hits on one line share its text."""
+    cfg = {"patterns": {"python": ["TODO", "print"]}}
+    text = "print('x')  # TODO"
+    records = [AddedLine("a.py", 1, text), AddedLine("b.py", 2, "TODO again")]
+
+    first, second, third = scanner.scan_diff(records, cfg)
+
+    assert first.line is second.line is text
+    assert first.rule is third.rule
+    assert not hasattr(first, "__dict__")
@@ -0,0 +1,67 @@
+"""Unit tests for jps_pre_commit_utils.formats."""
+
+import io
+import json
+
+from jps_pre_commit_utils import formats
+
+_FINDINGS = [
+    {"pattern": "TODO", "group": "python", "line": "# TODO", "path": "a.py", "lineno": 3},
+    {"pattern": "x", "line": "x"},
+]
+
+
+def test_jsonl_writes_each_finding_as_it_arrives():
+    """Every record should be on the stream before the next one is produced."""
+    out = io.StringIO()
+    seen = []
+
+    def produce():
+        for finding in _FINDINGS:
+            seen.append(out.getvalue().count("\n"))
+            yield finding
+
+    assert formats.write_jsonl(produce(), out) == 2
+    assert seen == [0, 1]
+    records = [json.loads(line) for line in out.getvalue().splitlines()]
+    assert records[0] == {
+        "group": "python",
+        "pattern": "TODO",
+        "path": "a.py",
+        "lineno": 3,
+        "line": "# TODO",
+    }
+    assert records[1]["path"] is None and records[1]["lineno"] is None
+
+
+def test_json_array_is_valid_even_when_empty():
+    """The JSON writer should always produce a parseable array."""
+    out = io.StringIO()
+    assert formats.write_json(iter([]), out) == 0
+    assert json.loads(out.getvalue()) == []
+
+    out = io.StringIO()
+    formats.write_json(iter(_FINDINGS), out)
+    assert [r["pattern"] for r in json.loads(out.getvalue())] == ["TODO", "x"]
+
+
+def test_sarif_results_locations_and_skip_counts():
+    """SARIF results carry rule, location and the skip summary read at the end."""
+    out = io.StringIO()
+    skipped = {}
+
+    def produce():
+        yield from _FINDINGS
+        skipped["line(s) over 10 chars"] = 1
+
+    assert formats.write_sarif(produce(), out, lambda: skipped) == 2
+    log = json.loads(out.getvalue())
+    assert log["version"] == "2.1.0"
+    run = log["runs"][0]
+    first, second = run["results"]
+    assert first["ruleId"] == "TODO"
+    location = first["locations"][0]["physicalLocation"]
+    assert location["artifactLocation"]["uri"] == "a.py"
+    assert location["region"]["startLine"] == 3
+    assert "locations" not in second
+    assert run["properties"]["notScanned"] == {"line(s) over 10 chars": 1}
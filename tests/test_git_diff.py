@@ -1,8 +1,11 @@
 """Unit tests for jps_pre_commit_utils.git_diff."""
 
+import io
 import subprocess
 
-from jps_pre_commit_utils.git_diff import get_staged_diff
+from jps_pre_commit_utils.diff_parser import iter_added_lines, split_diff
+from jps_pre_commit_utils.git_diff import get_staged_diff, iter_staged_diff
+from jps_pre_commit_utils.scanner import scan_diff
 
 
 class DummyResult:
@@ -55,3 +58,48 @@ def test_get_staged_diff_does_not_raise(monkeypatch: object) -> None:
     except subprocess.SubprocessError:
         result = None
     assert result is None or isinstance(result, str)
+
+
+_FEED_DIFF = (
+    "diff --git a/x.py b/x.py\r\n"
+    "+++ b/x.py\n"
+    "@@ -0,0 +1,4 @@\n"
+    '+y = "a\fb"\n'
+    "+# TODO one\n"
+    '+s = "p\u2028q"\r\n'
+    "+import pdb; print(1)\n"
+).encode("utf-8")
+
+
+class DummyPopen:
+    def __init__(self, *a, **kw):
+        self.stdout = io.BytesIO(_FEED_DIFF)
+        self.returncode = None
+
+    def poll(self):
+        return 0
+
+    def kill(self):
+        pass
+
+    def wait(self):
+        return 0
+
+
+def test_iter_staged_diff_keeps_lines_with_unusual_breaks_whole(monkeypatch: object) -> None:
+    """Form feeds and U+2028 inside an added line must not hide the lines after it.
+
+    Args:
+        monkeypatch: pytest monkeypatch fixture.
+    """
+    monkeypatch.setattr(subprocess, "Popen", DummyPopen)
+    lines = list(iter_staged_diff())
+    assert lines == split_diff(_FEED_DIFF.decode("utf-8"))
+    assert lines[3:] == ['+y = "a\fb"', "+# TODO one", '+s = "p\u2028q"', "+import pdb; print(1)"]
+
+    records = list(iter_added_lines(iter_staged_diff()))
+    assert [(r.lineno, r.text) for r in records] == [
+        (n, line[1:]) for n, line in enumerate(lines[3:], 1)
+    ]
+    config = {"patterns": {"python": ["TODO", r"\bprint\(", r"import\s+pdb"]}}
+    assert [f["lineno"] for f in scan_diff(records, config)] == [2, 4, 4]
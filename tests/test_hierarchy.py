@@ -0,0 +1,82 @@
+"""Unit tests for jps_pre_commit_utils.hierarchy."""
+
+import yaml
+
+from jps_pre_commit_utils import hierarchy
+from jps_pre_commit_utils.batch import Scanner
+from jps_pre_commit_utils.config import _DEFAULTS, CONFIG_FILE_NAME, deep_merge
+from jps_pre_commit_utils.diff_parser import AddedLine
+
+ROOT = dict(_DEFAULTS, patterns={"python": ["TODO"]})
+
+
+def _write(directory, data):
+    """Write a nested config file.
+
+    Args:
+        directory: Directory to hold the file.
+        data: Configuration to dump.
+    """
+    directory.mkdir(parents=True, exist_ok=True)
+    (directory / CONFIG_FILE_NAME).write_text(yaml.safe_dump(data))
+
+
+def test_deep_merge_recurses_into_mappings():
+    """Nested mappings should merge key by key while lists are replaced."""
+    base = {"patterns": {"python": ["TODO"], "perl": ["warn"]}, "paths": ["/a"]}
+    merged = deep_merge(base, {"patterns": {"python": ["FIXME"]}, "paths": ["/b"]})
+    assert merged == {"patterns": {"python": ["FIXME"], "perl": ["warn"]}, "paths": ["/b"]}
+    assert base["patterns"]["python"] == ["TODO"]
+
+
+def test_nested_configs_refine_their_subtree(tmp_path):
+    """Each file should be checked with the configs along its path.
+
+    Args:
+        tmp_path: pytest temporary directory fixture.
+    """
+    _write(tmp_path / "svc", {"patterns": {"python": ["FIXME"]}})
+    _write(tmp_path / "svc" / "legacy", {"secrets": {"entropy": True}})
+    tree = hierarchy.ConfigTree(ROOT, root=tmp_path)
+
+    assert tree.config_for("top.py") is ROOT
+    assert tree.config_for("svc/a/b.py")["patterns"]["python"] == ["FIXME"]
+    legacy = tree.config_for("svc/legacy/c.py")
+    assert legacy["patterns"]["python"] == ["FIXME"]
+    assert legacy["secrets"]["entropy"] is True
+    assert legacy["secrets"]["min_length"] == _DEFAULTS["secrets"]["min_length"]
+    assert tree.fingerprint_for("top.py") == ""
+    assert tree.fingerprint_for("svc/x.py") != tree.fingerprint_for("svc/legacy/x.py")
+
+
+def test_directories_resolve_and_compile_once(monkeypatch, tmp_path):
+    """Many files under one config should share a single resolution and rule set.
+
+    Args:
+        monkeypatch: pytest monkeypatch fixture.
+        tmp_path: pytest temporary directory fixture.
+    """
+    _write(tmp_path / "svc", {"patterns": {"python": ["FIXME"]}})
+    loads, builds = [], []
+    load = hierarchy.load_directory_config
+    monkeypatch.setattr(
+        hierarchy, "load_directory_config", lambda p, d: loads.append(d) or load(p, d)
+    )
+    monkeypatch.setattr(hierarchy, "Scanner", lambda cfg: builds.append(cfg) or Scanner(cfg))
+    tree = hierarchy.ConfigTree(ROOT, root=tmp_path)
+    records = [AddedLine(f"svc/d{i % 4}/f{i}.py", 1, "FIXME TODO") for i in range(200)] + [
+        AddedLine("top.py", 1, "FIXME TODO")
+    ]
+
+    root_runs = []
+
+    def scan_root(recs):
+        root_runs.append(list(recs))
+        return []
+
+    findings = list(tree.iter_findings(records, scan_root))
+    assert [f.pattern for f in findings] == ["FIXME"] * 200
+    assert [len(run) for run in root_runs] == [1]
+    assert len(loads) == 5  # svc and svc/d0..d3, once each
+    assert len(builds) == 1
+    assert tree.config_dirs == ["svc"]
@@ -0,0 +1,51 @@
+"""Unit tests for jps_pre_commit_utils.parallel."""
+
+from jps_pre_commit_utils import parallel, scanner
+from jps_pre_commit_utils.diff_parser import AddedLine
+
+CONFIG = {
+    "patterns": {"python": [r"\bprint\(", "TODO"], "perl": [r"print\s+"]},
+    "languages": {"python": [".py"], "perl": [".pl"]},
+}
+
+
+def _records():
+    out = []
+    for f in range(6):
+        path = f"pkg/mod{f}.py" if f % 2 else f"lib/mod{f}.pl"
+        for n in range(1, 40):
+            text = "print(x)  # TODO" if n % 7 == 0 else f"value = {n}"
+            out.append(AddedLine(path, n, text if f % 2 else text.replace("(", " ")))
+    return out
+
+
+def test_scan_parallel_matches_serial_order():
+    """Findings from the pool should equal the serial scan, in the same order."""
+    records = _records()
+    expected = scanner.scan_diff(records, CONFIG)
+    got = parallel.scan_parallel(iter(records), CONFIG, jobs=2, min_lines=0, chunk_lines=25)
+    assert got == expected
+    assert got
+
+
+def test_scan_parallel_small_diff_stays_serial(monkeypatch):
+    """Below the threshold no process pool should be created.
+
+    Args:
+        monkeypatch: pytest monkeypatch fixture.
+    """
+
+    def no_pool(*a, **kw):
+        raise AssertionError("pool should not start")
+
+    monkeypatch.setattr(parallel, "ProcessPoolExecutor", no_pool)
+    records = _records()
+    got = parallel.scan_parallel(records, CONFIG, jobs=4, min_lines=len(records) + 1)
+    assert got == scanner.scan_diff(records, CONFIG)
+
+
+def test_chunks_prefer_file_boundaries():
+    """Chunks should break between files once the target size is reached."""
+    records = [AddedLine("a", i, "") for i in range(3)] + [AddedLine("b", i, "") for i in range(3)]
+    sizes = [[r.path for r in c] for c in parallel._chunks(iter(records), 2)]
+    assert sizes == [["a", "a", "a"], ["b", "b", "b"]]
@@ -0,0 +1,69 @@
+"""Unit tests for jps_pre_commit_utils.profiling."""
+
+import json
+import time
+
+from jps_pre_commit_utils import cli, scanner
+from jps_pre_commit_utils.filters import SkipReport
+from jps_pre_commit_utils.profiling import Profiler
+
+
+def test_disabled_profiler_is_passthrough():
+    """A disabled profiler should not wrap iterables or record anything."""
+    profiler = Profiler(enabled=False)
+    items = [1, 2]
+    assert profiler.wrap("x", items) is items
+    with profiler.stage("y"):
+        pass
+    assert profiler.stages == {}
+    assert profiler.pattern_costs is None
+
+
+def test_wrapped_stages_are_timed_exclusively():
+    """Time spent in an inner stage should not be charged to the outer one."""
+    profiler = Profiler(enabled=True, trace_memory=False)
+
+    def slow():
+        for i in range(3):
+            time.sleep(0.01)
+            yield i
+
+    inner = profiler.wrap("inner", slow())
+    outer = profiler.wrap("outer", (i * 2 for i in inner))
+    assert list(outer) == [0, 2, 4]
+    assert profiler.stages["inner"]["seconds"] >= 0.03
+    assert profiler.stages["outer"]["seconds"] < 0.01
+    assert profiler.stages["inner"]["items"] == 3
+
+
+def test_scan_diff_records_pattern_costs():
+    """Per-pattern calls and hits should be collected when costs are requested."""
+    costs = {}
+    cfg = {"patterns": {"python": ["TODO", r"print\("]}}
+    scanner.scan_diff(["TODO", "print(1)", "clean", "TODO again"], cfg, pattern_costs=costs)
+    assert costs[("python", "TODO")][1:] == [2, 2]
+    assert costs[("python", r"print\(")][1:] == [1, 1]
+    assert costs[("*", "<prefilter>")][1] == 4
+
+
+def test_cli_profile_writes_json(monkeypatch, tmp_path):
+    """--profile should write a JSON profile with stage timings.
+
+    Args:
+        monkeypatch: pytest monkeypatch fixture.
+        tmp_path: pytest temporary directory fixture.
+    """
+    monkeypatch.setattr(cli, "load_config", lambda: {"patterns": {"python": ["TODO"]}})
+    monkeypatch.setattr(cli, "classify_staged_files", lambda cfg, paths=None: SkipReport())
+    monkeypatch.setattr(
+        cli,
+        "iter_staged_diff",
+        lambda paths=None, exclude=(): iter(["+++ b/a.py", "@@ -0,0 +1 @@", "+TODO"]),
+    )
+    monkeypatch.setattr(cli, "print_report", lambda findings, **kw: None)
+    output = tmp_path / "profile.json"
+
+    assert cli.main(["--profile", "--profile-output", str(output)]) == 1
+    data = json.loads(output.read_text())
+    assert {"load_config", "git_diff", "parse_diff", "scan", "report"} <= set(data["stages"])
+    assert data["patterns"]
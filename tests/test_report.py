@@ -29,3 +29,56 @@ def test_print_report_no_issues(capsys: object) -> None:
     report.print_report([])
     captured = capsys.readouterr()
     assert "✅ No issues detected." in captured.out
+
+
+def test_print_report_mentions_skipped(capsys: object) -> None:
+    """Skip counts should be reported alongside the results.
+
+    Args:
+        capsys: pytest capture system fixture.
+    """
+    report.print_report([], skipped={"binary file(s)": 2, "generated file(s)": 1})
+    captured = capsys.readouterr()
+    assert "Not scanned: 2 binary file(s), 1 generated file(s)" in captured.out
+
+
+def test_print_report_truncates_per_pattern(capsys: object) -> None:
+    """Only the first N findings per pattern are listed, plus a count of the rest.
+
+    Args:
+        capsys: pytest capture system fixture.
+    """
+    findings = [{"pattern": "TODO", "group": "python", "line": f"TODO {i}"} for i in range(5)]
+    findings.append({"pattern": "print", "group": "python", "line": "print(1)"})
+
+    report.print_report(findings, max_per_pattern=2)
+    out = capsys.readouterr().out
+
+    assert "TODO 1" in out and "TODO 2" not in out
+    assert "print(1)" in out
+    assert "3 more finding(s) for 'TODO' (group: python) (5 total)" in out
+    assert "Total findings: 6" in out
+
+    report.print_report(findings, max_per_pattern=0)
+    out = capsys.readouterr().out
+    assert "TODO 0" not in out
+    assert "5 more finding(s) for 'TODO'" in out
+
+
+def test_print_report_keeps_line_content_literal(capsys: object) -> None:
+    """Markup-like text in added lines is shown verbatim and long lines are cut.
+
+    Args:
+        capsys: pytest capture system fixture.
+    """
+    findings = [
+        {"pattern": "x", "line": "x = '[red]boom[/red]' :smile:"},
+        {"pattern": "y", "line": "y" * 1000},
+    ]
+
+    report.print_report(findings)
+    out = capsys.readouterr().out
+
+    assert "x = '[red]boom[/red]' :smile:" in out
+    assert "y" * 200 + "…" in out
+    assert "y" * 201 not in out
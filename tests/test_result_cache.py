@@ -0,0 +1,86 @@
+"""Unit tests for jps_pre_commit_utils.result_cache."""
+
+from pathlib import Path
+
+from jps_pre_commit_utils.diff_parser import AddedLine
+from jps_pre_commit_utils.result_cache import ResultCache
+from jps_pre_commit_utils.scanner import iter_findings, scan_diff
+
+_CFG = {"patterns": {"python": ["TODO"]}}
+_RECORDS = [
+    AddedLine("a.py", 1, "# TODO a"),
+    AddedLine("b.py", 1, "clean"),
+    AddedLine("c.py", 4, "# TODO c1"),
+    AddedLine("c.py", 5, "# TODO c2"),
+]
+_BLOBS = {"a.py": "0..1", "b.py": "0..2", "c.py": "0..3"}
+
+
+def _run(path: Path, blobs, scan=None, **limits):
+    """Scan `_RECORDS` through a fresh cache, recording which lines were scanned.
+
+    Args:
+        path: Cache file.
+        blobs: Path -> blob ids.
+        scan: Optional scanner; defaults to `iter_findings`.
+        **limits: Eviction limits for the cache.
+
+    Returns:
+        tuple: (findings as dicts, scanned line texts).
+    """
+    scanned = []
+    scan = scan or (lambda recs: iter_findings(recs, _CFG))
+
+    def recording(recs):
+        def tap():
+            for rec in recs:
+                scanned.append(rec.text)
+                yield rec
+
+        return scan(tap())
+
+    results = ResultCache(path, _CFG, **limits)
+    findings = [dict(f) for f in results.scan(iter(_RECORDS), blobs, recording)]
+    results.save()
+    return findings, scanned
+
+
+def test_unchanged_files_are_replayed_in_order(tmp_path: Path):
+    """A second run scans nothing and yields identical findings."""
+    cache_file = tmp_path / "results.json"
+    first, scanned = _run(cache_file, _BLOBS)
+    assert [f["line"] for f in first] == ["# TODO a", "# TODO c1", "# TODO c2"]
+    assert len(scanned) == 4
+
+    second, scanned = _run(cache_file, _BLOBS)
+    assert second == first
+    assert scanned == []
+
+
+def test_changed_blob_is_rescanned(tmp_path: Path):
+    """Only the file whose blob ids changed goes back through the scanner."""
+    cache_file = tmp_path / "results.json"
+    first, _ = _run(cache_file, _BLOBS)
+
+    # A scanner that reads all input before yielding must not reorder output.
+    findings, scanned = _run(
+        cache_file, dict(_BLOBS, **{"a.py": "0..9"}), lambda recs: scan_diff(recs, _CFG)
+    )
+    assert scanned == ["# TODO a"]
+    assert findings == first
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path: Path):
+    """The oldest entry goes first and the cache never exceeds its limit."""
+    cache_file = tmp_path / "results.json"
+    _run(cache_file, _BLOBS, max_entries=2)
+    _, scanned = _run(cache_file, _BLOBS, max_entries=2)
+    assert scanned == ["# TODO a"]
+    assert len(ResultCache(cache_file, _CFG)._entries) == 2
+
+
+def test_disabled_cache_scans_everything(tmp_path: Path):
+    """Without a cache file every record is scanned and nothing is written."""
+    _run(None, _BLOBS)
+    _, scanned = _run(None, _BLOBS)
+    assert len(scanned) == 4
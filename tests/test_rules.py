@@ -1,8 +1,20 @@
 """Unit tests for jps_pre_commit_utils.rules."""
 
 import re
+import time
 
-from jps_pre_commit_utils.rules import compile_patterns
+import pytest
+
+from jps_pre_commit_utils import rules
+from jps_pre_commit_utils.rules import (
+    RuleSet,
+    TimeBudget,
+    backtracking_risk,
+    compile_patterns,
+    first_chars,
+    literal_anchors,
+    resolve_backend,
+)
 
 
 def test_compile_patterns_returns_regex_objects():
@@ -18,3 +30,165 @@ def test_compile_patterns_empty_input():
     """Should handle empty config gracefully."""
     result = compile_patterns({})
     assert result == {}
+
+
+def _naive_matches(compiled, lines):
+    return [
+        (line, group, pat.pattern)
+        for line in lines
+        for group, pats in compiled.items()
+        for pat in pats
+        if pat.search(line)
+    ]
+
+
+def test_ruleset_matches_naive_loop():
+    """RuleSet should report the same (group, pattern) pairs as a per-pattern loop."""
+    cfg = {
+        "python": [r"sys\.exit", r"\bprint\(", r"\btest\b", r"TODO"],
+        "perl": [r"print\s+", r"\btest\b", r"TODO"],
+        "misc": [r"(?i)fixme", r"(\w)\1{3}", r"hack|kludge", r"jira/[A-Z]+-[0-9]+", r"\d{4}"],
+        "scoped": [r"(?i:todo)", r"x(?i:Later)", r"(?-i:Clean)", r"(?i:k)ludge"],
+    }
+    lines = [
+        "print('x')  # TODO",
+        "clean line",
+        "print $fh; test",
+        "FixMe later",
+        "aaaa repeated",
+        "sys.exit(1)",
+        "a kludge for jira/ABC-12 in 2024",
+        "jira/lowercase",
+        "x = 1  # TODO later",
+        "xLATER Clean KLUDGE",
+        "<tag> here",
+    ]
+    compiled = compile_patterns(cfg)
+    ruleset = RuleSet(compiled)
+    got = [(line, g, p.pattern) for line in lines for g, p in ruleset.match(line)]
+    assert got == _naive_matches(compiled, lines)
+
+    # Without open-ended patterns the combined prefilter screens every line.
+    # Group references must not shift when patterns share the alternation.
+    screened = compile_patterns(
+        {
+            "python": [r"(?i:todo)", r"\bprint\(", r"(?-i:Clean)"],
+            "tags": [r"([xz])[yw]", r"([<{])?[tT][aA][gG](?(1)[>}]|$)"],
+        }
+    )
+    ruleset = RuleSet(screened, backend="re")
+    got = [(line, g, p.pattern) for line in lines for g, p in ruleset.match(line)]
+    assert got == _naive_matches(screened, lines)
+
+
+def test_ruleset_empty_is_falsy():
+    """An empty RuleSet should be falsy and never match."""
+    ruleset = RuleSet({})
+    assert not ruleset
+    assert list(ruleset.match("TODO")) == []
+
+
+def test_first_chars_known_and_unknown_prefixes():
+    """first_chars should resolve literal prefixes and give up on open classes."""
+    assert first_chars(r"\bprint\(") == frozenset("p")
+    assert first_chars(r"(foo|bar)+") == frozenset("fb")
+    assert first_chars(r"x*y") == frozenset("xy")
+    assert first_chars(r"\d+") is None
+    assert first_chars(r"a?") is None
+
+
+def test_literal_anchors_extracts_required_literals():
+    """literal_anchors should find the literal every match must contain."""
+    assert literal_anchors(r"use\s+Data::Dumper") == frozenset(["Data::Dumper"])
+    assert literal_anchors(r"\bprint\(") == frozenset(["print("])
+    assert literal_anchors(r"hack|kludge") == frozenset(["hack", "kludge"])
+    assert literal_anchors(r"(?i)todo") is None
+    assert literal_anchors(r"a.b") is None
+
+
+def test_backtracking_risk_flags_nested_quantifiers():
+    """Repeats whose body can split the same text many ways are flagged."""
+    assert backtracking_risk(r"(a+)+$") == "nested quantifier"
+    assert backtracking_risk(r"^(\w+\s?)*$") == "nested quantifier"
+    assert backtracking_risk(r"(?:x*)*y") == "nested quantifier"
+    assert backtracking_risk(r"(\s*,\s*\w+)*") is None
+    assert backtracking_risk(r"\d+\.\d+") is None
+    assert backtracking_risk(r"use\s+Data::Dumper") is None
+    assert backtracking_risk(r"(unbalanced") is None
+
+
+def test_time_budget_interrupts_catastrophic_match():
+    """An overrunning pattern is skipped for the line, then for the rest of the scan."""
+    ruleset = RuleSet(compile_patterns({"bad": [r"(a+)+$", "TODO"]}))
+    line = "a" * 40 + "!"
+    start = time.perf_counter()
+    with TimeBudget(0.05) as budget:
+        budget.path = "x.txt"
+        hits = [list(ruleset.match(line, budget)) for _ in range(5)]
+        todo = [p.pattern for _, p in ruleset.match("TODO aaaa!", budget)]
+    assert time.perf_counter() - start < 2
+    assert hits == [[]] * 5
+    assert todo == ["TODO"]
+    assert budget.timeouts.pairs == {("bad", r"(a+)+$"): 6}
+    assert budget.timeouts.paths == {"x.txt"}
+
+
+def test_re2_backend_matches_like_re():
+    """The RE2 pattern set reports exactly what `re` does, falling back where needed."""
+    pytest.importorskip("re2")
+    compiled = compile_patterns(
+        {
+            "python": [r"\bprint\(", r"(?i)todo", r"foo(?=bar)", r"(a)\1"],
+            "misc": [r"[[:digit:]]", r"x{,2}y", r"\w+\s\d", r"TODO", r"(a)\1", r"\w$"],
+            "dup": [r"(?i)todo", r"foo(?=bar)", r"(?i)todo"],
+        }
+    )
+    lines = [
+        "print(1) # todo",
+        "foobar aa",
+        "[:digit:] xy",
+        "naïve print(2)",
+        "value\x0b7",
+        "abc 7\tTODO",
+        "clean",
+        "trailing x\n",
+    ]
+    plain = RuleSet(compiled, backend="re")
+    linear = RuleSet(compiled, backend="re2")
+    assert linear.backend == "re2"
+    assert RuleSet(compiled, backend="auto").backend == "re2"
+    # Literal anchors already screen these cheaply, so "auto" keeps `re`.
+    assert RuleSet(compile_patterns({"g": ["TODO"]}), backend="auto").backend == "re"
+    for line in lines:
+        expected = [(g, p.pattern) for g, p in plain.match(line)]
+        assert [(g, p.pattern) for g, p in linear.match(line)] == expected, line
+
+
+def test_re2_backend_falls_back_when_missing(monkeypatch):
+    """Without google-re2, "re2" and "auto" resolve to the `re` backend."""
+    monkeypatch.setattr(rules, "_re2_module", lambda: None)
+    assert resolve_backend("auto") == "re"
+    ruleset = RuleSet(compile_patterns({"g": ["TODO"]}), backend="re2")
+    assert ruleset.backend == "re"
+    assert [p.pattern for _, p in ruleset.match("TODO")] == ["TODO"]
+
+
+def test_shared_patterns_run_once_and_fan_out():
+    """A pattern in several groups is searched once but reported for each group."""
+    compiled = compile_patterns(
+        {"python": ["TODO", r"\bprint\("], "perl": ["TODO", "warn"], "yaml": ["TODO"]}
+    )
+    assert compiled["python"][0] is compiled["perl"][0] is compiled["yaml"][0]
+
+    costs = {}
+    ruleset = RuleSet(compiled, costs=costs)
+    hits = [(g, p.pattern) for g, p in ruleset.match("print(1)  # TODO warn")]
+    assert hits == [
+        ("python", "TODO"),
+        ("python", r"\bprint\("),
+        ("perl", "TODO"),
+        ("perl", "warn"),
+        ("yaml", "TODO"),
+    ]
+    assert costs[("python", "TODO")][1:] == [1, 1]
+    assert ("perl", "TODO") not in costs and ("yaml", "TODO") not in costs
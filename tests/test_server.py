@@ -0,0 +1,225 @@
+"""Unit tests for jps_pre_commit_utils.server and jps_pre_commit_utils.client."""
+
+import io
+import json
+import os
+import shutil
+import subprocess
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+from jps_pre_commit_utils import client, server
+
+_DIFF = """diff --git a/a.py b/a.py
+--- a/a.py
++++ b/a.py
+@@ -0,0 +3,2 @@
++# TODO fix
++clean = 1
+"""
+
+
+@pytest.fixture
+def workdir(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    """Run in an empty directory with no home config.
+
+    Args:
+        tmp_path: pytest temporary directory.
+        monkeypatch: pytest monkeypatch fixture.
+
+    Returns:
+        Path: The working directory.
+    """
+    monkeypatch.setattr(Path, "home", lambda: tmp_path / "home")
+    work = tmp_path / "work"
+    work.mkdir()
+    monkeypatch.chdir(work)
+    return work
+
+
+def _call(srv: server.ScanServer, method: str, **params) -> dict:
+    """Send one request through `handle_line` and decode the response.
+
+    Args:
+        srv: Server under test.
+        method: Method name.
+        **params: Method parameters.
+
+    Returns:
+        dict: Decoded response.
+    """
+    message = {"jsonrpc": "2.0", "id": 7, "method": method, "params": params}
+    return json.loads(srv.handle_line(json.dumps(message)))
+
+
+def test_scan_diff_and_lines(workdir: Path):
+    """Diffs yield located findings; bare lines yield plain ones."""
+    srv = server.ScanServer()
+    response = _call(srv, "scan", diff=_DIFF)
+    assert response["id"] == 7
+    findings = response["result"]["findings"]
+    assert [(f["path"], f["lineno"], f["line"]) for f in findings] == [("a.py", 3, "# TODO fix")]
+
+    findings = _call(srv, "scan", lines=["x", "# TODO fix"], path="b.py", start=10)["result"]
+    assert [(f["path"], f["lineno"]) for f in findings["findings"]] == [("b.py", 11)]
+    plain = _call(srv, "scan", lines=["# TODO fix"])["result"]["findings"]
+    assert plain and plain[0]["path"] is None
+
+
+def test_errors_are_reported_and_serving_continues(workdir: Path):
+    """Malformed requests get JSON-RPC errors instead of killing the server."""
+    srv = server.ScanServer()
+    assert json.loads(srv.handle_line("{not json"))["error"]["code"] == server.PARSE_ERROR
+    assert _call(srv, "nope")["error"]["code"] == server.METHOD_NOT_FOUND
+    assert _call(srv, "scan")["error"]["code"] == server.INVALID_PARAMS
+    assert srv.handle_line(json.dumps({"jsonrpc": "2.0", "method": "ping"})) is None
+    assert _call(srv, "ping")["result"]["pid"] > 0
+
+
+def test_config_reloads_when_yaml_changes(workdir: Path):
+    """Editing the local config takes effect on the next request."""
+    srv = server.ScanServer()
+    config_file = workdir / ".my-pre-commit-checks.yaml"
+    config_file.write_text("patterns:\n  custom: ['FIXME']\n")
+    assert _call(srv, "scan", lines=["FIXME"])["result"]["findings"]
+    assert not _call(srv, "scan", lines=["XXX"])["result"]["findings"]
+
+    config_file.write_text("patterns:\n  custom: ['XXX', 'YYY']\n")
+    assert _call(srv, "scan", lines=["XXX"])["result"]["findings"]
+
+
+def test_stdio_serves_until_shutdown(workdir: Path):
+    """Each request line gets one response line; shutdown ends the loop."""
+    requests = [
+        {"jsonrpc": "2.0", "id": 1, "method": "scan", "params": {"lines": ["# TODO fix"]}},
+        {"jsonrpc": "2.0", "id": 2, "method": "shutdown"},
+        {"jsonrpc": "2.0", "id": 3, "method": "ping"},
+    ]
+    stdin = io.StringIO("".join(json.dumps(r) + "\n" for r in requests))
+    stdout = io.StringIO()
+    server.serve_stdio(server.ScanServer(), stdin, stdout)
+    responses = [json.loads(line) for line in stdout.getvalue().splitlines()]
+    assert [r["id"] for r in responses] == [1, 2]
+
+
+def test_client_round_trip_over_unix_socket(
+    workdir: Path, monkeypatch: pytest.MonkeyPatch, capsys: pytest.CaptureFixture
+):
+    """`try_check` runs the CLI on the server and relays its output."""
+    sock = workdir / "s.sock"
+    monkeypatch.setenv(client.SOCKET_ENV, str(sock))
+    monkeypatch.delenv(client.NO_SERVER_ENV)
+    assert client.try_check([]) is None  # nothing listening yet
+
+    calls = []
+
+    def fake_main(argv):
+        calls.append(argv)
+        print("scanned")
+        return 1
+
+    monkeypatch.setattr(server.cli, "main", fake_main)
+    thread = threading.Thread(target=server.serve_unix, args=(server.ScanServer(), sock))
+    thread.start()
+    try:
+        deadline = time.monotonic() + 5
+        while client.request(sock, "ping") is None and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert client.try_check(["--summary-only"]) == 1
+        assert calls == [["--summary-only"]]
+        assert capsys.readouterr().out == "scanned\n"
+    finally:
+        client.request(sock, "shutdown")
+        thread.join(5)
+    assert not sock.exists()
+
+
+def _repo_with_temp_index(work: Path) -> Path:
+    """Commit a clean file, then stage a `print(` line in a temporary index only.
+
+    Args:
+        work: Directory to turn into a repository.
+
+    Returns:
+        Path: The temporary index (as `git commit -a` would create).
+    """
+
+    def git(*args: str, **kw) -> None:
+        subprocess.run(
+            ["git", "-c", "user.email=t@example.com", "-c", "user.name=t", *args],
+            cwd=work,
+            check=True,
+            capture_output=True,
+            **kw,
+        )
+
+    git("init", "-q")
+    (work / "a.py").write_text("x = 1\n")
+    git("add", "a.py")
+    git("commit", "-qm", "init")
+    (work / "a.py").write_text("x = 1\nprint(y)\n")
+    temp_index = work / ".git" / "index.tmp"
+    shutil.copy(work / ".git" / "index", temp_index)
+    git("add", "a.py", env={**os.environ, "GIT_INDEX_FILE": str(temp_index)})
+    return temp_index
+
+
+def test_check_uses_the_callers_git_environment(workdir: Path, monkeypatch: pytest.MonkeyPatch):
+    """ "check" scans the index named by the request's GIT_INDEX_FILE, not the server's."""
+    temp_index = _repo_with_temp_index(workdir)
+    srv = server.ScanServer()
+    argv = ["--no-cache", "--format", "jsonl"]
+
+    monkeypatch.delenv("GIT_INDEX_FILE", raising=False)
+    result = _call(srv, "check", argv=argv, env={"GIT_INDEX_FILE": str(temp_index)})["result"]
+    assert result["exit_code"] == 1 and "print(y)" in result["stdout"]
+    assert "GIT_INDEX_FILE" not in os.environ
+
+    # A server started from inside a hook must not keep scanning that hook's index.
+    monkeypatch.setenv("GIT_INDEX_FILE", str(temp_index))
+    assert _call(srv, "check", argv=argv, env={})["result"]["exit_code"] == 0
+    assert os.environ["GIT_INDEX_FILE"] == str(temp_index)
+
+
+def test_client_forwards_git_environment_to_main_thread_server(
+    workdir: Path, monkeypatch: pytest.MonkeyPatch
+):
+    """`try_check` sends its GIT_* variables; scans run on the serving thread.
+
+    Serving on the thread that calls `serve_unix` (the main thread in the
+    real server) lets the regex time budget use its SIGALRM watchdog.
+    """
+    temp_index = _repo_with_temp_index(workdir)
+    sock = workdir / "s.sock"
+    monkeypatch.setenv(client.SOCKET_ENV, str(sock))
+    monkeypatch.delenv(client.NO_SERVER_ENV)
+    monkeypatch.setenv("GIT_INDEX_FILE", str(temp_index))
+
+    sent, threads = [], []
+    real_request, real_main = client.request, server.cli.main
+
+    def recording_request(path, method, params=None):
+        sent.append(params)
+        return real_request(path, method, params)
+
+    def recording_main(argv):
+        threads.append(threading.current_thread())
+        return real_main(argv)
+
+    monkeypatch.setattr(server.cli, "main", recording_main)
+    thread = threading.Thread(target=server.serve_unix, args=(server.ScanServer(), sock))
+    thread.start()
+    try:
+        deadline = time.monotonic() + 5
+        while real_request(sock, "ping") is None and time.monotonic() < deadline:
+            time.sleep(0.01)
+        monkeypatch.setattr(client, "request", recording_request)
+        assert client.try_check(["--no-cache", "--summary-only"]) == 1
+    finally:
+        real_request(sock, "shutdown")
+        thread.join(5)
+    assert sent[0]["env"]["GIT_INDEX_FILE"] == str(temp_index)
+    assert threads == [thread]
@@ -0,0 +1,56 @@
+"""Startup-cost regression tests for the hook entry point."""
+
+import subprocess
+import sys
+
+# Generous ceiling for importing the CLI graph; it measures well under 100 ms,
+# while eagerly importing Rich, PyYAML and importlib.metadata roughly doubles it.
+_IMPORT_BUDGET_US = 400_000
+
+_HEAVY_MODULES = ("rich", "yaml", "importlib.metadata")
+
+
+def _import_times(module: str) -> dict:
+    """Return cumulative import times (microseconds) reported by -X importtime.
+
+    Args:
+        module: Module to import in a fresh interpreter.
+
+    Returns:
+        dict: Module name -> cumulative import time in microseconds.
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line.split("|")
+        if cumulative.strip().isdigit():
+            times[name.strip()] = int(cumulative)
+    return times
+
+
+def test_cli_import_skips_heavy_dependencies():
+    """Importing the CLI must not pull in Rich, PyYAML or importlib.metadata."""
+    times = _import_times("jps_pre_commit_utils.cli")
+    assert "jps_pre_commit_utils.cli" in times
+    assert [name for name in _HEAVY_MODULES if name in times] == []
+    assert times["jps_pre_commit_utils.cli"] < _IMPORT_BUDGET_US
+
+
+def test_clean_report_does_not_import_rich():
+    """A finding-free report to a pipe should render without loading Rich."""
+    code = (
+        "import sys\n"
+        "from jps_pre_commit_utils.report import print_report\n"
+        "print_report([])\n"
+        "print('rich' in sys.modules)\n"
+    )
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True)
+    assert "No issues detected." in result.stdout
+    assert result.stdout.strip().endswith("False")
@@ -0,0 +1,157 @@
+"""Unit tests for jps_pre_commit_utils.tree_scan and the range/tree git helpers."""
+
+import json
+import subprocess
+from pathlib import Path
+
+import pytest
+
+from jps_pre_commit_utils import cli, git_diff
+from jps_pre_commit_utils.tree_scan import classify_tree_files, iter_tree_lines
+
+
+def _git(repo: Path, *args: str) -> None:
+    """Run a git command in `repo`.
+
+    Args:
+        repo: Repository directory.
+        *args: git arguments.
+    """
+    subprocess.run(
+        ["git", "-c", "user.email=t@example.com", "-c", "user.name=t", *args],
+        cwd=repo,
+        check=True,
+        capture_output=True,
+    )
+
+
+@pytest.fixture
+def repo(tmp_path: Path, monkeypatch: object) -> Path:
+    """Create a small committed repository and chdir into it.
+
+    Args:
+        tmp_path: pytest temporary directory fixture.
+        monkeypatch: pytest monkeypatch fixture.
+
+    Returns:
+        Path: Repository root.
+    """
+    _git(tmp_path, "init", "-q")
+    (tmp_path / "a.py").write_text("x = 1\r\nprint(x)\n")
+    (tmp_path / "gen.py").write_text("print(2)\n")
+    (tmp_path / "blob.bin").write_bytes(b"\0\1\2")
+    (tmp_path / "big.txt").write_text("line\n" * 5)
+    (tmp_path / ".gitattributes").write_text("gen.py linguist-generated\n")
+    _git(tmp_path, "add", ".")
+    _git(tmp_path, "commit", "-qm", "init")
+    monkeypatch.chdir(tmp_path)
+    return tmp_path
+
+
+def test_tree_lines_skip_generated_binary_and_oversized(repo: Path):
+    """Every line of the remaining tracked files is yielded with its number."""
+    cfg = {"exclude": [], "max_added_lines": 3, "max_line_length": 0}
+    report, entries = classify_tree_files(cfg)
+    blobs = {}
+    records = list(iter_tree_lines(entries, report, cfg, blobs))
+
+    assert [(r.path, r.lineno, r.text) for r in records if r.path == "a.py"] == [
+        ("a.py", 1, "x = 1"),
+        ("a.py", 2, "print(x)"),
+    ]
+    assert report.files == {"gen.py": "generated", "blob.bin": "binary", "big.txt": "oversized"}
+    assert set(blobs) == {".gitattributes", "a.py"}
+
+
+def test_iter_blobs_reads_many_objects_in_one_process(repo: Path):
+    """Blob contents come back in request order; unknown ids are reported."""
+    entries = dict(git_diff.list_tracked_blobs())
+    missing = "0" * 40
+    got = list(git_diff.iter_blobs([entries["a.py"], missing, entries["gen.py"]]))
+    assert got[0] == (entries["a.py"], b"x = 1\r\nprint(x)\n")
+    assert got[1] == (missing, None)
+    assert got[2][1] == b"print(2)\n"
+
+
+def test_range_diff_streams_added_lines(repo: Path):
+    """--from-ref style diffs use the staged-diff options between two revisions."""
+    (repo / "a.py").write_text("x = 1\r\nprint(x)\n# TODO\n")
+    _git(repo, "commit", "-qam", "more")
+
+    lines = list(git_diff.iter_range_diff("HEAD~1", "HEAD"))
+    assert "+# TODO" in lines
+    assert any(line.startswith("index ") and ".." in line for line in lines)
+    assert git_diff.get_range_numstat("HEAD~1") == [(1, 0, "a.py")]
+
+
+def test_file_arguments_limit_the_staged_diff(repo: Path, monkeypatch: object, capsys: object):
+    """pre-commit's file arguments restrict the scan; renames keep their old content.
+
+    Args:
+        repo: Repository root.
+        monkeypatch: pytest monkeypatch fixture.
+        capsys: pytest capture system fixture.
+    """
+    (repo / "a.py").write_text("x = 1\r\nprint(x)\n# TODO a\n")
+    (repo / "b.py").write_text("# TODO b\n")
+    _git(repo, "mv", "gen.py", "moved.py")
+    _git(repo, "add", "a.py", "b.py")
+    monkeypatch.setattr(cli, "load_config", lambda: {"patterns": {"python": ["TODO", "print"]}})
+
+    assert git_diff.with_rename_sources(["moved.py"]) == ["moved.py", "gen.py"]
+    assert cli.main(["--format", "jsonl", "--no-cache", "b.py", "moved.py"]) == 1
+    paths = [json.loads(line)["path"] for line in capsys.readouterr().out.splitlines()]
+    assert paths == ["b.py"]
+    assert git_diff.get_staged_numstat(["a.py"]) == [(1, 0, "a.py")]
+
+
+def test_skipped_files_are_left_out_of_the_diff(repo: Path):
+    """Excluded paths never reach the diff output; other paths are unaffected."""
+    (repo / "a.py").write_text("x = 1\r\nprint(x)\n# TODO a\n")
+    (repo / "gen.py").write_text("print(2)\nprint(3)\n")
+    _git(repo, "add", "a.py", "gen.py")
+
+    lines = list(git_diff.iter_staged_diff(exclude=["gen.py"]))
+    assert "+++ b/a.py" in lines
+    assert not any("gen.py" in line for line in lines)
+    assert list(git_diff.iter_staged_diff(["gen.py"], exclude=["gen.py"])) == []
+
+
+def test_unknown_revision_fails_loudly(repo: Path, capsys: object):
+    """A mistyped ref must not pass as a clean scan.
+
+    Args:
+        repo: Repository root.
+        capsys: pytest capture system fixture.
+    """
+    assert cli.main(["--since", "nosuchref", "--no-cache"]) == 2
+    out, err = capsys.readouterr()
+    assert "No issues" not in out
+    assert "error: git diff failed" in err and "nosuchref" in err
+    assert cli.main(["--from-ref", "HEAD", "--to-ref", "nosuchref", "--no-cache"]) == 2
+    with pytest.raises(git_diff.GitError):
+        list(git_diff.iter_range_diff("nosuchref"))
+
+
+def test_nested_configs_do_not_change_file_filters(repo: Path, monkeypatch: object, capsys: object):
+    """exclude and size limits in a subdirectory's config are ignored; patterns apply.
+
+    Args:
+        repo: Repository root.
+        monkeypatch: pytest monkeypatch fixture.
+        capsys: pytest capture system fixture.
+    """
+    (repo / "svc").mkdir()
+    (repo / "svc" / ".my-pre-commit-checks.yaml").write_text(
+        "exclude: ['*.py']\nmax_added_lines: 1\nmax_line_length: 3\n"
+        "patterns:\n  python: ['FIXME']\n"
+    )
+    (repo / "svc" / "a.py").write_text("# FIXME one\n# TODO two\n")
+    _git(repo, "add", "svc/a.py")
+    monkeypatch.setattr(
+        cli, "load_config", lambda: {"patterns": {"python": ["TODO"]}, "exclude": []}
+    )
+
+    assert cli.main(["--format", "jsonl", "--no-cache"]) == 1
+    found = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    assert [(f["path"], f["lineno"], f["pattern"]) for f in found] == [("svc/a.py", 1, "FIXME")]